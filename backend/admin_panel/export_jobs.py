@@ -0,0 +1,298 @@
+# admin_panel/export_jobs.py
+"""
+Background export jobs.
+
+An admin enqueues an export with the same query parameters the matching list
+endpoint takes (DonationFilter, CampaignFilter or AdminActionFilter); the
+process_export_jobs worker claims it, writes CSV or Parquet in chunks to a
+temporary file while recording progress, and stores the finished file in the
+EXPORT_STORAGE_BUCKET bucket. Downloads redirect to a short-lived signed URL,
+which storage serves with byte range support, so the API instance handling the
+download doesn't need to be the one that ran the job. Nothing long-running
+happens in an API worker.
+
+The worker is the same image with its command overridden, e.g. a Cloud Run job
+running `python manage.py process_export_jobs` on a Cloud Scheduler trigger,
+or a long-lived `process_export_jobs --loop`.
+"""
+import csv
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Sequence, Type
+
+import django_filters
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Q, When
+from django.utils import timezone
+
+from campaign.models import Campaign, Donation
+from sadagha.exports import ExportColumn, format_datetime, iter_batches
+from sadagha.upload_storage import get_upload_storage
+from .filters import AdminActionFilter, CampaignFilter, DonationFilter
+from .models import AdminAction, ExportJob
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+@dataclass(frozen=True)
+class ExportDefinition:
+    """What an export kind reads: base queryset, the filter set applied to it, and its columns"""
+    queryset: Callable
+    filterset_class: Type[django_filters.FilterSet]
+    columns: Sequence[ExportColumn]
+
+    def filtered_queryset(self, filters):
+        filterset = self.filterset_class(data=filters, queryset=self.queryset())
+        if not filterset.is_valid():
+            raise ValueError(f"Invalid filters: {dict(filterset.errors)}")
+        # Ordered by primary key so chunks are read in a stable order
+        return filterset.qs.order_by('id')
+
+
+def _campaign_queryset():
+    # The annotations CampaignFilter's donation count and success rate filters read
+    return Campaign.objects.annotate(
+        donation_count=Count('donations', filter=Q(donations__status='completed')),
+        success_rate=Case(
+            When(target__gt=0, then=F('current_amount') * 100.0 / F('target')),
+            default=0,
+            output_field=FloatField()
+        ),
+    )
+
+
+ADMIN_ACTION_EXPORT_COLUMNS = [
+    ExportColumn('ID', 'id'),
+    ExportColumn('Admin User', 'admin_user__username'),
+    ExportColumn('Admin Email', 'admin_user__email'),
+    ExportColumn('Action Type', 'action_type'),
+    ExportColumn('Target Model', 'target_model'),
+    ExportColumn('Target ID', 'target_id'),
+    ExportColumn('Description', 'description'),
+    ExportColumn('Timestamp', 'timestamp', format_datetime),
+]
+
+EXPORT_DEFINITIONS = {
+    'donations': ExportDefinition(
+        queryset=lambda: Donation.objects.all(),
+        filterset_class=DonationFilter,
+        columns=[
+            ExportColumn('ID', 'id'),
+            ExportColumn('Campaign ID', 'campaign_id'),
+            ExportColumn('Campaign', 'campaign__name'),
+            ExportColumn('Donor ID', 'donor_id'),
+            ExportColumn('Donor Username', 'donor__username'),
+            ExportColumn('Donor Name', 'donor_name'),
+            ExportColumn('Amount', 'amount'),
+            ExportColumn('Status', 'status'),
+            ExportColumn('Anonymous', 'is_anonymous'),
+            ExportColumn('Payment Session', 'payment_session_id'),
+            ExportColumn('Created At', 'created_at', format_datetime),
+            ExportColumn('Completed At', 'completed_at', format_datetime),
+        ],
+    ),
+    'campaigns': ExportDefinition(
+        queryset=_campaign_queryset,
+        filterset_class=CampaignFilter,
+        columns=[
+            ExportColumn('ID', 'id'),
+            ExportColumn('Name', 'name'),
+            ExportColumn('Category', 'category__name'),
+            ExportColumn('Owner', 'owner__username'),
+            ExportColumn('Organization', 'organization__org_name'),
+            ExportColumn('Target', 'target'),
+            ExportColumn('Raised', 'current_amount'),
+            ExportColumn('Donors', 'number_of_donors'),
+            ExportColumn('Completed Donations', 'donation_count'),
+            ExportColumn('Featured', 'featured'),
+            ExportColumn('Created At', 'created_at', format_datetime),
+        ],
+    ),
+    'admin_actions': ExportDefinition(
+        queryset=lambda: AdminAction.objects.all(),
+        filterset_class=AdminActionFilter,
+        columns=ADMIN_ACTION_EXPORT_COLUMNS,
+    ),
+}
+
+
+def available_formats():
+    """File formats this installation can write; Parquet needs pyarrow"""
+    return ['csv', 'parquet'] if pyarrow is not None else ['csv']
+
+
+class _CsvWriter:
+    def __init__(self, path, headers):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    """
+    One row group per chunk. Cells are written as the same text the CSV has,
+    so both formats agree and a column that is empty in one chunk can't
+    change type in the next.
+    """
+
+    def __init__(self, path, headers):
+        self.schema = pyarrow.schema([(header, pyarrow.string()) for header in headers])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write_rows(self, rows):
+        columns = [
+            pyarrow.array(['' if value is None else str(value) for value in column], type=pyarrow.string())
+            for column in zip(*rows)
+        ]
+        self.writer.write_table(pyarrow.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {
+    'csv': _CsvWriter,
+    'parquet': _ParquetWriter,
+}
+
+
+def download_name(job):
+    return f"{job.kind}_{job.created_at:%Y-%m-%d}_{job.pk}.{job.file_format}"
+
+
+def download_url(job):
+    """Signed storage URL of a completed job's file, valid for EXPORT_DOWNLOAD_URL_EXPIRY"""
+    return get_upload_storage().signed_download_url(
+        settings.EXPORT_STORAGE_BUCKET, job.file_name, settings.EXPORT_DOWNLOAD_URL_EXPIRY, download_name(job)
+    )
+
+
+def claim_next_job():
+    """
+    Mark the oldest pending job (or a running one whose worker stopped
+    reporting progress) as running and return it, or None.
+
+    Claimed with SKIP LOCKED so several workers can share the queue.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(minutes=settings.EXPORT_JOB_STALE_MINUTES)
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='pending') | Q(status='running', updated_at__lt=stale_before))
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        if job.status == 'running':
+            logger.warning(f"Restarting stale export job {job.pk}")
+        job.status = 'running'
+        job.started_at = now
+        job.rows_written = 0
+        job.error = ''
+        job.save(update_fields=['status', 'started_at', 'rows_written', 'error', 'updated_at'])
+    return job
+
+
+def run_export_job(job, chunk_size=None):
+    """
+    Write a claimed job's file chunk by chunk, recording progress after each chunk.
+
+    Chunks are keyset batches (iter_batches), so no cursor is held open across
+    the progress updates. The file is written to local temporary storage and
+    uploaded once complete, so storage never holds a partial file.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    definition = EXPORT_DEFINITIONS[job.kind]
+    file_name = f"{job.pk}-{uuid.uuid4().hex}.{job.file_format}"
+    fd, partial_path = tempfile.mkstemp(suffix=f".{job.file_format}")
+    os.close(fd)
+
+    try:
+        queryset = definition.filtered_queryset(job.filters)
+        total_rows = queryset.count()
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=total_rows, updated_at=timezone.now())
+
+        writer = WRITERS[job.file_format](partial_path, [column.header for column in definition.columns])
+        written = 0
+        try:
+            for chunk in iter_batches(queryset, definition.columns, chunk_size):
+                writer.write_rows(chunk)
+                written += len(chunk)
+                ExportJob.objects.filter(pk=job.pk).update(rows_written=written, updated_at=timezone.now())
+        finally:
+            writer.close()
+        file_size = os.path.getsize(partial_path)
+        get_upload_storage().upload_file(
+            settings.EXPORT_STORAGE_BUCKET, file_name, partial_path, CONTENT_TYPES[job.file_format]
+        )
+    except Exception as e:
+        logger.error(f"Export job {job.pk} failed: {str(e)}")
+        job.status = 'failed'
+        job.error = str(e)
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+        return job
+    finally:
+        os.remove(partial_path)
+
+    now = timezone.now()
+    job.status = 'completed'
+    job.total_rows = total_rows
+    job.rows_written = written
+    job.file_name = file_name
+    job.file_size = file_size
+    job.completed_at = now
+    job.expires_at = now + timedelta(days=settings.EXPORT_JOB_RETENTION_DAYS)
+    job.save(update_fields=[
+        'status', 'total_rows', 'rows_written', 'file_name', 'file_size', 'completed_at', 'expires_at', 'updated_at'
+    ])
+    logger.info(f"Export job {job.pk} wrote {written} {job.kind} rows to {file_name}")
+    return job
+
+
+def process_export_jobs(limit=None):
+    """Run queued jobs until the queue is empty (or `limit` jobs ran); returns the number run"""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_export_job(job)
+        processed += 1
+    return processed
+
+
+def purge_expired_exports():
+    """Delete the files of completed jobs past their retention; returns the number expired"""
+    expired = list(ExportJob.objects.filter(status='completed', expires_at__lte=timezone.now()))
+    storage = get_upload_storage()
+    for job in expired:
+        storage.delete(settings.EXPORT_STORAGE_BUCKET, job.file_name)
+        job.status = 'expired'
+        job.file_name = ''
+    ExportJob.objects.bulk_update(expired, ['status', 'file_name'])
+    return len(expired)
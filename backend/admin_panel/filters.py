@@ -5,6 +5,7 @@ from campaign.models import Campaign, Category, Donation
 from django.utils import timezone
 from datetime import timedelta
 from organizations.models import OrganizationProfile
+from .models import AdminAction
 
 class CampaignFilter(django_filters.FilterSet):
     """Filter set for campaign management"""
@@ -305,4 +306,18 @@ class DonationFilter(django_filters.FilterSet):
             ).extra(
                 where=["EXTRACT(EPOCH FROM (completed_at - created_at)) > 3600"]
             )
-        return queryset
\ No newline at end of file
+        return queryset
+
+
+class AdminActionFilter(django_filters.FilterSet):
+    """Filter set for the admin action audit trail"""
+
+    class Meta:
+        model = AdminAction
+        fields = {
+            'action_type': ['exact'],
+            'target_model': ['exact'],
+            'target_id': ['exact'],
+            'admin_user': ['exact'],
+            'timestamp': ['gte', 'lte', 'date'],
+        }
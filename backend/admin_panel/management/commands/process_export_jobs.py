@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from admin_panel.export_jobs import process_export_jobs, purge_expired_exports
+
+
+class Command(BaseCommand):
+    help = "Run queued admin export jobs and delete the files of expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help="Stop after this many jobs per pass")
+        parser.add_argument('--loop', action='store_true', help="Keep polling the queue every --interval seconds")
+        parser.add_argument('--interval', type=float, default=settings.EXPORT_JOB_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            expired = purge_expired_exports()
+            processed = process_export_jobs(options['limit'])
+            if processed or expired or not options['loop']:
+                self.stdout.write(
+                    f"Ran {processed} export jobs and expired {expired} in {time.monotonic() - started:.2f}s"
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -24,6 +24,66 @@ class AdminAction(models.Model):
         return f"{self.admin_user.username} - {self.action_type} - {self.timestamp}"
     
 
+class ExportJob(models.Model):
+    """Filtered export stored in EXPORT_STORAGE_BUCKET by the process_export_jobs worker"""
+    KIND_CHOICES = [
+        ('donations', 'Donations'),
+        ('campaigns', 'Campaigns'),
+        ('admin_actions', 'Admin actions'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),
+    ]
+
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    # Query parameters of the matching admin list endpoint
+    filters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    total_rows = models.IntegerField(null=True, blank=True)
+    rows_written = models.IntegerField(default=0)
+    # Object path in EXPORT_STORAGE_BUCKET
+    file_name = models.CharField(max_length=255, blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped with every progress update, so a dead worker's job can be spotted and restarted
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['requested_by', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} export #{self.pk} ({self.status})"
+
+    @property
+    def progress(self):
+        """Percentage of rows written, None until the worker has counted them"""
+        if self.status == 'completed':
+            return 100.0
+        if not self.total_rows:
+            return None
+        return round(min(self.rows_written * 100.0 / self.total_rows, 100.0), 1)
+
+
 class SupportTicket(models.Model):
     """Customer support tickets"""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
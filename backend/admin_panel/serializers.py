@@ -8,7 +8,9 @@ from django.db import models
 from django.db.models import Count, Q, Sum, Avg
 from django.utils import timezone
 from datetime import timedelta
-from .models import AdminAction
+from django.urls import reverse
+from .models import AdminAction, ExportJob
+from .export_jobs import EXPORT_DEFINITIONS, available_formats
 
 class AdminUserSerializer(serializers.ModelSerializer):
     """Base serializer for user management in admin panel"""
@@ -720,4 +722,60 @@ class AdminActionSerializer(serializers.ModelSerializer):
             'timestamp',
             'metadata',
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for background export jobs"""
+    requested_by_username = serializers.CharField(source='requested_by.username', read_only=True)
+    progress = serializers.FloatField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id',
+            'kind',
+            'file_format',
+            'filters',
+            'status',
+            'progress',
+            'total_rows',
+            'rows_written',
+            'file_size',
+            'error',
+            'requested_by_username',
+            'created_at',
+            'started_at',
+            'completed_at',
+            'expires_at',
+            'download_url',
+        ]
+        read_only_fields = [
+            'status', 'total_rows', 'rows_written', 'file_size', 'error',
+            'created_at', 'started_at', 'completed_at', 'expires_at',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != 'completed':
+            return None
+        request = self.context.get('request')
+        path = reverse('admin-export-job-download', args=[obj.id])
+        return request.build_absolute_uri(path) if request else path
+
+    def validate_file_format(self, value):
+        if value not in available_formats():
+            raise serializers.ValidationError(f"{value} exports are not available on this server")
+        return value
+
+    def validate_filters(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Must be an object of list endpoint query parameters")
+        return value
+
+    def validate(self, attrs):
+        definition = EXPORT_DEFINITIONS[attrs['kind']]
+        filterset = definition.filterset_class(data=attrs.get('filters', {}), queryset=definition.queryset().none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError({'filters': filterset.errors})
+        return attrs
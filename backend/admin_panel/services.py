@@ -4,6 +4,7 @@ from django.utils import timezone
 from datetime import timedelta
 from accounts.models import User
 from campaign.models import Donation, Campaign, Category
+from campaign.services.platform_stats import reconcile_platform_statistics
 from organizations.models import OrganizationProfile
 from volunteers.models import VolunteerProfile, VolunteerInvitation
 from .models import AdminAction
@@ -96,6 +97,8 @@ class UserManagementService:
             if new_role in ['user', 'organization', 'admin']:
                 affected_count = users.update(role=new_role)
                 details['action'] = f'Role changed to {new_role}'
+                # update() skips the signals that keep the platform statistics current
+                reconcile_platform_statistics()
             else:
                 raise ValueError('Invalid role specified')
                 
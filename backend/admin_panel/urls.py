@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AdminUserViewSet, AdminOrganizationViewSet, AdminCampaignViewSet, AdminCategoryViewSet, AdminFinancialViewSet, AdminActionViewSet
+from .views import AdminUserViewSet, AdminOrganizationViewSet, AdminCampaignViewSet, AdminCategoryViewSet, AdminFinancialViewSet, AdminActionViewSet, \
+    AdminExportJobViewSet
 
 router = DefaultRouter()
 router.register(r'users', AdminUserViewSet, basename='admin-user')
@@ -9,6 +10,7 @@ router.register(r'campaigns', AdminCampaignViewSet, basename='admin-campaign')
 router.register(r'categories', AdminCategoryViewSet, basename='admin-category')
 router.register(r'financial', AdminFinancialViewSet, basename='admin-financial')
 router.register(r'actions', AdminActionViewSet, basename='admin-action')
+router.register(r'export-jobs', AdminExportJobViewSet, basename='admin-export-job')
 
 
 urlpatterns = [
@@ -5,12 +5,18 @@ from django.db.models import Count, Q, Sum, Case, When, FloatField, Avg, F
 from django_filters.rest_framework import DjangoFilterBackend
 from accounts.models import User
 from campaign.models import Donation, Campaign, Category
+from campaign.search import CampaignSearchFilter
 from organizations.models import OrganizationProfile
 from volunteers.models import VolunteerProfile
 from .serializers import *
 from .permissions import IsAdminUser
 from .services import *
-from .filters import UserFilter, OrganizationFilter, CampaignFilter, DonationFilter
+from .filters import UserFilter, OrganizationFilter, CampaignFilter, DonationFilter, AdminActionFilter
+from .export_jobs import ADMIN_ACTION_EXPORT_COLUMNS, download_url
+from sadagha.exports import export_response
+from sadagha.upload_storage import UploadStorageError
+from rest_framework import mixins
+from django.http import HttpResponseRedirect
 import logging
 from django.utils import timezone
 from datetime import timedelta
@@ -629,9 +635,10 @@ class AdminCampaignViewSet(viewsets.ModelViewSet):
     """
     serializer_class = AdminCampaignSerializer
     permission_classes = [IsAdminUser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, CampaignSearchFilter]
     filterset_class = CampaignFilter
-    search_fields = ['name', 'description', 'owner__username', 'owner__organization_profile__org_name']
+    search_fields = ['name', 'description']
+    search_related_fields = ['owner__username', 'owner__organization_profile__org_name']
     ordering_fields = ['created_at', 'updated_at', 'name', 'target', 'current_amount', 'number_of_donors']
     ordering = ['-created_at']
     
@@ -1371,13 +1378,7 @@ class AdminActionViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
     # Filtering
-    filterset_fields = {
-        'action_type': ['exact'],
-        'target_model': ['exact'],
-        'target_id': ['exact'],
-        'admin_user': ['exact'],
-        'timestamp': ['gte', 'lte', 'date'],
-    }
+    filterset_class = AdminActionFilter
     
     # Search
     search_fields = ['description', 'action_type', 'admin_user__username']
@@ -1447,7 +1448,7 @@ class AdminActionViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def export(self, request):
         """
-        Export admin actions to CSV
+        Export admin actions to CSV or XLSX
         
         Query params (same as list filtering):
         - action_type: Filter by action type
@@ -1456,42 +1457,17 @@ class AdminActionViewSet(viewsets.ReadOnlyModelViewSet):
         - timestamp__gte: Filter by timestamp greater than or equal
         - timestamp__lte: Filter by timestamp less than or equal
         - search: Search in description, action_type, username
+        - export_format: csv (default) or xlsx
         """
         # Get filtered queryset using the same filters as list
         queryset = self.filter_queryset(self.get_queryset())
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="admin_actions.csv"'
-        
-        writer = csv.writer(response)
-        
-        # Write header
-        writer.writerow([
-            'ID',
-            'Admin User',
-            'Admin Email',
-            'Action Type',
-            'Target Model',
-            'Target ID',
-            'Description',
-            'Timestamp',
-        ])
-        
-        # Write data
-        for action in queryset:
-            writer.writerow([
-                action.id,
-                action.admin_user.username,
-                action.admin_user.email,
-                action.action_type,
-                action.target_model,
-                action.target_id or '',
-                action.description,
-                action.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            ])
-        
-        return response
+        # Streamed from a values() projection; the admin user comes from the join, not a query per row.
+        # Newest first like the list: ids follow the auto_now_add timestamp
+        return export_response(
+            request, queryset, ADMIN_ACTION_EXPORT_COLUMNS, 'admin_actions', sheet_name='Admin actions',
+            descending=True,
+        )
     
     @action(detail=False, methods=['get'])
     def recent(self, request):
@@ -1536,3 +1512,53 @@ class AdminActionViewSet(viewsets.ReadOnlyModelViewSet):
             'target_models': target_models,
             'admin_users': admin_users,
         })
+
+
+class AdminExportJobViewSet(mixins.CreateModelMixin,
+                            mixins.ListModelMixin,
+                            mixins.RetrieveModelMixin,
+                            viewsets.GenericViewSet):
+    """
+    Background exports of donations, campaigns and admin actions.
+
+    Provides:
+    - create: Enqueue an export ({"kind", "file_format", "filters"}); filters are
+      the query parameters of the matching list endpoint
+    - list / retrieve: Job status and progress
+    - download: Redirect to a short-lived signed URL of the finished file;
+      storage serves it with byte range support for resuming
+    """
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['kind', 'status', 'requested_by']
+
+    def get_queryset(self):
+        return ExportJob.objects.select_related('requested_by')
+
+    def perform_create(self, serializer):
+        job = serializer.save(requested_by=self.request.user)
+        AdminAction.objects.create(
+            admin_user=self.request.user,
+            action_type='request_export',
+            target_model='ExportJob',
+            target_id=job.id,
+            description=f"Requested {job.file_format} export of {job.kind}",
+            metadata={'filters': job.filters}
+        )
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Redirect to a signed storage URL of a completed export"""
+        job = self.get_object()
+        if job.status != 'completed':
+            return Response(
+                {'error': f'Export is {job.status}', 'progress': job.progress},
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            url = download_url(job)
+        except UploadStorageError as e:
+            logger.error(f"Could not sign download of export job {job.pk}: {str(e)}")
+            return Response({'error': 'Storage is unavailable, try again later'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return HttpResponseRedirect(url)
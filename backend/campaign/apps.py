@@ -6,5 +6,6 @@ class CampaignConfig(AppConfig):
     name = "campaign"
 
     def ready(self):
-        return super().ready()
+        # Import signal handlers
+        import campaign.signals
     
\ No newline at end of file
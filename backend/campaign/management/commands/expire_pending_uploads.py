@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campaign.services.direct_uploads import expire_upload_intents
+from campaign.services.file_uploads import expire_background_uploads, purge_failed_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark campaign files whose upload never finished as failed, settle expired upload intents "
+        "and delete failed files older than CAMPAIGN_FAILED_FILE_RETENTION"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep running, expiring every --interval seconds")
+        parser.add_argument('--interval', type=float, default=settings.EXPIRE_PENDING_UPLOADS_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            expired = expire_background_uploads() + expire_upload_intents()
+            purged = purge_failed_files()
+            if expired or purged or not options['loop']:
+                self.stdout.write(
+                    f"Expired {expired} pending uploads, deleted {purged} failed files "
+                    f"in {time.monotonic() - started:.2f}s"
+                )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
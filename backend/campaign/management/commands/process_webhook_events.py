@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campaign.services.webhook_ingestion import process_pending
+
+
+class Command(BaseCommand):
+    help = "Apply queued payment webhook events to donations in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.WEBHOOK_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep draining the queue every --interval seconds")
+        parser.add_argument('--interval', type=float, default=settings.WEBHOOK_PROCESS_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            processed = process_pending(options['batch_size'])
+            if processed or not options['loop']:
+                self.stdout.write(f"Processed {processed} webhook events in {time.monotonic() - started:.2f}s")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
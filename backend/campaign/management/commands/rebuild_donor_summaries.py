@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from campaign.services.donor_summary import REBUILD_CHUNK_SIZE, rebuild_donor_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute per-donor donation summaries from the donations table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--donor', type=int, action='append', dest='donors',
+                            help="Only rebuild this donor (repeatable); defaults to every donor")
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        written = rebuild_donor_summaries(options['donors'], chunk_size=options['chunk_size'])
+        self.stdout.write(f"Rebuilt {written} donor summaries")
@@ -0,0 +1,35 @@
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campaign.services.reconciliation import reconcile_stale_donations
+
+
+class Command(BaseCommand):
+    help = "Poll NextRemitly for stale pending/processing donations and apply their final status"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.RECONCILE_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=settings.RECONCILE_WORKERS)
+        parser.add_argument('--stale-minutes', type=float, default=settings.RECONCILE_STALE_MINUTES,
+                            help="Only donations not updated for this long are polled")
+        parser.add_argument('--max-batches', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help="Keep reconciling every --interval seconds")
+        parser.add_argument('--interval', type=float, default=60)
+
+    def handle(self, *args, **options):
+        while True:
+            report = reconcile_stale_donations(
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                stale_after=timedelta(minutes=options['stale_minutes']),
+                max_batches=options['max_batches'],
+            )
+            if report['checked'] or not options['loop']:
+                self.stdout.write(json.dumps(report))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
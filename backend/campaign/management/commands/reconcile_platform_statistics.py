@@ -0,0 +1,23 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campaign.services.platform_stats import reconcile_platform_statistics
+
+
+class Command(BaseCommand):
+    help = "Recount the platform statistics row from the source tables, correcting any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep reconciling every --interval seconds")
+        parser.add_argument('--interval', type=float, default=settings.PLATFORM_STATS_RECONCILE_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            drift = reconcile_platform_statistics()
+            self.stdout.write(json.dumps({'drift': drift}, default=str))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campaign.models import Campaign
+from campaign.services.urgency import refresh_urgency_scores
+from campaign.utils.cache_tags import CAMPAIGN_LIST_TAG, bump_tags
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the time-based parts of every campaign's urgency score. "
+        "Run it with --loop as a worker (or on a schedule, e.g. hourly)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep sweeping every --interval seconds")
+        parser.add_argument('--interval', type=float, default=settings.URGENCY_REFRESH_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            updated = refresh_urgency_scores(Campaign.objects.all())
+            # The urgent list is cached under the campaign list tag; update() doesn't bump it
+            bump_tags(CAMPAIGN_LIST_TAG)
+            self.stdout.write(f"Refreshed urgency for {updated} campaigns in {time.monotonic() - started:.2f}s")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from campaign.services.donation_ledger import rollup_pending
+
+
+class Command(BaseCommand):
+    help = "Fold pending donation ledger entries into campaign totals"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.DONATION_ROLLUP_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep running, rolling up every --interval seconds")
+        parser.add_argument('--interval', type=float, default=settings.DONATION_ROLLUP_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            processed = rollup_pending(options['batch_size'])
+            if processed or not options['loop']:
+                self.stdout.write(f"Rolled up {processed} ledger entries in {time.monotonic() - started:.2f}s")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0013_campaign_campaign_ca_name_845ec8_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="campaign",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="campaign_ca_created_e3aa54_idx"
+            ),
+        ),
+    ]
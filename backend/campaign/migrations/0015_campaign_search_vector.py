@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-19 04:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def backfill_search_vectors(apps, schema_editor):
+    from campaign.search import refresh_search_vectors
+
+    Campaign = apps.get_model("campaign", "Campaign")
+    refresh_search_vectors(Campaign.objects.all())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0014_campaign_campaign_ca_created_e3aa54_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="campaign",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="campaign",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="campaign_ca_search__0e6025_gin"
+            ),
+        ),
+    ]
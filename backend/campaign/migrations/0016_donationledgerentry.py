@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-19 04:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0015_campaign_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DonationLedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("rolled_up_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ledger_entries",
+                        to="campaign.campaign",
+                    ),
+                ),
+                (
+                    "donation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ledger_entry",
+                        to="campaign.donation",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="donationledgerentry",
+            index=models.Index(
+                fields=["rolled_up_at", "id"], name="campaign_do_rolled__b5bb53_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="donationledgerentry",
+            index=models.Index(
+                fields=["campaign", "rolled_up_at"],
+                name="campaign_do_campaig_109517_idx",
+            ),
+        ),
+    ]
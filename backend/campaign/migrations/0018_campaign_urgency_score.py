@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-19 04:48
+
+from django.db import migrations, models
+
+
+def backfill_urgency_scores(apps, schema_editor):
+    from campaign.services.urgency import refresh_urgency_scores
+
+    Campaign = apps.get_model("campaign", "Campaign")
+    refresh_urgency_scores(Campaign.objects.all())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0017_webhookevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="campaign",
+            name="urgency_score",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_urgency_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="campaign",
+            index=models.Index(
+                fields=["-urgency_score", "-created_at"],
+                name="campaign_ca_urgency_360c28_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-19 04:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0018_campaign_urgency_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarCampaign",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                ("source_hash", models.CharField(max_length=32)),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_entries",
+                        to="campaign.campaign",
+                    ),
+                ),
+                (
+                    "similar_campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="campaign.campaign",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["campaign", "rank"],
+                "unique_together": {("campaign", "rank")},
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-19 04:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0019_similarcampaign"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlatformStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_campaigns", models.IntegerField(default=0)),
+                ("active_campaigns", models.IntegerField(default=0)),
+                ("completed_campaigns", models.IntegerField(default=0)),
+                (
+                    "total_raised",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("total_donations", models.IntegerField(default=0)),
+                ("unique_donors", models.IntegerField(default=0)),
+                ("organizations", models.IntegerField(default=0)),
+                ("verified_organizations", models.IntegerField(default=0)),
+                ("volunteers", models.IntegerField(default=0)),
+                ("categories", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("reconciled_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name_plural": "platform statistics",
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2 on 2026-10-19 05:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0008_alter_user_supabase_id"),
+        ("campaign", "0020_platformstatistics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DonorSummary",
+            fields=[
+                (
+                    "donor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="donation_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "total_donated",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("donation_count", models.IntegerField(default=0)),
+                ("pending_donations", models.IntegerField(default=0)),
+                ("processing_donations", models.IntegerField(default=0)),
+                ("completed_donations", models.IntegerField(default=0)),
+                ("failed_donations", models.IntegerField(default=0)),
+                ("cancelled_donations", models.IntegerField(default=0)),
+                ("campaigns_supported", models.IntegerField(default=0)),
+                ("first_donation_at", models.DateTimeField(blank=True, null=True)),
+                ("last_donation_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name_plural": "donor summaries",
+            },
+        ),
+    ]
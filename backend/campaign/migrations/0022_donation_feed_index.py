@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0021_donorsummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="donation",
+            index=models.Index(
+                fields=["campaign", "status", "created_at", "id"],
+                name="campaign_do_campaig_90304a_idx",
+            ),
+        ),
+    ]
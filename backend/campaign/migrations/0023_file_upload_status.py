@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-19 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaign", "0022_donation_feed_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="error",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="file",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("uploaded", "Uploaded"),
+                    ("failed", "Failed"),
+                ],
+                default="uploaded",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="file",
+            name="url",
+            field=models.URLField(blank=True),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from organizations.models import OrganizationProfile
@@ -37,6 +39,12 @@ class Campaign(models.Model):
     facebook_access_token = models.TextField(blank=True, null=True, help_text="Facebook access token for API calls")
     live_viewer_count = models.IntegerField(default=0, help_text="Current live viewer count")
     
+    # Normalized name/description tsvector, maintained in save()
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    
+    # Materialized by campaign.services.urgency; NULL when funded or too new to rank
+    urgency_score = models.FloatField(null=True, blank=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -48,6 +56,15 @@ class Campaign(models.Model):
     def has_facebook_live(self):
         return bool(self.facebook_live_url and self.facebook_video_id)
 
+    def save(self, *args, **kwargs):
+        from .search import campaign_search_vector
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'name', 'description'} & set(update_fields):
+            self.search_vector = campaign_search_vector(self.name, self.description)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'search_vector'}
+        super().save(*args, **kwargs)
+
     class Meta:
         indexes = [
             models.Index(fields=['owner', '-created_at']),
@@ -58,13 +75,25 @@ class Campaign(models.Model):
             models.Index(fields=['organization', '-created_at']),
             models.Index(fields=['current_amount', 'target', '-created_at']),  # NEW - for urgent campaigns filter
             models.Index(fields=['name']),
+            models.Index(fields=['-created_at', '-id']),  # keyset pagination of the public list
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['-urgency_score', '-created_at']),  # top-k urgent campaigns
         ]
 
 class File(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploaded', 'Uploaded'),
+        ('failed', 'Failed'),
+    ]
+
     name = models.CharField(max_length=255)
-    url = models.URLField()
+    # Empty until a background upload has finished
+    url = models.URLField(blank=True)
     path = models.CharField(max_length=500, blank=True, null=True)
     campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name="files")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploaded')
+    error = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     
@@ -111,6 +140,8 @@ class Donation(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['campaign', 'status']),
+            # Keyset pages of a campaign's donations feed
+            models.Index(fields=['campaign', 'status', 'created_at', 'id']),
             models.Index(fields=['payment_session_id']),
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['donor', 'created_at']),
@@ -141,3 +172,122 @@ class Donation(models.Model):
         if reason:
             self.payment_metadata['failure_reason'] = reason
         self.save()
+
+
+class DonorSummary(models.Model):
+    """
+    Running totals of a donor's donations (all statuses), updated in the same
+    transaction as each donation change and built from a full aggregate on first read
+    """
+    donor = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='donation_summary')
+    total_donated = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    donation_count = models.IntegerField(default=0)
+    pending_donations = models.IntegerField(default=0)
+    processing_donations = models.IntegerField(default=0)
+    completed_donations = models.IntegerField(default=0)
+    failed_donations = models.IntegerField(default=0)
+    cancelled_donations = models.IntegerField(default=0)
+    campaigns_supported = models.IntegerField(default=0)
+    first_donation_at = models.DateTimeField(null=True, blank=True)
+    last_donation_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name_plural = 'donor summaries'
+
+    def __str__(self):
+        return f"Donation summary for donor {self.donor_id}"
+
+class DonationLedgerEntry(models.Model):
+    """
+    Append-only record of a completed donation, folded into the campaign totals
+    by the periodic rollup instead of updating the campaign row per donation
+    """
+    donation = models.OneToOneField(Donation, on_delete=models.CASCADE, related_name='ledger_entry')
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='ledger_entries')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    rolled_up_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['rolled_up_at', 'id']),
+            models.Index(fields=['campaign', 'rolled_up_at']),
+        ]
+
+    def __str__(self):
+        return f"Ledger entry {self.amount} for donation {self.donation_id}"
+
+
+class WebhookEvent(models.Model):
+    """Payment provider callback, stored on receipt and applied in batches by the webhook worker"""
+    RESULT_CHOICES = [
+        ('applied', 'Applied'),
+        ('duplicate', 'Duplicate'),
+        ('unchanged', 'Unchanged'),
+        ('unknown_donation', 'Unknown donation'),
+        ('invalid_status', 'Invalid status'),
+    ]
+
+    session_id = models.UUIDField()
+    status = models.CharField(max_length=20, blank=True)
+    payload = models.JSONField(default=dict)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    result = models.CharField(max_length=20, choices=RESULT_CHOICES, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['processed_at', 'id']),
+            models.Index(fields=['session_id']),
+        ]
+
+    def __str__(self):
+        return f"Webhook {self.status} for session {self.session_id}"
+
+
+class SimilarCampaign(models.Model):
+    """
+    Precomputed nearest neighbours of a campaign, written in bulk by the
+    recommendation service's similarity job and read by the similar campaigns endpoint
+    """
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='similar_entries')
+    similar_campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    # Hash of the campaign text the neighbours were computed from, to skip unchanged campaigns
+    source_hash = models.CharField(max_length=32)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ['campaign', 'rank']
+        ordering = ['campaign', 'rank']
+
+    def __str__(self):
+        return f"{self.similar_campaign_id} similar to {self.campaign_id} (#{self.rank})"
+
+
+class PlatformStatistics(models.Model):
+    """
+    Single-row snapshot of the About page figures, kept current by deltas from
+    donation rollups and model signals and rebuilt by reconcile_platform_statistics.
+    Deleted donations and donors are only accounted for by the rebuild.
+    """
+    total_campaigns = models.IntegerField(default=0)
+    active_campaigns = models.IntegerField(default=0)
+    completed_campaigns = models.IntegerField(default=0)
+    total_raised = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_donations = models.IntegerField(default=0)
+    unique_donors = models.IntegerField(default=0)
+    organizations = models.IntegerField(default=0)
+    verified_organizations = models.IntegerField(default=0)
+    volunteers = models.IntegerField(default=0)
+    categories = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'platform statistics'
+
+    def __str__(self):
+        return f"Platform statistics as of {self.updated_at}"
@@ -0,0 +1,149 @@
+import base64
+import json
+import logging
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate for a queryset, read from EXPLAIN instead of running COUNT(*).
+    Returns None when the estimate is unavailable (non-PostgreSQL backends).
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        logger.warning(f"Could not estimate row count: {str(e)}")
+        return None
+
+
+def encode_keyset_cursor(created_at, pk, reverse=False):
+    """Opaque cursor for a (created_at, id) position"""
+    payload = {'c': created_at.isoformat(), 'i': pk, 'r': int(reverse)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_keyset_cursor(encoded):
+    """(created_at, id, reverse) from a cursor made by encode_keyset_cursor; NotFound if malformed"""
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        created_at = parse_datetime(payload['c'])
+        if created_at is None:
+            raise ValueError('invalid timestamp')
+        return created_at, int(payload['i']), bool(payload.get('r'))
+    except (TypeError, ValueError, KeyError, json.JSONDecodeError):
+        raise NotFound('Invalid cursor')
+
+
+def keyset_after(queryset, created_at, pk):
+    """Rows that come after (created_at, id) in newest-first order"""
+    return queryset.filter(created_at__lte=created_at).exclude(created_at=created_at, id__gte=pk)
+
+
+class CampaignCursorPagination(BasePagination):
+    """
+    Keyset pagination on (created_at, id), newest first.
+
+    Each page continues from the last row of the previous one with
+    `created_at <= c AND NOT (created_at = c AND id >= i)`, which is a range scan
+    on the created_at indexes, so every page costs the same however deep it is,
+    and new campaigns never shift the boundaries of pages that follow a cursor.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    total_query_param = 'include_total'
+
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 12)
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, page_size))
+            if requested > 0:
+                page_size = min(requested, self.max_page_size)
+        except (TypeError, ValueError):
+            pass
+        return page_size
+
+    def encode_cursor(self, instance, reverse):
+        return encode_keyset_cursor(instance.created_at, instance.pk, reverse)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        return decode_keyset_cursor(encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        self.total = None
+        if request.query_params.get(self.total_query_param) in ('approx', 'true', '1'):
+            self.total = estimate_count(queryset)
+
+        reverse = False
+        if cursor is None:
+            page_queryset = queryset.order_by('-created_at', '-id')
+        else:
+            created_at, pk, reverse = cursor
+            if reverse:
+                # Walking back towards newer campaigns
+                page_queryset = queryset.filter(created_at__gte=created_at).exclude(
+                    created_at=created_at, id__lte=pk
+                ).order_by('created_at', 'id')
+            else:
+                page_queryset = keyset_after(queryset, created_at, pk).order_by('-created_at', '-id')
+
+        # One extra row tells us whether another page exists in that direction
+        rows = list(page_queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self.page[-1], reverse=False)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        cursor = self.encode_cursor(self.page[0], reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.total is not None:
+            response['count'] = self.total
+            response['count_is_approximate'] = True
+        return Response(response)
@@ -0,0 +1,17 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Lets `?format=ndjson` and `Accept: application/x-ndjson` pass content
+    negotiation; views answering in this format stream the body themselves.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only reached for error responses raised before a view starts streaming
+        return (json.dumps(data) + '\n').encode(self.charset)
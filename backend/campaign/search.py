@@ -0,0 +1,92 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q, Value
+from rest_framework import filters
+
+from .utils.text_normalization import search_document, search_terms
+
+# Normalization happens in Python, so PostgreSQL only needs to split words
+SEARCH_CONFIG = 'simple'
+
+
+def campaign_search_vector(name, description):
+    """Weighted tsvector for a campaign: name (A) ranks above description (B)"""
+    return (
+        SearchVector(Value(search_document(name)), weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Value(search_document(description)), weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def campaign_search_query(term):
+    """
+    tsquery matching every word of `term` as a prefix, so partial words still match
+    like they did with icontains. Returns None when the term has no searchable words.
+    """
+    words = search_terms(term)
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_campaigns(queryset, term, prefix='', extra_q=None, rank=True):
+    """
+    Filter a queryset through the campaign search vector.
+
+    Args:
+        queryset: Campaign queryset, or a related model's with `prefix` pointing at the campaign
+        term: Raw search text from the request
+        prefix: Lookup path to the campaign, e.g. 'campaign__'
+        extra_q: Optional Q ORed with the full-text match (fields outside the vector)
+        rank: Annotate `search_rank` for ordering by relevance
+    """
+    query = campaign_search_query(term)
+    if query is None:
+        return queryset
+
+    condition = Q(**{f'{prefix}search_vector': query})
+    if extra_q is not None:
+        condition |= extra_q
+    queryset = queryset.filter(condition)
+    if rank:
+        queryset = queryset.annotate(search_rank=SearchRank(F(f'{prefix}search_vector'), query))
+    return queryset
+
+
+def refresh_search_vectors(queryset, batch_size=500):
+    """Recompute search_vector for campaigns saved without Campaign.save() (bulk_create, update())"""
+    model = queryset.model
+    batch = []
+    updated = 0
+    for campaign in queryset.only('id', 'name', 'description').iterator(chunk_size=batch_size):
+        campaign.search_vector = campaign_search_vector(campaign.name, campaign.description)
+        batch.append(campaign)
+        if len(batch) >= batch_size:
+            updated += model.objects.bulk_update(batch, ['search_vector'])
+            batch = []
+    if batch:
+        updated += model.objects.bulk_update(batch, ['search_vector'])
+    return updated
+
+
+class CampaignSearchFilter(filters.SearchFilter):
+    """
+    `?search=` over the indexed campaign search vector instead of icontains scans.
+
+    Results are ordered by relevance unless the client passes `?ordering=`.
+    Views can list `search_related_fields` (e.g. owner__username) that are not in
+    the vector; those are still matched with icontains.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+
+        extra_q = None
+        for field in getattr(view, 'search_related_fields', []):
+            field_q = Q(**{f'{field}__icontains': term})
+            extra_q = field_q if extra_q is None else extra_q | field_q
+
+        queryset = search_campaigns(queryset, term, extra_q=extra_q)
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
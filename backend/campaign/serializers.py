@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Campaign, Category, File, Donation
 from organizations.serializers import OrganizationProfileSerializer
@@ -29,8 +30,8 @@ class FileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = File
-        fields = ['id', 'name', 'url', 'path', 'campaign', 'file']
-        read_only_fields = ['url', 'name', 'path']
+        fields = ['id', 'name', 'url', 'path', 'campaign', 'file', 'status', 'error']
+        read_only_fields = ['url', 'name', 'path', 'status', 'error']
 
 class CampaignSerializer(serializers.ModelSerializer):
     files = FileSerializer(many=True, read_only=True)
@@ -84,6 +85,16 @@ class CampaignSerializer(serializers.ModelSerializer):
         
         return value
     
+    def _background_uploads(self, request):
+        """
+        `background_uploads=true` returns before new files reach storage; their
+        status shows in `files`. Defaults to CAMPAIGN_UPLOADS_IN_BACKGROUND.
+        """
+        value = request.data.get('background_uploads')
+        if value in (None, ''):
+            return None
+        return str(value).lower() in ('true', '1')
+
     def update(self, instance, validated_data):
         request = self.context.get('request')
         
@@ -119,8 +130,13 @@ class CampaignSerializer(serializers.ModelSerializer):
                 try:
                     logger.info(f"Attempting to delete file with URL: {file_url}")
                     
-                    # Find the file in database by URL
-                    file_instance = instance.files.filter(url=file_url).first()
+                    # Find the file in database by URL, or by id for pending and failed files,
+                    # which have no URL; not through instance.files, whose prefetch only holds uploaded files
+                    campaign_files = File.objects.filter(campaign=instance)
+                    if str(file_url).isdigit():
+                        file_instance = campaign_files.filter(pk=int(file_url)).first()
+                    else:
+                        file_instance = campaign_files.filter(url=file_url).exclude(url='').first()
                     if file_instance:
                         logger.info(f"Found file to delete: {file_instance.name}")
                         logger.info(f"File path: {file_instance.path}")
@@ -153,47 +169,10 @@ class CampaignSerializer(serializers.ModelSerializer):
         logger.info(f"Found {len(file_keys)} new files to process: {file_keys}")
         
         if file_keys:
-            from .utils.supabase_storage import upload_file
-            
-            successful_uploads = 0
-            failed_uploads = 0
-            
-            for key in file_keys:
-                file_obj = request.FILES[key]
-                logger.info(f"Processing file {key}: {file_obj.name}, size={file_obj.size}, content_type={file_obj.content_type}")
-                
-                try:
-                    # Upload to Supabase
-                    logger.info(f"Uploading file {file_obj.name} to Supabase...")
-                    url, path = upload_file(file_obj, instance.id)
-                    
-                    if url and path:
-                        logger.info(f"SUCCESS: Uploaded {file_obj.name} to {url}")
-                        logger.info(f"File path: {path}")
-                        
-                        try:
-                            file_record = File.objects.create(
-                                name=file_obj.name,
-                                url=url,
-                                path=path,  # Store the path for future deletion
-                                campaign=instance
-                            )
-                            logger.info(f"File record created with ID: {file_record.id}")
-                            successful_uploads += 1
-                        except Exception as file_db_error:
-                            logger.error(f"Failed to create File DB record: {str(file_db_error)}")
-                            failed_uploads += 1
-                    else:
-                        logger.error(f"Failed to upload file to Supabase: No URL or path returned")
-                        failed_uploads += 1
-                
-                except Exception as upload_error:
-                    logger.error(f"Error during file upload: {str(upload_error)}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    failed_uploads += 1
-            
-            logger.info(f"Upload summary: {successful_uploads} successful, {failed_uploads} failed")
+            from .services.file_uploads import save_campaign_files
+            save_campaign_files(
+                instance, [request.FILES[key] for key in file_keys], background=self._background_uploads(request)
+            )
         
         # Update regular fields
         instance.name = validated_data.get('name', instance.name)
@@ -241,38 +220,11 @@ class CampaignSerializer(serializers.ModelSerializer):
             file_keys = [key for key in request.FILES.keys() if key.startswith('file_')]
             logger.info(f"Found {len(file_keys)} files to process: {file_keys}")
             
-            from .utils.supabase_storage import upload_file
-            
-            for key in file_keys:
-                file_obj = request.FILES[key]
-                logger.info(f"Processing file {key}: {file_obj.name}, size={file_obj.size}, content_type={file_obj.content_type}")
-                
-                try:
-                    # Upload to Supabase
-                    logger.info(f"Uploading file {file_obj.name} to Supabase...")
-                    url, path = upload_file(file_obj, campaign.id)
-                    
-                    if url:
-                        logger.info(f"SUCCESS: Uploaded {file_obj.name} to {url}")
-                        logger.info(f"Creating File DB record...")
-                        
-                        try:
-                            file_record = File.objects.create(
-                                name=file_obj.name,
-                                url=url,
-                                path=path,  # Store the path for future deletion
-                                campaign=campaign
-                            )
-                            logger.info(f"File record created with ID: {file_record.id}")
-                        except Exception as file_db_error:
-                            logger.error(f"Failed to create File DB record: {str(file_db_error)}")
-                    else:
-                        logger.error(f"Failed to upload file to Supabase: No URL returned")
-                
-                except Exception as upload_error:
-                    logger.error(f"Error during file upload: {str(upload_error)}")
-                    import traceback
-                    logger.error(traceback.format_exc())
+            if file_keys:
+                from .services.file_uploads import save_campaign_files
+                save_campaign_files(
+                    campaign, [request.FILES[key] for key in file_keys], background=self._background_uploads(request)
+                )
             
             logger.info("=== CAMPAIGN CREATION COMPLETED ===")
             return campaign
@@ -284,6 +236,26 @@ class CampaignSerializer(serializers.ModelSerializer):
             raise
 
 
+class UploadIntentFileSerializer(serializers.Serializer):
+    """A file the client is about to upload straight to storage"""
+    name = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100, default='application/octet-stream')
+    size = serializers.IntegerField(min_value=1)
+
+    def validate_size(self, value):
+        if value > settings.CAMPAIGN_FILE_MAX_SIZE:
+            raise serializers.ValidationError(f"Maximum size is {settings.CAMPAIGN_FILE_MAX_SIZE} bytes.")
+        return value
+
+
+class UploadIntentSerializer(serializers.Serializer):
+    files = UploadIntentFileSerializer(many=True, allow_empty=False)
+
+
+class CompleteUploadsSerializer(serializers.Serializer):
+    file_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
 class DonationSerializer(serializers.ModelSerializer):
     """Serializer for donation display/listing"""
     donor_display_name = serializers.ReadOnlyField()
@@ -0,0 +1,134 @@
+# campaign/services/direct_uploads.py
+"""
+Upload intents for campaign files: the browser uploads straight to storage
+with a signed URL, and Django only records and then finalizes the File rows.
+
+1. create_file_intents: pending File rows (with their storage path) and one
+   signed upload URL each
+2. the client PUTs every file to its URL
+3. complete_file_uploads: files found in storage become `uploaded`
+
+Intents never completed are settled by expire_upload_intents once their
+upload URL has expired.
+"""
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from sadagha.upload_storage import get_upload_storage
+from ..models import File
+from ..utils.supabase_storage import bucket_name
+from .file_uploads import fail_pending_files, invalidate_campaign_files
+
+logger = logging.getLogger(__name__)
+
+FILE_TOO_LARGE_ERROR = "File too large"
+UPLOAD_EXPIRED_ERROR = "Upload URL expired"
+
+# Lets an upload that started just before its URL expired still arrive
+INTENT_EXPIRY_GRACE = timedelta(minutes=10)
+
+
+def storage_path(campaign_id, name):
+    return f"campaign_{campaign_id}/{uuid.uuid4()}{os.path.splitext(name)[1]}"
+
+
+def create_file_intents(campaign, files):
+    """
+    Args:
+        files: Validated dicts with name, content_type and size
+
+    Returns:
+        List of (pending File, upload target) pairs
+    """
+    storage = get_upload_storage()
+    records = [
+        File(
+            name=file['name'],
+            url='',
+            path=storage_path(campaign.id, file['name']),
+            campaign=campaign,
+            status='pending',
+        )
+        for file in files
+    ]
+    # Signed before anything is written, so a storage failure leaves no rows behind
+    targets = [
+        storage.create_upload(bucket_name, record.path, file['content_type'], settings.CAMPAIGN_FILE_MAX_SIZE)
+        for record, file in zip(records, files)
+    ]
+    File.objects.bulk_create(records)
+    logger.info(f"Campaign {campaign.id}: {len(records)} upload intents created")
+    return list(zip(records, targets))
+
+
+def _check_uploads(storage, files):
+    """
+    Settle pending intents whose object is in storage: uploaded, or failed
+    (and the object deleted) when it is over the size limit.
+
+    Returns:
+        (settled File rows, rows whose object hasn't arrived)
+    """
+    finalized, missing = [], []
+    for file in files:
+        size = storage.object_size(bucket_name, file.path)
+        if size is None:
+            missing.append(file)
+            continue
+        if size > settings.CAMPAIGN_FILE_MAX_SIZE:
+            storage.delete(bucket_name, file.path)
+            file.status, file.error = 'failed', FILE_TOO_LARGE_ERROR
+        else:
+            file.url, file.status = storage.public_url(bucket_name, file.path), 'uploaded'
+        finalized.append(file)
+    return finalized, missing
+
+
+def complete_file_uploads(campaign, file_ids):
+    """
+    Finalize pending files whose object is now in storage.
+
+    Returns:
+        (finalized File rows, ids still waiting for their upload)
+    """
+    storage = get_upload_storage()
+    # Not campaign.files: campaigns from the viewset have only their public files prefetched
+    pending = File.objects.filter(campaign=campaign, pk__in=file_ids, status='pending', path__isnull=False)
+    finalized, missing = _check_uploads(storage, pending)
+
+    if finalized:
+        File.objects.bulk_update(finalized, ['url', 'status', 'error'])
+        invalidate_campaign_files(campaign)
+    return finalized, [file.pk for file in missing]
+
+
+def expire_upload_intents(now=None):
+    """
+    Settle intents whose upload URL has expired without the client completing
+    them. Files that did reach storage are finalized as complete_file_uploads
+    would; the rest can no longer arrive and are marked failed.
+
+    Returns:
+        Number of intents settled
+    """
+    storage = get_upload_storage()
+    cutoff = (now or timezone.now()) - storage.upload_url_ttl - INTENT_EXPIRY_GRACE
+    stale = list(
+        File.objects.filter(status='pending', path__isnull=False, created_at__lt=cutoff).select_related('campaign')
+    )
+    if not stale:
+        return 0
+
+    finalized, missing = _check_uploads(storage, stale)
+    if finalized:
+        File.objects.bulk_update(finalized, ['url', 'status', 'error'])
+        for campaign in {file.campaign_id: file.campaign for file in finalized}.values():
+            invalidate_campaign_files(campaign)
+    failed = fail_pending_files(File.objects.filter(pk__in=[file.pk for file in missing]), UPLOAD_EXPIRED_ERROR)
+    logger.info(f"Upload intents expired: {len(finalized)} found in storage, {failed} failed")
+    return len(finalized) + failed
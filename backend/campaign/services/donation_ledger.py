@@ -0,0 +1,150 @@
+# campaign/services/donation_ledger.py
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from ..models import Campaign, Donation, DonationLedgerEntry
+from ..utils.cache_tags import bump_tags, campaign_tags
+from ..utils.inline_runs import run_inline
+from .platform_stats import adjust_platform_statistics
+from .recommendation_client import get_recommendation_client
+from .urgency import refresh_campaign_urgency
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_LOCK_KEY = 'donation_ledger:rollup'
+
+
+def record_completed_donation(donation):
+    """
+    Append a completed donation to the ledger; once committed it is also sent
+    to the recommendation service's donor profiles.
+
+    Only inserts a row, so concurrent donations to the same campaign never wait
+    on its row lock. Idempotent: a donation completed twice (webhook and manual
+    sync racing) is counted once. Returns True if a new entry was written.
+    """
+    _, created = DonationLedgerEntry.objects.get_or_create(
+        donation=donation,
+        defaults={'campaign_id': donation.campaign_id, 'amount': donation.amount},
+    )
+    if created:
+        transaction.on_commit(lambda: get_recommendation_client().push_completed_donations([donation]))
+        if getattr(settings, 'DONATION_ROLLUP_INLINE', False):
+            transaction.on_commit(maybe_rollup)
+    return created
+
+
+def record_completed_donations(donations):
+    """Bulk variant of record_completed_donation for the webhook worker; duplicates are skipped"""
+    entries = [
+        DonationLedgerEntry(donation=donation, campaign_id=donation.campaign_id, amount=donation.amount)
+        for donation in donations
+    ]
+    if not entries:
+        return
+    DonationLedgerEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    transaction.on_commit(lambda: get_recommendation_client().push_completed_donations(donations))
+    if getattr(settings, 'DONATION_ROLLUP_INLINE', False):
+        transaction.on_commit(maybe_rollup)
+
+
+def maybe_rollup():
+    """
+    Optional rollup of one batch after a donation commits (DONATION_ROLLUP_INLINE),
+    off the request thread. rollup_donation_ledger --loop does the rest.
+    """
+    run_inline(ROLLUP_LOCK_KEY, rollup_ledger, 'donation rollup')
+
+
+def _count_first_time_donors(entry_ids):
+    """
+    Donors in this batch with no completed donation already counted: rolled up
+    earlier, or completed before the ledger existed (no entry)
+    """
+    counted = Donation.objects.filter(donor=OuterRef('donor'), status='completed').filter(
+        Q(ledger_entry__isnull=True) | Q(ledger_entry__rolled_up_at__isnull=False)
+    )
+    return Donation.objects.filter(ledger_entry__id__in=entry_ids, donor__isnull=False).exclude(
+        Exists(counted)
+    ).values('donor').distinct().count()
+
+
+def rollup_ledger(batch_size=None):
+    """
+    Fold one batch of pending ledger entries into campaign totals.
+
+    Entries are claimed with SKIP LOCKED so concurrent rollups split the work,
+    and each campaign gets a single `UPDATE ... SET x = x + delta`.
+
+    Returns:
+        Number of ledger entries rolled up
+    """
+    batch_size = batch_size or settings.DONATION_ROLLUP_BATCH_SIZE
+    now = timezone.now()
+
+    with transaction.atomic():
+        entries = list(
+            DonationLedgerEntry.objects.select_for_update(skip_locked=True)
+            .filter(rolled_up_at__isnull=True)
+            .order_by('id')
+            .values_list('id', 'campaign_id', 'amount')[:batch_size]
+        )
+        if not entries:
+            return 0
+
+        amounts = defaultdict(Decimal)
+        donors = defaultdict(int)
+        for _, campaign_id, amount in entries:
+            amounts[campaign_id] += amount
+            donors[campaign_id] += 1
+
+        # Same lock order in every rollup, so two of them can't deadlock
+        for campaign_id in sorted(amounts):
+            Campaign.objects.filter(pk=campaign_id).update(
+                current_amount=F('current_amount') + amounts[campaign_id],
+                number_of_donors=F('number_of_donors') + donors[campaign_id],
+                updated_at=now,
+            )
+        entry_ids = [entry[0] for entry in entries]
+        new_donors = _count_first_time_donors(entry_ids)
+        DonationLedgerEntry.objects.filter(id__in=entry_ids).update(rolled_up_at=now)
+        refresh_campaign_urgency(amounts, now)
+
+        # update() skips the post_save signals that invalidate cached responses
+        campaigns = list(Campaign.objects.filter(pk__in=amounts).only(
+            'id', 'owner_id', 'category_id', 'organization_id', 'current_amount', 'target'
+        ))
+        tags = [tag for campaign in campaigns for tag in campaign_tags(campaign)]
+        transaction.on_commit(lambda: bump_tags(*tags))
+
+        newly_funded = sum(
+            1 for campaign in campaigns
+            if campaign.current_amount - amounts[campaign.pk] < campaign.target <= campaign.current_amount
+        )
+        adjust_platform_statistics(
+            total_raised=sum(amounts.values()),
+            total_donations=len(entries),
+            unique_donors=new_donors,
+            active_campaigns=-newly_funded,
+            completed_campaigns=newly_funded,
+        )
+
+    logger.info(f"Rolled up {len(entries)} ledger entries into {len(amounts)} campaigns")
+    return len(entries)
+
+
+def rollup_pending(batch_size=None):
+    """Roll up batches until the ledger is drained; returns the number of entries"""
+    batch_size = batch_size or settings.DONATION_ROLLUP_BATCH_SIZE
+    total = 0
+    while True:
+        processed = rollup_ledger(batch_size)
+        total += processed
+        if processed < batch_size:
+            return total
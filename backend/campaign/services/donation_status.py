@@ -0,0 +1,85 @@
+# campaign/services/donation_status.py
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Donation
+from ..utils.cache_tags import bump_tags, campaign_tags
+from .donation_ledger import record_completed_donation, record_completed_donations
+from .donor_summary import record_status_changes
+
+VALID_STATUSES = {value for value, _ in Donation.STATUS_CHOICES}
+
+# A completed donation is already counted in the campaign totals and never moves back
+FINAL_STATUSES = {'completed'}
+
+# Donations still waiting on the provider; only these take a polled status
+OPEN_STATUSES = ('pending', 'processing')
+
+
+def apply_status_transition(donation, new_status, now=None):
+    """
+    Move a donation to `new_status` in memory, without saving it.
+
+    Shared by the webhook worker, the reconciliation worker and the manual
+    status sync so they all follow the same rules. Returns True if the donation changed.
+    """
+    if new_status not in VALID_STATUSES or new_status == donation.status:
+        return False
+    if donation.status in FINAL_STATUSES:
+        return False
+
+    # Kept across several transitions before a save, for the donor summary counters
+    donation.__dict__.setdefault('_previous_status', donation.status)
+    donation.status = new_status
+    if new_status == 'completed':
+        donation.completed_at = now or timezone.now()
+    return True
+
+
+def save_transitions(donations, now=None):
+    """
+    Persist donations moved by apply_status_transition in bulk.
+
+    Newly completed donations go to the ledger, and since bulk_update skips
+    post_save, donor summaries are updated and the cache tags of their
+    campaigns are bumped here. Call inside a transaction; `donation.campaign`
+    should be loaded with select_related.
+    """
+    if not donations:
+        return
+    now = now or timezone.now()
+    for donation in donations:
+        donation.updated_at = now
+    Donation.objects.bulk_update(donations, ['status', 'completed_at', 'updated_at'])
+    record_status_changes(
+        (donation.donor_id, donation.__dict__.pop('_previous_status', donation.status), donation.status)
+        for donation in donations
+    )
+
+    completed = [donation for donation in donations if donation.status == 'completed']
+    record_completed_donations(completed)
+    if completed:
+        campaigns = {donation.campaign_id: donation.campaign for donation in completed}
+        tags = [tag for campaign in campaigns.values() for tag in campaign_tags(campaign)]
+        transaction.on_commit(lambda: bump_tags(*tags))
+
+
+def apply_polled_status(donation_id, new_status):
+    """
+    Apply a status polled from the provider and save it.
+
+    The poll is slow and a webhook may move the donation meanwhile, so the
+    donation is re-read under lock and only changed while it is still open.
+
+    Returns:
+        (the current donation, whether it changed)
+    """
+    with transaction.atomic():
+        donation = Donation.objects.select_related('campaign').select_for_update(of=('self',)).get(pk=donation_id)
+        if donation.status not in OPEN_STATUSES or not apply_status_transition(donation, new_status):
+            return donation, False
+        donation.save()
+        if donation.status == 'completed':
+            # Campaign totals are rolled up from the ledger
+            record_completed_donation(donation)
+    return donation, True
@@ -0,0 +1,130 @@
+# campaign/services/donor_summary.py
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from ..models import Donation, DonorSummary
+
+logger = logging.getLogger(__name__)
+
+STATUS_FIELDS = {value: f'{value}_donations' for value, _ in Donation.STATUS_CHOICES}
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+def summary_aggregates():
+    """Aggregates over a donor's donations giving every DonorSummary figure"""
+    return {
+        'total_donated': Coalesce(Sum('amount'), Value(Decimal('0'))),
+        'donation_count': Count('id'),
+        **{field: Count('id', filter=Q(status=value)) for value, field in STATUS_FIELDS.items()},
+        'campaigns_supported': Count('campaign', distinct=True),
+        'first_donation_at': Min('created_at'),
+        'last_donation_at': Max('created_at'),
+    }
+
+
+def record_new_donation(donation):
+    """Count a newly created donation in its donor's summary"""
+    if not donation.donor_id:
+        return
+    new_campaign = not Donation.objects.filter(
+        donor_id=donation.donor_id, campaign_id=donation.campaign_id
+    ).exclude(pk=donation.pk).exists()
+    # No row yet: the lazy build on first read counts this donation
+    DonorSummary.objects.filter(donor_id=donation.donor_id).update(
+        total_donated=F('total_donated') + donation.amount,
+        donation_count=F('donation_count') + 1,
+        campaigns_supported=F('campaigns_supported') + (1 if new_campaign else 0),
+        first_donation_at=Least(F('first_donation_at'), Value(donation.created_at)),
+        last_donation_at=Greatest(F('last_donation_at'), Value(donation.created_at)),
+        updated_at=timezone.now(),
+        **{STATUS_FIELDS[donation.status]: F(STATUS_FIELDS[donation.status]) + 1},
+    )
+
+
+def record_status_changes(changes):
+    """
+    Move donations between the per-status counters.
+
+    Args:
+        changes: Iterable of (donor_id, previous_status, new_status)
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for donor_id, previous_status, new_status in changes:
+        if donor_id and previous_status != new_status:
+            deltas[donor_id][STATUS_FIELDS[previous_status]] -= 1
+            deltas[donor_id][STATUS_FIELDS[new_status]] += 1
+
+    now = timezone.now()
+    # Same lock order everywhere, so two batches touching the same donors can't deadlock
+    for donor_id in sorted(deltas):
+        updates = {field: F(field) + delta for field, delta in deltas[donor_id].items() if delta}
+        if updates:
+            DonorSummary.objects.filter(donor_id=donor_id).update(updated_at=now, **updates)
+
+
+def forget_donor_summary(donor_id):
+    """Drop a donor's summary so the next read rebuilds it (after deletions and reassignments)"""
+    if donor_id:
+        DonorSummary.objects.filter(donor_id=donor_id).delete()
+
+
+def build_donor_summary(donor_id):
+    """Create (or overwrite) a donor's summary from a full aggregate of their donations"""
+    figures = Donation.objects.filter(donor_id=donor_id).aggregate(**summary_aggregates())
+    summary, _ = DonorSummary.objects.update_or_create(
+        donor_id=donor_id, defaults={**figures, 'updated_at': timezone.now()}
+    )
+    return summary
+
+
+def get_donor_summary(donor_id):
+    """A donor's summary: one primary key lookup, built on first read"""
+    summary = DonorSummary.objects.filter(donor_id=donor_id).first()
+    if summary is not None:
+        return summary
+    try:
+        with transaction.atomic():
+            return build_donor_summary(donor_id)
+    except IntegrityError:
+        # Built concurrently by another request
+        return DonorSummary.objects.get(donor_id=donor_id)
+
+
+def rebuild_donor_summaries(donor_ids=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Recompute summaries from scratch with one grouped aggregate per chunk of
+    donors, written with a bulk upsert.
+
+    Returns:
+        Number of summaries written
+    """
+    if donor_ids is None:
+        donor_ids = list(
+            Donation.objects.filter(donor__isnull=False).order_by('donor_id').values_list('donor_id', flat=True).distinct()
+        )
+    donor_ids = sorted(donor_ids)
+    fields = list(summary_aggregates())
+    written = 0
+    for start in range(0, len(donor_ids), chunk_size):
+        chunk = donor_ids[start:start + chunk_size]
+        now = timezone.now()
+        rows = Donation.objects.filter(donor_id__in=chunk).order_by().values('donor_id').annotate(**summary_aggregates())
+        summaries = [DonorSummary(updated_at=now, **row) for row in rows]
+        with transaction.atomic():
+            DonorSummary.objects.bulk_create(
+                summaries, update_conflicts=True, unique_fields=['donor'], update_fields=fields + ['updated_at']
+            )
+            # Donors left with no donations (all deleted or reassigned)
+            DonorSummary.objects.filter(donor_id__in=chunk).exclude(
+                donor_id__in=[summary.donor_id for summary in summaries]
+            ).delete()
+        written += len(summaries)
+    logger.info(f"Rebuilt {written} donor summaries")
+    return written
@@ -0,0 +1,220 @@
+# campaign/services/file_uploads.py
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import Campaign, File
+from ..utils.cache_tags import bump_tags, campaign_tags
+from ..utils.supabase_storage import delete_file, upload_bytes
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FAILED_ERROR = "Storage upload failed"
+UPLOAD_TIMEOUT_ERROR = "Upload did not finish"
+
+
+@dataclass
+class PendingUpload:
+    """Content of an uploaded file, read while the request's file handles are still open"""
+    name: str
+    content: bytes
+    content_type: str
+
+
+def read_uploads(file_objs) -> List[PendingUpload]:
+    return [
+        PendingUpload(
+            name=file_obj.name,
+            content=file_obj.read(),
+            content_type=getattr(file_obj, 'content_type', None) or 'application/octet-stream',
+        )
+        for file_obj in file_objs
+    ]
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_upload_executor() -> ThreadPoolExecutor:
+    """Process-wide pool bounding concurrent storage uploads across requests"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.CAMPAIGN_UPLOAD_WORKERS, thread_name_prefix='campaign-upload'
+                )
+    return _executor
+
+
+def _upload(campaign_id, upload: PendingUpload) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        return upload_bytes(upload.content, upload.name, upload.content_type, campaign_id)
+    except Exception as e:
+        logger.error(f"Error uploading {upload.name}: {str(e)}")
+        return None, None
+
+
+def invalidate_campaign_files(campaign):
+    # bulk_create and update() skip the File signals, which refresh the cached campaign
+    Campaign.objects.filter(pk=campaign.pk).update(updated_at=timezone.now())
+    tags = campaign_tags(campaign)
+    transaction.on_commit(lambda: bump_tags(*tags))
+
+
+def upload_campaign_files(campaign, file_objs):
+    """
+    Upload files concurrently and wait for all of them, so the request takes
+    about as long as the slowest upload instead of the sum of all of them.
+    File rows for the successful uploads are created with one bulk_create.
+
+    Returns:
+        (created File rows, names of the files that failed to upload)
+    """
+    uploads = read_uploads(file_objs)
+    if not uploads:
+        return [], []
+
+    results = list(get_upload_executor().map(lambda upload: _upload(campaign.id, upload), uploads))
+
+    records, failed = [], []
+    for upload, (url, path) in zip(uploads, results):
+        if url and path:
+            records.append(File(name=upload.name, url=url, path=path, campaign=campaign, status='uploaded'))
+        else:
+            failed.append(upload.name)
+
+    if records:
+        File.objects.bulk_create(records)
+        invalidate_campaign_files(campaign)
+    logger.info(f"Campaign {campaign.id} uploads: {len(records)} successful, {len(failed)} failed")
+    return records, failed
+
+
+def _finish_background_upload(file_id, campaign_id, upload: PendingUpload):
+    try:
+        url, path = _upload(campaign_id, upload)
+        file_record = File.objects.filter(pk=file_id).first()
+        if file_record is None:
+            # Deleted (or its campaign was) while uploading
+            if path:
+                delete_file(path)
+            return
+        if url and path:
+            file_record.url, file_record.path, file_record.status = url, path, 'uploaded'
+        else:
+            file_record.status, file_record.error = 'failed', UPLOAD_FAILED_ERROR
+        # A regular save, so the File signals refresh the cached campaign
+        file_record.save(update_fields=['url', 'path', 'status', 'error'])
+    except Exception as e:
+        logger.error(f"Background upload of file {file_id} failed: {str(e)}")
+    finally:
+        # Pool threads outlive the task; don't leave their connections open
+        connection.close()
+
+
+def enqueue_campaign_files(campaign, file_objs):
+    """
+    Create pending File rows in one bulk_create and upload the files on the
+    pool once the transaction commits, without waiting for them. Each row's
+    status moves to uploaded or failed as its upload finishes.
+
+    Returns:
+        The pending File rows
+    """
+    uploads = read_uploads(file_objs)
+    if not uploads:
+        return []
+
+    records = File.objects.bulk_create([
+        File(name=upload.name, url='', campaign=campaign, status='pending') for upload in uploads
+    ])
+    invalidate_campaign_files(campaign)
+
+    def submit():
+        executor = get_upload_executor()
+        for record, upload in zip(records, uploads):
+            executor.submit(_finish_background_upload, record.pk, campaign.id, upload)
+
+    transaction.on_commit(submit)
+    logger.info(f"Campaign {campaign.id}: queued {len(records)} uploads")
+    return records
+
+
+def fail_pending_files(queryset, error):
+    """
+    Mark the pending files of `queryset` failed and refresh their campaigns.
+
+    Returns:
+        Number of files marked failed
+    """
+    rows = list(queryset.filter(status='pending').values_list('pk', 'campaign_id'))
+    if not rows:
+        return 0
+    # A file that finished in the meantime is no longer pending and keeps its status
+    failed = File.objects.filter(pk__in=[pk for pk, _ in rows], status='pending').update(status='failed', error=error)
+    for campaign in Campaign.objects.filter(pk__in={campaign_id for _, campaign_id in rows}):
+        invalidate_campaign_files(campaign)
+    return failed
+
+
+def expire_background_uploads(now=None):
+    """
+    Fail background uploads still pending after CAMPAIGN_UPLOAD_PENDING_TIMEOUT.
+
+    Their upload ran on an instance that stopped before reporting back, so
+    nothing else would ever move them out of pending. If the upload does
+    finish later after all, it still marks the file uploaded.
+    """
+    cutoff = (now or timezone.now()) - timedelta(seconds=settings.CAMPAIGN_UPLOAD_PENDING_TIMEOUT)
+    # Background uploads get their path only when they finish; direct upload intents have one from the start
+    stale = File.objects.filter(status='pending', path__isnull=True, created_at__lt=cutoff)
+    return fail_pending_files(stale, UPLOAD_TIMEOUT_ERROR)
+
+
+def purge_failed_files(now=None):
+    """
+    Delete failed files created more than CAMPAIGN_FAILED_FILE_RETENTION ago.
+
+    They are only listed to their campaign's owner, long enough to see what
+    didn't upload and try again; nothing references them afterwards.
+
+    Returns:
+        Number of files deleted
+    """
+    cutoff = (now or timezone.now()) - timedelta(seconds=settings.CAMPAIGN_FAILED_FILE_RETENTION)
+    rows = list(File.objects.filter(status='failed', created_at__lt=cutoff).values_list('pk', 'campaign_id', 'path'))
+    if not rows:
+        return 0
+    for _, _, path in rows:
+        # An expired upload intent may still have written a partial object
+        if path:
+            try:
+                delete_file(path)
+            except Exception as e:
+                logger.error(f"Error deleting failed upload {path}: {str(e)}")
+    deleted, _ = File.objects.filter(pk__in=[pk for pk, _, _ in rows], status='failed').delete()
+    for campaign in Campaign.objects.filter(pk__in={campaign_id for _, campaign_id, _ in rows}):
+        invalidate_campaign_files(campaign)
+    return deleted
+
+
+def save_campaign_files(campaign, file_objs, background=None):
+    """
+    Store new campaign files, in the background when `background` (default:
+    CAMPAIGN_UPLOADS_IN_BACKGROUND) is set.
+    """
+    if background is None:
+        background = settings.CAMPAIGN_UPLOADS_IN_BACKGROUND
+    if background:
+        return enqueue_campaign_files(campaign, file_objs)
+    records, _ = upload_campaign_files(campaign, file_objs)
+    return records
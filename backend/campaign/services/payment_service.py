@@ -1,11 +1,15 @@
 # campaign/services/payment_service.py
 import requests
 import logging
+import threading
+import time
+from collections import OrderedDict
 from django.conf import settings
 from decimal import Decimal
 from typing import Dict, Any, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from ..utils.circuit_breaker import CircuitBreaker
 
 
 
@@ -14,26 +18,39 @@ logger = logging.getLogger(__name__)
 class NextRemitlyService:
     """Service for handling NextRemitly payment integration"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: Optional[str] = None, breaker: Optional[CircuitBreaker] = None):
         self.api_key = api_key
-        # self.base_url = getattr(settings, 'NEXTREMITLY_BASE_URL')
-        self.base_url = "https://nextremitly-backend-fe52128f2003.herokuapp.com"
-        # self.frontend_url = getattr(settings, 'NEXTREMITLY_FRONTEND_URL')
-        self.frontend_url = "https://next-remitly-frontend.vercel.app"
+        self.base_url = (base_url or settings.NEXTREMITLY_BASE_URL).rstrip('/')
+        self.frontend_url = settings.NEXTREMITLY_FRONTEND_URL
         self.timeout = 30
+        self.breaker = breaker
         
-        # Setup session with retries
+        # Setup session with retries. POST is not retried: a retried session
+        # creation can charge twice, and the circuit breaker handles outages.
         self.session = requests.Session()
         retry_strategy = Retry(
             total=3,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"],
+            allowed_methods=["HEAD", "GET"],
             backoff_factor=1
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        pool_size = getattr(settings, 'NEXTREMITLY_POOL_SIZE', 10)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=1, pool_maxsize=pool_size)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
     
+    def _circuit_open(self) -> bool:
+        return self.breaker is not None and not self.breaker.allow()
+    
+    def _record_outcome(self, response: Optional[requests.Response]):
+        """Feed the shared breaker: 5xx and transport errors count as failures"""
+        if self.breaker is None:
+            return
+        if response is None or response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authorization"""
         return {
@@ -107,6 +124,10 @@ class NextRemitlyService:
             }
         }
         
+        if self._circuit_open():
+            logger.warning("NextRemitly circuit open, refusing payment session creation")
+            return {"success": False, "error": "Payment service temporarily unavailable"}
+        
         try:
             logger.info(f"Creating payment session for campaign {campaign.id}, amount: {amount} MRU")
             logger.debug(f"Payment data: {payment_data}")
@@ -117,19 +138,23 @@ class NextRemitlyService:
                 headers=self._get_headers(),
                 timeout=self.timeout
             )
+            self._record_outcome(response)
             
             logger.info(f"NextRemitly response status: {response.status_code}")
             return self._handle_response(response, "Payment session creation")
             
         except requests.exceptions.Timeout:
+            self._record_outcome(None)
             logger.error("NextRemitly request timeout")
             return {"success": False, "error": "Payment service timeout - please try again"}
         
         except requests.exceptions.ConnectionError:
+            self._record_outcome(None)
             logger.error("NextRemitly connection error")
             return {"success": False, "error": "Cannot connect to payment service"}
         
         except requests.exceptions.RequestException as e:
+            self._record_outcome(None)
             logger.error(f"NextRemitly request error: {str(e)}")
             return {"success": False, "error": "Payment service temporarily unavailable"}
         
@@ -139,6 +164,9 @@ class NextRemitlyService:
     
     def get_payment_status(self, session_id: str) -> Dict[str, Any]:
         """Get payment status from NextRemitly"""
+        if self._circuit_open():
+            return {"success": False, "error": "Payment service temporarily unavailable"}
+        
         try:
             logger.info(f"Getting payment status for session: {session_id}")
             
@@ -147,10 +175,12 @@ class NextRemitlyService:
                 headers=self._get_headers(),
                 timeout=10
             )
+            self._record_outcome(response)
             
             return self._handle_response(response, "Payment status retrieval")
             
         except requests.exceptions.RequestException as e:
+            self._record_outcome(None)
             logger.error(f"Error getting payment status: {str(e)}")
             return {"success": False, "error": "Cannot retrieve payment status"}
     
@@ -167,6 +197,96 @@ class NextRemitlyService:
             return False
 
 
+class NextRemitlyClientRegistry:
+    """
+    Long-lived NextRemitlyService per API key, so payments reuse pooled
+    connections instead of opening a new session and TLS handshake each time.
+
+    All clients share one circuit breaker, and a daemon thread probes
+    /api/health/ every NEXTREMITLY_HEALTH_INTERVAL seconds, feeding the same
+    breaker, so requests never pay for a health check themselves.
+    """
+    
+    def __init__(self, base_url: Optional[str] = None, max_clients: int = 256,
+                 health_interval: Optional[float] = None):
+        self.base_url = base_url or settings.NEXTREMITLY_BASE_URL
+        self.max_clients = max_clients
+        self.health_interval = (
+            health_interval if health_interval is not None
+            else getattr(settings, 'NEXTREMITLY_HEALTH_INTERVAL', 30)
+        )
+        self.breaker = CircuitBreaker('nextremitly', failure_threshold=5, reset_timeout=30)
+        self.healthy: Optional[bool] = None
+        self.last_health_check: Optional[float] = None
+        self._clients: "OrderedDict[str, NextRemitlyService]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+    
+    def get(self, api_key: str) -> NextRemitlyService:
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                client = NextRemitlyService(api_key, base_url=self.base_url, breaker=self.breaker)
+                self._clients[api_key] = client
+                if len(self._clients) > self.max_clients:
+                    # Not closed here: another thread may still be mid-request on it.
+                    # Its pooled connections are closed once the last reference goes.
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(api_key)
+            self._start_health_monitor()
+        return client
+    
+    def check_health(self) -> Optional[bool]:
+        """Probe the provider once with the most recently used client"""
+        with self._lock:
+            client = next(reversed(self._clients.values()), None)
+        if client is None:
+            return None
+        
+        self.healthy = client.test_connection()
+        self.last_health_check = time.time()
+        if self.healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+            logger.warning("NextRemitly health check failed")
+        return self.healthy
+    
+    def _start_health_monitor(self):
+        if self.health_interval <= 0 or (self._health_thread and self._health_thread.is_alive()):
+            return
+        self._health_thread = threading.Thread(target=self._health_loop, name='nextremitly-health', daemon=True)
+        self._health_thread.start()
+    
+    def _health_loop(self):
+        while True:
+            time.sleep(self.health_interval)
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.error(f"NextRemitly health check error: {str(e)}")
+    
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.session.close()
+            self._clients.clear()
+
+
+_registry: Optional[NextRemitlyClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> NextRemitlyClientRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = NextRemitlyClientRegistry()
+    return _registry
+
+
 class PaymentServiceManager:
     """Manager for handling payment operations across organizations"""
     
@@ -181,17 +301,9 @@ class PaymentServiceManager:
                 "error": "Organization cannot receive payments. Please check API key setup."
             }
         
-        # Create service instance with organization's API key
-        service = NextRemitlyService(campaign.organization.nextremitly_api_key)
-        
-        # Test connection first
-        if not service.test_connection():
-            return {
-                "success": False,
-                "error": "Cannot connect to payment service. Please check API key."
-            }
-        
-        # Create payment session
+        # Pooled client for the organization's API key; provider health is
+        # tracked in the background, so this is the only call to NextRemitly
+        service = get_client_registry().get(campaign.organization.nextremitly_api_key)
         return service.create_payment_session(amount, campaign, donor_data)
     
     @staticmethod
@@ -204,7 +316,7 @@ class PaymentServiceManager:
         if not donation.campaign.organization.nextremitly_api_key:
             return {"success": False, "error": "Organization API key not configured"}
         
-        service = NextRemitlyService(donation.campaign.organization.nextremitly_api_key)
+        service = get_client_registry().get(donation.campaign.organization.nextremitly_api_key)
         return service.get_payment_status(donation.payment_session_id)
     
     @staticmethod
@@ -218,7 +330,7 @@ class PaymentServiceManager:
         logger.info(f"API key length: {len(organization.nextremitly_api_key)}")
         logger.info(f"API key starts with: {organization.nextremitly_api_key[:10]}")
         
-        service = NextRemitlyService(organization.nextremitly_api_key)
+        service = get_client_registry().get(organization.nextremitly_api_key)
         
         # Add more detailed testing
         connection_result = service.test_connection()
@@ -0,0 +1,101 @@
+# campaign/services/platform_stats.py
+import logging
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from ..models import Campaign, Category, Donation, PlatformStatistics
+
+logger = logging.getLogger(__name__)
+
+STATS_PK = 1
+
+
+def adjust_platform_statistics(**deltas):
+    """
+    Add deltas to the platform statistics counters, e.g. total_donations=3.
+
+    Applied with one `UPDATE ... SET x = x + delta` after the surrounding
+    transaction commits, so the single row is locked only for that statement
+    and never for the duration of a donation or campaign transaction. A delta
+    lost to a crash is corrected by the next full recount.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    def apply():
+        updates = {field: F(field) + delta for field, delta in deltas.items()}
+        # Until the row is first built there is nothing to adjust; the build counts everything
+        PlatformStatistics.objects.filter(pk=STATS_PK).update(updated_at=timezone.now(), **updates)
+
+    transaction.on_commit(apply)
+
+
+def funding_state_delta(current_amount, target, sign=1):
+    """active/completed deltas for a campaign entering (sign=1) or leaving (sign=-1) the counts"""
+    if current_amount >= target:
+        return {'completed_campaigns': sign}
+    return {'active_campaigns': sign}
+
+
+def count_platform_statistics():
+    """Full recount of every figure from the source tables"""
+    from accounts.models import User
+
+    campaign_stats = Campaign.objects.aggregate(
+        total_campaigns=Count('id'),
+        active_campaigns=Count('id', filter=Q(current_amount__lt=F('target'))),
+        completed_campaigns=Count('id', filter=Q(current_amount__gte=F('target'))),
+        total_raised=Sum('current_amount'),
+    )
+    user_stats = User.objects.aggregate(
+        organizations=Count('id', filter=Q(role='organization')),
+        verified_organizations=Count(
+            'id', filter=Q(role='organization', organization_profile__is_verified=True)
+        ),
+        volunteers=Count('id', filter=Q(role='volunteer')),
+    )
+    donation_stats = Donation.objects.filter(status='completed').aggregate(
+        total_donations=Count('id'),
+        unique_donors=Count('donor', distinct=True),
+    )
+    return {
+        **campaign_stats,
+        'total_raised': campaign_stats['total_raised'] or Decimal('0'),
+        **user_stats,
+        **donation_stats,
+        'categories': Category.objects.count(),
+    }
+
+
+def reconcile_platform_statistics():
+    """
+    Rebuild the row from a full recount.
+
+    Returns:
+        Drift per figure between the incrementally maintained row and the recount
+    """
+    counts = count_platform_statistics()
+    now = timezone.now()
+    previous = PlatformStatistics.objects.filter(pk=STATS_PK).values(*counts).first()
+    PlatformStatistics.objects.update_or_create(
+        pk=STATS_PK, defaults={**counts, 'updated_at': now, 'reconciled_at': now}
+    )
+    if previous is None:
+        return {}
+    drift = {field: counts[field] - previous[field] for field in counts if counts[field] != previous[field]}
+    if drift:
+        logger.warning(f"Platform statistics drift corrected: {drift}")
+    return drift
+
+
+def get_platform_statistics():
+    """The statistics row, built with a full recount the first time"""
+    stats = PlatformStatistics.objects.filter(pk=STATS_PK).first()
+    if stats is None:
+        reconcile_platform_statistics()
+        stats = PlatformStatistics.objects.get(pk=STATS_PK)
+    return stats
@@ -0,0 +1,207 @@
+# campaign/services/recommendation_client.py
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from ..utils.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationServiceError(Exception):
+    """The recommendation service could not answer (down, slow, circuit open or bad response)"""
+
+
+class RecommendationClient:
+    """
+    Pooled client for the FastAPI recommendation service.
+
+    - strict (connect, read) timeouts and a circuit breaker, so a slow service
+      can't tie up Django workers
+    - results are cached with a soft TTL: past it the last good result is still
+      served while one background refresh runs (stale-while-revalidate), and it
+      is kept for RECOMMENDATION_STALE_TIMEOUT to cover outages
+    - identical in-flight fetches in a process share one request
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = (base_url or settings.FASTAPI_URL).rstrip('/')
+        self.timeout = (settings.RECOMMENDATION_CONNECT_TIMEOUT, settings.RECOMMENDATION_READ_TIMEOUT)
+        self.fresh_for = settings.RECOMMENDATION_CACHE_TIMEOUT
+        self.keep_for = settings.RECOMMENDATION_STALE_TIMEOUT
+        self.breaker = CircuitBreaker('recommendation-service', failure_threshold=5, reset_timeout=30)
+
+        self.session = requests.Session()
+        # No retries: a retry would double the time a worker waits on a struggling service
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.RECOMMENDATION_POOL_SIZE, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='recommendation-refresh')
+
+    def _fetch(self, path: str) -> Dict[str, Any]:
+        if not self.breaker.allow():
+            raise RecommendationServiceError("circuit open")
+        try:
+            response = self.session.get(f"{self.base_url}{path}", timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            self.breaker.record_failure()
+            raise RecommendationServiceError(str(e))
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+            raise RecommendationServiceError(f"status {response.status_code}")
+        self.breaker.record_success()
+        if response.status_code != 200:
+            raise RecommendationServiceError(f"status {response.status_code}")
+        try:
+            return response.json()
+        except ValueError:
+            raise RecommendationServiceError("invalid JSON")
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.breaker.allow():
+            raise RecommendationServiceError("circuit open")
+        try:
+            response = self.session.post(
+                f"{self.base_url}{path}",
+                json=payload,
+                headers={'X-Service-Token': settings.RECOMMENDATION_SERVICE_TOKEN},
+                timeout=self.timeout,
+            )
+        except requests.exceptions.RequestException as e:
+            self.breaker.record_failure()
+            raise RecommendationServiceError(str(e))
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+            raise RecommendationServiceError(f"status {response.status_code}")
+        self.breaker.record_success()
+        if response.status_code not in (200, 202):
+            raise RecommendationServiceError(f"status {response.status_code}")
+        return response.json()
+
+    def _singleflight(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Run `fetch` once per key at a time; concurrent callers wait for the same result"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if leader:
+            try:
+                future.set_result(fetch())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+        return future.result()
+
+    def _fetch_and_store(self, path: str, cache_key: str) -> Dict[str, Any]:
+        data = self._fetch(path)
+        cache.set(cache_key, {'data': data, 'fetched_at': time.time()}, timeout=self.keep_for)
+        return data
+
+    def _refresh_in_background(self, path: str, cache_key: str):
+        # The cache lock coalesces refreshes across processes, the singleflight within one
+        if not cache.add(f"{cache_key}:refreshing", 1, timeout=int(sum(self.timeout)) + 1):
+            return
+
+        def refresh():
+            try:
+                self._singleflight(cache_key, lambda: self._fetch_and_store(path, cache_key))
+            except RecommendationServiceError as e:
+                logger.warning(f"Background refresh of {path} failed: {str(e)}")
+            finally:
+                cache.delete(f"{cache_key}:refreshing")
+
+        self._refresher.submit(refresh)
+
+    def get(self, path: str, cache_key: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Response body for `path`, and whether it is stale.
+        Raises RecommendationServiceError only when there is nothing cached to fall back on.
+        """
+        entry = cache.get(cache_key)
+        if entry is not None:
+            stale = time.time() - entry['fetched_at'] >= self.fresh_for
+            if stale:
+                self._refresh_in_background(path, cache_key)
+            return entry['data'], stale
+
+        return self._singleflight(cache_key, lambda: self._fetch_and_store(path, cache_key)), False
+
+    def user_recommendations(self, user_id: int) -> Tuple[List[Dict], bool]:
+        data, stale = self.get(f"/recommendations/{user_id}", f"recommendation_service:user:{user_id}")
+        return data.get("recommendations", []), stale
+
+    def push_completed_donations(self, donations):
+        """
+        Send completed donations to the service's donor profiles in the background.
+        Best effort: a donation that doesn't get through is picked up by the
+        service's next data refresh, and repeats are ignored there.
+        """
+        if not settings.RECOMMENDATION_SERVICE_TOKEN:
+            return
+        payloads = [
+            (donation.donor_id, {
+                'donation_id': donation.id,
+                'campaign_id': donation.campaign_id,
+                'amount': float(donation.amount),
+                'created_at': donation.created_at.isoformat() if donation.created_at else None,
+            })
+            for donation in donations if donation.donor_id
+        ]
+        if not payloads:
+            return
+
+        def push():
+            for donor_id, payload in payloads:
+                try:
+                    self._post(f"/recommendations/profiles/{donor_id}/donations", payload)
+                except (RecommendationServiceError, ValueError) as e:
+                    logger.warning(f"Pushing donation {payload['donation_id']} to the recommendation service failed: {str(e)}")
+
+        self._refresher.submit(push)
+
+    def request_similar_refresh(self):
+        """
+        Ask the service to recompute the similar campaigns affected by changed
+        campaigns, in the background. The service folds requests that arrive
+        while a run is in progress into one follow-up run.
+        """
+        if not settings.RECOMMENDATION_SERVICE_TOKEN:
+            return
+
+        def request():
+            try:
+                self._post("/recommendations/similar/refresh", {})
+            except (RecommendationServiceError, ValueError) as e:
+                logger.warning(f"Requesting a similar campaigns refresh failed: {str(e)}")
+
+        self._refresher.submit(request)
+
+
+_client: Optional[RecommendationClient] = None
+_client_lock = threading.Lock()
+
+
+def get_recommendation_client() -> RecommendationClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = RecommendationClient()
+    return _client
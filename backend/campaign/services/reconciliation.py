@@ -0,0 +1,135 @@
+# campaign/services/reconciliation.py
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Donation
+from .donation_status import OPEN_STATUSES, apply_status_transition, save_transitions
+from .payment_service import PaymentServiceManager
+
+logger = logging.getLogger(__name__)
+
+
+def find_stale_donations(stale_after=None, max_age=None, limit=None):
+    """
+    Open donations with a payment session that nothing has touched for `stale_after`,
+    oldest first. Sessions older than `max_age` are abandoned and no longer polled.
+    """
+    now = timezone.now()
+    stale_after = stale_after or timedelta(minutes=settings.RECONCILE_STALE_MINUTES)
+    max_age = max_age or timedelta(days=settings.RECONCILE_MAX_AGE_DAYS)
+    queryset = Donation.objects.select_related('campaign', 'campaign__organization').filter(
+        status__in=OPEN_STATUSES,
+        payment_session_id__isnull=False,
+        updated_at__lt=now - stale_after,
+        created_at__gte=now - max_age,
+    ).exclude(
+        campaign__organization__isnull=True
+    ).exclude(
+        campaign__organization__nextremitly_api_key=''
+    ).order_by('updated_at')
+    return list(queryset[:limit or settings.RECONCILE_BATCH_SIZE])
+
+
+def _poll(donation):
+    try:
+        return PaymentServiceManager.get_payment_status_for_donation(donation)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def reconcile_batch(donations, workers=None):
+    """
+    Poll NextRemitly for each donation on a bounded thread pool (pooled clients,
+    shared circuit breaker) and apply the resulting transitions in one transaction.
+
+    Donations that did not change (still open at the provider, or the poll failed)
+    get their updated_at touched, so they are polled again only after another
+    RECONCILE_STALE_MINUTES.
+
+    Returns:
+        Stats dict for this batch
+    """
+    started = time.monotonic()
+    now = timezone.now()
+    lags = [(now - donation.updated_at).total_seconds() for donation in donations]
+
+    with ThreadPoolExecutor(max_workers=workers or settings.RECONCILE_WORKERS) as executor:
+        results = list(executor.map(_poll, donations))
+
+    outcomes = Counter()
+    polled = {}
+    failed_ids = []
+    for donation, result in zip(donations, results):
+        if result.get('success'):
+            polled[donation.id] = result.get('status')
+        else:
+            failed_ids.append(donation.id)
+    outcomes['errors'] = len(failed_ids)
+
+    with transaction.atomic():
+        # Re-read under lock: a webhook may have moved the donation while we polled,
+        # and one it completed, failed or cancelled must not take the stale poll result
+        locked = Donation.objects.select_related('campaign').select_for_update(of=('self',)).filter(
+            id__in=list(polled), status__in=OPEN_STATUSES
+        )
+        changed = []
+        unchanged_ids = []
+        for donation in locked:
+            if apply_status_transition(donation, polled[donation.id], now):
+                changed.append(donation)
+                outcomes[donation.status] += 1
+            else:
+                unchanged_ids.append(donation.id)
+        save_transitions(changed, now)
+        Donation.objects.filter(id__in=unchanged_ids + failed_ids).update(updated_at=now)
+        outcomes['unchanged'] = len(unchanged_ids)
+
+    elapsed = time.monotonic() - started
+    return {
+        'checked': len(donations),
+        'transitioned': len(changed),
+        'outcomes': dict(outcomes),
+        'elapsed_seconds': round(elapsed, 3),
+        'per_second': round(len(donations) / elapsed, 1) if elapsed > 0 else 0.0,
+        'max_lag_seconds': round(max(lags), 1) if lags else 0.0,
+        'mean_lag_seconds': round(sum(lags) / len(lags), 1) if lags else 0.0,
+    }
+
+
+def reconcile_stale_donations(batch_size=None, workers=None, stale_after=None, max_batches=None):
+    """
+    Reconcile stale donations batch by batch until none are left (or `max_batches`).
+
+    Returns:
+        Aggregate report: donations checked and transitioned, throughput, and the
+        largest lag (time since last update) seen among reconciled donations
+    """
+    started = time.monotonic()
+    report = {'batches': 0, 'checked': 0, 'transitioned': 0, 'outcomes': Counter(), 'max_lag_seconds': 0.0}
+    while max_batches is None or report['batches'] < max_batches:
+        donations = find_stale_donations(stale_after=stale_after, limit=batch_size)
+        if not donations:
+            break
+        stats = reconcile_batch(donations, workers)
+        report['batches'] += 1
+        report['checked'] += stats['checked']
+        report['transitioned'] += stats['transitioned']
+        report['outcomes'].update(stats['outcomes'])
+        report['max_lag_seconds'] = max(report['max_lag_seconds'], stats['max_lag_seconds'])
+        logger.info(f"Reconciled batch: {stats}")
+        if stats['outcomes'].get('errors') == stats['checked']:
+            # Provider unreachable (or circuit open); retry on the next run
+            break
+
+    elapsed = time.monotonic() - started
+    report['outcomes'] = dict(report['outcomes'])
+    report['elapsed_seconds'] = round(elapsed, 3)
+    report['per_second'] = round(report['checked'] / elapsed, 1) if elapsed > 0 else 0.0
+    return report
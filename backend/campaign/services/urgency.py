@@ -0,0 +1,79 @@
+# campaign/services/urgency.py
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Case, F, FloatField, Value, When
+from django.utils import timezone
+
+# Campaigns younger than this are scored but not ranked as urgent yet (the urgent view filters them)
+MIN_AGE = timedelta(days=2)
+SWEEP_CHUNK_SIZE = 1000
+
+
+def urgency_expression(now=None):
+    """
+    Urgency score of a campaign as a database expression, in [0, 1]:
+    funding gap 40%, time since creation 30%, time since last update 20%,
+    donor engagement 10%.
+
+    Fully funded campaigns score NULL, so they are left out of the
+    (-urgency_score) index scan entirely. Young campaigns get a score like any
+    other, so they are ranked as soon as they pass MIN_AGE even if nothing
+    saves them again.
+    """
+    now = now or timezone.now()
+    score = Case(
+        # Funding gap score (40% weight), compared against target to avoid dividing
+        When(current_amount__lt=F('target') * Decimal('0.20'), then=Value(0.4)),  # 1.0 * 0.4
+        When(current_amount__lt=F('target') * Decimal('0.50'), then=Value(0.32)),  # 0.8 * 0.4
+        default=Value(0.12),  # 0.3 * 0.4
+        output_field=FloatField()
+    ) + Case(
+        # Time pressure score (30% weight) - older campaigns more urgent
+        When(created_at__lt=now - timedelta(days=30), then=Value(0.27)),  # 0.9 * 0.3
+        When(created_at__lt=now - timedelta(days=14), then=Value(0.21)),  # 0.7 * 0.3
+        default=Value(0.12),  # 0.4 * 0.3
+        output_field=FloatField()
+    ) + Case(
+        # Activity momentum score (20% weight) - stagnant campaigns more urgent
+        When(updated_at__lt=now - timedelta(days=7), then=Value(0.18)),  # 0.9 * 0.2
+        When(updated_at__lt=now - timedelta(days=3), then=Value(0.12)),  # 0.6 * 0.2
+        default=Value(0.04),  # 0.2 * 0.2
+        output_field=FloatField()
+    ) + Case(
+        # Donor engagement score (10% weight)
+        When(number_of_donors__lt=5, then=Value(0.10)),  # 1.0 * 0.1
+        When(number_of_donors__lt=20, then=Value(0.06)),  # 0.6 * 0.1
+        default=Value(0.03),  # 0.3 * 0.1
+        output_field=FloatField()
+    )
+    return Case(
+        When(current_amount__gte=F('target'), then=Value(None)),
+        default=score,
+        output_field=FloatField()
+    )
+
+
+def refresh_urgency_scores(queryset, now=None):
+    """Recompute urgency_score for the campaigns in `queryset` with single UPDATE statements"""
+    now = now or timezone.now()
+    expression = urgency_expression(now)
+    ids = list(queryset.order_by('id').values_list('id', flat=True))
+    updated = 0
+    for start in range(0, len(ids), SWEEP_CHUNK_SIZE):
+        chunk = ids[start:start + SWEEP_CHUNK_SIZE]
+        updated += queryset.model.objects.filter(id__in=chunk).update(urgency_score=expression)
+    return updated
+
+
+def refresh_campaign_urgency(campaign_ids, now=None):
+    """Incremental refresh after donations roll up or a campaign is saved"""
+    from ..models import Campaign
+
+    if not campaign_ids:
+        return 0
+    return Campaign.objects.filter(id__in=list(campaign_ids)).update(urgency_score=urgency_expression(now))
+
+
+def urgency_level(score):
+    return 'critical' if score >= 0.8 else 'high' if score >= 0.6 else 'medium'
@@ -0,0 +1,109 @@
+# campaign/services/webhook_ingestion.py
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Donation, WebhookEvent
+from ..utils.inline_runs import run_inline
+from .donation_status import VALID_STATUSES, apply_status_transition, save_transitions
+
+logger = logging.getLogger(__name__)
+
+PROCESS_LOCK_KEY = 'webhook_events:process'
+
+
+def enqueue_webhook(session_id, status_value, payload):
+    """
+    Durably store a payment callback; the HTTP handler acknowledges as soon as this commits.
+    The event is applied by the process_webhook_events worker, or with
+    WEBHOOK_PROCESS_INLINE by a background batch started once the request commits.
+    """
+    event = WebhookEvent.objects.create(session_id=session_id, status=str(status_value or '')[:20], payload=payload)
+    if getattr(settings, 'WEBHOOK_PROCESS_INLINE', False):
+        transaction.on_commit(maybe_process)
+    return event
+
+
+def maybe_process():
+    run_inline(PROCESS_LOCK_KEY, process_batch, 'webhook processing')
+
+
+def process_batch(batch_size=None):
+    """
+    Apply one batch of queued webhook events in a single transaction.
+
+    Events are claimed with SKIP LOCKED so several workers can drain the queue.
+    Repeated callbacks for the same session and status are marked duplicate,
+    donations are loaded and saved in bulk, and newly completed donations go
+    to the ledger, whose rollup groups the campaign total updates.
+
+    Returns:
+        Number of events processed
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    now = timezone.now()
+
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True)
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        events_by_session = defaultdict(list)
+        for event in events:
+            events_by_session[event.session_id].append(event)
+
+        # Only the donation rows are locked; the campaign is read for cache tags
+        donations = {
+            donation.payment_session_id: donation
+            for donation in Donation.objects.select_related('campaign').select_for_update(of=('self',)).filter(
+                payment_session_id__in=list(events_by_session)
+            ).order_by('id')
+        }
+
+        changed = []
+        for session_id, session_events in events_by_session.items():
+            donation = donations.get(session_id)
+            seen_statuses = set()
+            for event in session_events:
+                event.processed_at = now
+                if donation is None:
+                    event.result = 'unknown_donation'
+                elif event.status not in VALID_STATUSES:
+                    event.result = 'invalid_status'
+                elif event.status in seen_statuses:
+                    event.result = 'duplicate'
+                elif apply_status_transition(donation, event.status, now):
+                    event.result = 'applied'
+                else:
+                    event.result = 'unchanged'
+                seen_statuses.add(event.status)
+
+            if donation is not None and any(event.result == 'applied' for event in session_events):
+                changed.append(donation)
+
+        save_transitions(changed, now)
+        WebhookEvent.objects.bulk_update(events, ['processed_at', 'result'])
+
+    logger.info(
+        f"Processed {len(events)} webhook events for {len(events_by_session)} sessions: "
+        f"{len(changed)} donations updated"
+    )
+    return len(events)
+
+
+def process_pending(batch_size=None):
+    """Process batches until the queue is drained; returns the number of events"""
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    total = 0
+    while True:
+        processed = process_batch(batch_size)
+        total += processed
+        if processed < batch_size:
+            return total
@@ -1,11 +1,238 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.utils import timezone
 from django.dispatch import receiver
-from .models import Donation
-from django.core.cache import cache
+from accounts.models import User
+from organizations.models import OrganizationProfile
+from .models import Campaign, Category, Donation, File
+from .services.donor_summary import forget_donor_summary, record_new_donation, record_status_changes
+from .services.platform_stats import adjust_platform_statistics, funding_state_delta
+from .services.recommendation_client import get_recommendation_client
+from .services.urgency import refresh_campaign_urgency
+from .utils.cache_tags import (
+    CAMPAIGN_LIST_TAG, CATEGORIES_TAG, bump_tags, campaign_tags, category_tag, organization_tag
+)
+
+
+def _bump_on_commit(tags):
+    # Bumping before commit would let a concurrent request re-cache the old rows
+    transaction.on_commit(lambda: bump_tags(*tags))
+
+
+@receiver(pre_save, sender=Campaign)
+def remember_previous_state(sender, instance, update_fields=None, **kwargs):
+    if instance.pk and (update_fields is None or {'category', 'target', 'current_amount'} & set(update_fields)):
+        previous = Campaign.objects.filter(pk=instance.pk).values('category_id', 'current_amount', 'target').first()
+        if previous:
+            instance._previous_category_id = previous['category_id']
+            instance._previous_totals = (previous['current_amount'], previous['target'])
+
+
+@receiver(post_save, sender=Campaign)
+def refresh_urgency_on_save(sender, instance, **kwargs):
+    refresh_campaign_urgency([instance.pk])
+
+
+@receiver(post_save, sender=Campaign)
+def invalidate_campaign_on_save(sender, instance, created, **kwargs):
+    tags = campaign_tags(instance)
+    previous_category_id = getattr(instance, '_previous_category_id', None)
+    if created or (previous_category_id and previous_category_id != instance.category_id):
+        # Category campaign counts changed
+        tags += [CATEGORIES_TAG, category_tag(previous_category_id)]
+    _bump_on_commit(tags)
+
+
+@receiver(post_delete, sender=Campaign)
+def invalidate_campaign_on_delete(sender, instance, **kwargs):
+    _bump_on_commit(campaign_tags(instance) + [CATEGORIES_TAG])
+
+
+# Fields the recommendation service embeds a campaign from, or filters it on
+SIMILARITY_FIELDS = {'name', 'description', 'category', 'organization', 'target'}
+
+
+def _refresh_similar_on_commit():
+    transaction.on_commit(lambda: get_recommendation_client().request_similar_refresh())
+
+
+@receiver(post_save, sender=Campaign)
+def refresh_similar_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or SIMILARITY_FIELDS & set(update_fields):
+        _refresh_similar_on_commit()
+
+
+@receiver(post_delete, sender=Campaign)
+def refresh_similar_on_delete(sender, instance, **kwargs):
+    _refresh_similar_on_commit()
+
+
+def _merge_deltas(*parts):
+    deltas = {}
+    for part in parts:
+        for field, delta in part.items():
+            deltas[field] = deltas.get(field, 0) + delta
+    return deltas
+
+
+@receiver(post_save, sender=Campaign)
+def count_campaign_on_save(sender, instance, created, **kwargs):
+    if created:
+        adjust_platform_statistics(
+            total_campaigns=1,
+            total_raised=instance.current_amount,
+            **funding_state_delta(instance.current_amount, instance.target),
+        )
+        return
+    # Popped so a later save of the same instance doesn't count this change again
+    previous = instance.__dict__.pop('_previous_totals', None)
+    if previous and previous != (instance.current_amount, instance.target):
+        adjust_platform_statistics(**_merge_deltas(
+            {'total_raised': instance.current_amount - previous[0]},
+            funding_state_delta(*previous, sign=-1),
+            funding_state_delta(instance.current_amount, instance.target),
+        ))
+
+
+@receiver(post_delete, sender=Campaign)
+def count_campaign_on_delete(sender, instance, **kwargs):
+    adjust_platform_statistics(
+        total_campaigns=-1,
+        total_raised=-instance.current_amount,
+        **funding_state_delta(instance.current_amount, instance.target, sign=-1),
+    )
+
+
+def _touch_campaign(campaign_id):
+    # Files are nested in the cached campaign representation, which is versioned by updated_at
+    Campaign.objects.filter(pk=campaign_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=File)
+def invalidate_campaign_on_file_save(sender, instance, **kwargs):
+    _touch_campaign(instance.campaign_id)
+    _bump_on_commit(campaign_tags(instance.campaign))
+
+
+@receiver(post_delete, sender=File)
+def invalidate_campaign_on_file_delete(sender, instance, **kwargs):
+    # The campaign itself may be mid-delete (cascade), so only its id is used here
+    _touch_campaign(instance.campaign_id)
+
 
 @receiver(post_save, sender=Donation)
 def invalidate_campaign_caches(sender, instance, **kwargs):
     if instance.status == 'completed':
-        cache.delete('urgent_campaigns')
-        cache.delete(f'organization:detail:{instance.campaign.organization_id}')
-        cache.delete(f'similar_campaigns:campaign:{instance.campaign_id}')
\ No newline at end of file
+        _bump_on_commit(campaign_tags(instance.campaign))
+
+
+@receiver(pre_save, sender=Donation)
+def remember_previous_donation_state(sender, instance, update_fields=None, **kwargs):
+    if instance.pk and (update_fields is None or {'status', 'donor'} & set(update_fields)):
+        previous = Donation.objects.filter(pk=instance.pk).values('status', 'donor_id').first()
+        if previous:
+            instance._previous_status = previous['status']
+            instance._previous_donor_id = previous['donor_id']
+
+
+@receiver(post_save, sender=Donation)
+def update_donor_summary(sender, instance, created, **kwargs):
+    if created:
+        record_new_donation(instance)
+        return
+    # Popped so a later save of the same instance doesn't count this change again
+    previous_status = instance.__dict__.pop('_previous_status', None)
+    previous_donor_id = instance.__dict__.pop('_previous_donor_id', instance.donor_id)
+    if previous_donor_id != instance.donor_id:
+        forget_donor_summary(previous_donor_id)
+        forget_donor_summary(instance.donor_id)
+    elif previous_status is not None:
+        record_status_changes([(instance.donor_id, previous_status, instance.status)])
+
+
+@receiver(post_delete, sender=Donation)
+def forget_donor_summary_on_delete(sender, instance, **kwargs):
+    forget_donor_summary(instance.donor_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    _bump_on_commit([category_tag(instance.pk), CATEGORIES_TAG, CAMPAIGN_LIST_TAG])
+
+
+@receiver(post_save, sender=OrganizationProfile)
+def invalidate_organization(sender, instance, **kwargs):
+    _bump_on_commit([organization_tag(instance.pk)])
+
+
+@receiver(post_save, sender=Category)
+def count_category_on_save(sender, instance, created, **kwargs):
+    if created:
+        adjust_platform_statistics(categories=1)
+
+
+@receiver(post_delete, sender=Category)
+def count_category_on_delete(sender, instance, **kwargs):
+    adjust_platform_statistics(categories=-1)
+
+
+def _role_delta(role, sign, verified=False):
+    if role == 'organization':
+        return {'organizations': sign, 'verified_organizations': sign if verified else 0}
+    if role == 'volunteer':
+        return {'volunteers': sign}
+    return {}
+
+
+def _has_verified_profile(user_id):
+    return OrganizationProfile.objects.filter(owner_id=user_id, is_verified=True).exists()
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_role(sender, instance, update_fields=None, **kwargs):
+    if instance.pk and (update_fields is None or 'role' in update_fields):
+        instance._previous_role = User.objects.filter(pk=instance.pk).values_list('role', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def count_user_on_save(sender, instance, created, **kwargs):
+    if created:
+        adjust_platform_statistics(**_role_delta(instance.role, 1))
+        return
+    previous_role = instance.__dict__.pop('_previous_role', None)
+    if previous_role is not None and previous_role != instance.role:
+        verified = 'organization' in (previous_role, instance.role) and _has_verified_profile(instance.pk)
+        adjust_platform_statistics(**_merge_deltas(
+            _role_delta(previous_role, -1, verified), _role_delta(instance.role, 1, verified)
+        ))
+
+
+@receiver(post_delete, sender=User)
+def count_user_on_delete(sender, instance, **kwargs):
+    # A verified profile is deleted first (cascade) and uncounted by its own signal
+    adjust_platform_statistics(**_role_delta(instance.role, -1))
+
+
+@receiver(pre_save, sender=OrganizationProfile)
+def remember_previous_verification(sender, instance, update_fields=None, **kwargs):
+    if instance.pk and (update_fields is None or 'is_verified' in update_fields):
+        instance._previous_is_verified = OrganizationProfile.objects.filter(
+            pk=instance.pk
+        ).values_list('is_verified', flat=True).first()
+
+
+def _owner_is_organization(profile):
+    return User.objects.filter(pk=profile.owner_id, role='organization').exists()
+
+
+@receiver(post_save, sender=OrganizationProfile)
+def count_verification_on_save(sender, instance, created, **kwargs):
+    previous = False if created else instance.__dict__.pop('_previous_is_verified', None)
+    if previous is not None and previous != instance.is_verified and _owner_is_organization(instance):
+        adjust_platform_statistics(verified_organizations=1 if instance.is_verified else -1)
+
+
+@receiver(post_delete, sender=OrganizationProfile)
+def count_verification_on_delete(sender, instance, **kwargs):
+    if instance.is_verified and _owner_is_organization(instance):
+        adjust_platform_statistics(verified_organizations=-1)
@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Tags shared by the campaign and organization views
+CAMPAIGN_LIST_TAG = 'campaigns:list'
+CATEGORIES_TAG = 'categories'
+
+VERSION_KEY_PREFIX = 'tagver'
+
+
+def campaign_tag(campaign_id):
+    return f'campaign:{campaign_id}'
+
+
+def category_tag(category_id):
+    return f'category:{category_id}'
+
+
+def organization_tag(organization_id):
+    return f'organization:{organization_id}'
+
+
+def _version_key(tag):
+    return f'{VERSION_KEY_PREFIX}:{tag}'
+
+
+def _fresh_version():
+    # Seeded from the clock so a version key that was evicted comes back with a
+    # value no earlier key could have used, instead of resurrecting stale entries
+    return int(time.time() * 1000)
+
+
+def tag_versions(tags):
+    """Current generation of each tag, creating missing ones"""
+    keys = {_version_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, tag in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _fresh_version(), timeout=None)
+            # Another request may have won the add; read back whatever is stored
+            version = cache.get(key) or _fresh_version()
+        versions[tag] = version
+    return versions
+
+
+def tagged_key(base, *tags):
+    """
+    Cache key for `base` that changes whenever any of `tags` is bumped.
+
+    Entries under old keys are never deleted, they just stop being read and
+    expire on their own TTL.
+    """
+    versions = tag_versions(tags)
+    fingerprint = ':'.join(f'{tag}={versions[tag]}' for tag in sorted(versions))
+    digest = hashlib.md5(fingerprint.encode()).hexdigest()[:12]
+    return f'{base}:v={digest}'
+
+
+def bump_tags(*tags):
+    """Invalidate every cached entry keyed with any of `tags`"""
+    for tag in set(tag for tag in tags if tag):
+        key = _version_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read yet (or evicted): a fresh clock-based version is enough
+            cache.set(key, _fresh_version(), timeout=None)
+        except Exception as e:
+            logger.error(f"Failed to bump cache tag {tag}: {str(e)}")
+
+
+def campaign_tags(campaign, include_list=True):
+    """Tags covering every cached response a campaign appears in"""
+    from organizations.models import OrganizationProfile
+
+    tags = [campaign_tag(campaign.pk), category_tag(campaign.category_id)]
+    if include_list:
+        tags.append(CAMPAIGN_LIST_TAG)
+    if campaign.organization_id:
+        tags.append(organization_tag(campaign.organization_id))
+    # Organization pages list campaigns by owner, and most campaigns have no organization set
+    owner_org_id = OrganizationProfile.objects.filter(
+        owner_id=campaign.owner_id
+    ).values_list('pk', flat=True).first()
+    if owner_org_id:
+        tags.append(organization_tag(owner_org_id))
+    return tags
+
+
+def bump_campaign_tags(campaign):
+    bump_tags(*campaign_tags(campaign))
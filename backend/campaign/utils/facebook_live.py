@@ -182,7 +182,8 @@ def update_campaign_live_status(campaign):
             campaign.live_status = 'none'
         
         campaign.live_viewer_count = status_data.get('live_views', 0)
-        campaign.save(update_fields=['live_status', 'live_viewer_count'])
+        # updated_at versions the cached campaign representation
+        campaign.save(update_fields=['live_status', 'live_viewer_count', 'updated_at'])
         
         logger.info(f"Updated campaign {campaign.id} live status: {campaign.live_status}")
         return True
@@ -0,0 +1,66 @@
+# campaign/utils/inline_runs.py
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Only reached when a worker dies mid-batch; until then its lock keeps others out
+INLINE_LOCK_TIMEOUT = 60  # seconds
+
+_executor: Optional[ThreadPoolExecutor] = None
+_queued = set()
+_state_lock = threading.Lock()
+
+
+def get_inline_executor() -> ThreadPoolExecutor:
+    """Single background thread per process, so inline batches never run on a request thread"""
+    global _executor
+    if _executor is None:
+        with _state_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inline-run')
+    return _executor
+
+
+def _run_once(lock_key, process_batch, label):
+    with _state_lock:
+        _queued.discard(lock_key)
+    token = uuid.uuid4().hex
+    try:
+        if not cache.add(lock_key, token, timeout=INLINE_LOCK_TIMEOUT):
+            return
+        try:
+            process_batch()
+        finally:
+            # Only our own lock: after a timeout it may belong to another worker
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+    except Exception as e:
+        # Rows stay pending for the next commit or the management command
+        logger.error(f"Inline {label} failed: {str(e)}")
+    finally:
+        # The pool thread outlives the task; don't leave its connection open
+        connection.close()
+
+
+def run_inline(lock_key, process_batch, label):
+    """
+    Run one batch of a queue in the background after a request commits.
+
+    The request returns without waiting. At most one run per queue is waiting
+    in this process and one runs at a time across processes (the cache lock),
+    and each run handles a single batch without looking for more, so a burst
+    of commits costs a bounded amount of work. The queue's management command
+    (--loop) is what drains whatever is left.
+    """
+    with _state_lock:
+        if lock_key in _queued:
+            return
+        _queued.add(lock_key)
+    get_inline_executor().submit(_run_once, lock_key, process_batch, label)
@@ -0,0 +1,98 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Prefetch
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'campaign:repr'
+
+# Fields the slim queryset loads: enough to paginate, order and version a campaign.
+# A save that changes a serialized field must include updated_at in update_fields.
+SLIM_FIELDS = ('id', 'created_at', 'updated_at', 'current_amount')
+
+
+def public_files():
+    """
+    Prefetch of the campaign files anyone may see. Pending and failed uploads
+    have no URL yet; only the owner sees them (my_campaigns, the files action).
+    """
+    from ..models import File
+
+    return Prefetch('files', queryset=File.objects.filter(status='uploaded'))
+
+
+def representation_queryset(queryset, *extra_fields):
+    """
+    Slim version of a campaign queryset for use with serialize_campaigns.
+
+    Loads only the columns that version a cached representation, plus the
+    update times of the owner's organization and the category, which are
+    nested in it. Filters, annotations and ordering of `queryset` are kept.
+    """
+    return queryset.select_related(None).prefetch_related(None).only(*SLIM_FIELDS, *extra_fields).annotate(
+        repr_org_updated_at=F('owner__organization_profile__updated_at'),
+        repr_category_updated_at=F('category__updated_at'),
+    )
+
+
+def representation_key(campaign):
+    version = ':'.join(str(part) for part in (
+        campaign.updated_at.timestamp(),
+        campaign.current_amount,
+        campaign.repr_org_updated_at and campaign.repr_org_updated_at.timestamp(),
+        campaign.repr_category_updated_at and campaign.repr_category_updated_at.timestamp(),
+    ))
+    return f'{KEY_PREFIX}:{campaign.pk}:{hashlib.md5(version.encode()).hexdigest()[:12]}'
+
+
+def serialize_campaigns(campaigns, serializer_class=None, context=None):
+    """
+    Serialized representations for campaigns from representation_queryset, in order.
+
+    All representations are read with one get_many (a single MGET on Redis);
+    only the misses are loaded in full and serialized, then stored with
+    set_many. A new donation total, campaign edit, or organization/category
+    update changes the key, so entries never need deleting.
+    """
+    from ..models import Campaign
+    from ..serializers import CampaignSerializer
+
+    campaigns = list(campaigns)
+    if not campaigns:
+        return []
+
+    keys = {campaign.pk: representation_key(campaign) for campaign in campaigns}
+    try:
+        cached = cache.get_many(list(keys.values()))
+    except Exception as e:
+        logger.error(f"Representation cache read failed: {str(e)}")
+        cached = {}
+
+    missing_ids = [campaign.pk for campaign in campaigns if keys[campaign.pk] not in cached]
+    if missing_ids:
+        full = Campaign.objects.select_related(
+            'category', 'owner', 'owner__organization_profile'
+        ).prefetch_related(public_files()).filter(id__in=missing_ids)
+        serializer = (serializer_class or CampaignSerializer)(full, many=True, context=context or {})
+        fresh = {keys[item['id']]: item for item in serializer.data}
+        cached.update(fresh)
+        try:
+            cache.set_many(fresh, timeout=settings.REPRESENTATION_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Representation cache write failed: {str(e)}")
+
+    # A campaign deleted between the two queries is simply left out
+    return [dict(cached[keys[campaign.pk]]) for campaign in campaigns if keys[campaign.pk] in cached]
+
+
+def serialize_campaign_ids(ids, serializer_class=None, context=None):
+    """serialize_campaigns for a list of ids, preserving their order; unknown ids are skipped"""
+    from ..models import Campaign
+
+    campaigns = {campaign.pk: campaign for campaign in representation_queryset(Campaign.objects.filter(id__in=ids))}
+    return serialize_campaigns(
+        [campaigns[pk] for pk in ids if pk in campaigns], serializer_class, context
+    )
@@ -65,61 +65,44 @@ def upload_file(file_obj, campaign_id):
     Upload any file to Supabase Storage under campaign folder
     Returns: (url, path) tuple or (None, None) if upload fails
     """
-    if supabase:
-        test_supabase_connection()
-        
     if not file_obj:
         logger.warning("No file object provided for upload")
         return None, None
-    
+
+    return upload_bytes(
+        file_obj.read(),
+        file_obj.name,
+        getattr(file_obj, 'content_type', None) or 'application/octet-stream',
+        campaign_id
+    )
+
+def upload_bytes(content, name, content_type, campaign_id):
+    """
+    Upload file content to Supabase Storage under campaign folder.
+
+    A single storage request: the connection and bucket are not checked
+    first (use test_supabase_connection for that), so concurrent uploads
+    don't each pay for extra round trips.
+
+    Returns: (url, path) tuple or (None, None) if upload fails
+    """
     if not supabase:
         logger.error("Supabase client not initialized")
         return None, None
-    
-    logger.info(f"Starting upload for file: {file_obj.name} to campaign_{campaign_id}")
-    
+
+    # Create unique file name
+    ext = os.path.splitext(name)[1]
+    file_path = f"campaign_{campaign_id}/{uuid.uuid4()}{ext}"
+    logger.info(f"Uploading {name} ({len(content)} bytes) to bucket: {bucket_name}, path: {file_path}")
+
     try:
-        # Create unique file name
-        ext = os.path.splitext(file_obj.name)[1]
-        unique_name = f"{uuid.uuid4()}{ext}"
-        file_path = f"campaign_{campaign_id}/{unique_name}"
-        
-        logger.info(f"Generated path: {file_path}")
-        
-        # Read file content
-        file_content = file_obj.read()
-        logger.info(f"Read file content, size: {len(file_content)} bytes")
-        
-        # Debug: Check if bucket exists
-        try:
-            buckets = supabase.storage.list_buckets()
-            logger.info(f"Available buckets: {[b['name'] for b in buckets]}")
-            
-            if bucket_name not in [b['name'] for b in buckets]:
-                logger.warning(f"Bucket '{bucket_name}' not found in Supabase")
-        except Exception as e:
-            logger.error(f"Error checking buckets: {str(e)}")
-        
-        # Upload file
-        logger.info(f"Uploading file to bucket: {bucket_name}, path: {file_path}")
-        upload_response = supabase.storage.from_(bucket_name).upload(
-            file_path,
-            file_content,
-            {"content-type": getattr(file_obj, 'content_type', 'application/octet-stream')}
-        )
-        
-        logger.info(f"Upload response: {upload_response}")
-        
-        # Get public URL
+        supabase.storage.from_(bucket_name).upload(file_path, content, {"content-type": content_type})
+        # Public URLs are built locally, no request involved
         url = supabase.storage.from_(bucket_name).get_public_url(file_path)
-        logger.info(f"Generated public URL: {url}")
-        
         return url, file_path
-    
+
     except Exception as e:
-        logger.error(f"Error uploading to Supabase: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.error(f"Error uploading {name} to Supabase: {str(e)}")
         return None, None
 
 def delete_file(file_path):
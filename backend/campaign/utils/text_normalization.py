@@ -0,0 +1,59 @@
+import re
+import unicodedata
+
+# Alef forms without a canonical decomposition to bare alef
+ALEF_VARIANTS = {
+    'ٱ': 'ا',  # alef wasla
+    'ٲ': 'ا',  # alef with wavy hamza above
+    'ٳ': 'ا',  # alef with wavy hamza below
+    'ٵ': 'ا',  # high hamza alef
+}
+ALEF_MAKSURA = 'ى'
+YEH = 'ي'
+TATWEEL = 'ـ'
+
+# Definite article, alone or after a conjunction/preposition, longest first
+ARABIC_ARTICLES = ('وال', 'بال', 'كال', 'فال', 'لل', 'ال')
+
+_WHITESPACE = re.compile(r'\s+')
+_WORD = re.compile(r'\w+')
+
+
+def normalize_search_text(text):
+    """
+    Fold text so searches match regardless of diacritics and letter variants.
+
+    - strips Arabic tashkeel and Latin accents (NFKD, then drop combining marks),
+      which also reduces hamza/madda alef forms (أ إ آ) to bare alef
+    - folds the remaining alef variants and alef maksura
+    - removes tatweel and lowercases
+    """
+    if not text:
+        return ''
+
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    stripped = stripped.replace(TATWEEL, '').replace(ALEF_MAKSURA, YEH)
+    folded = ''.join(ALEF_VARIANTS.get(ch, ch) for ch in stripped)
+    return _WHITESPACE.sub(' ', folded.casefold()).strip()
+
+
+def strip_arabic_article(word):
+    """'الايتام' -> 'ايتام', so a search for the bare word matches the definite form"""
+    for article in ARABIC_ARTICLES:
+        if word.startswith(article) and len(word) - len(article) >= 2:
+            return word[len(article):]
+    return word
+
+
+def search_document(text):
+    """Normalized text plus article-less variants of its words, for indexing"""
+    normalized = normalize_search_text(text)
+    words = _WORD.findall(normalized)
+    variants = [stripped for stripped in map(strip_arabic_article, words) if stripped not in words]
+    return ' '.join([normalized] + variants) if variants else normalized
+
+
+def search_terms(text):
+    """Normalized, article-less words of a search query, safe to embed in a tsquery"""
+    return [strip_arabic_article(word) for word in _WORD.findall(normalize_search_text(text))]
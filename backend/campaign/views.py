@@ -1,12 +1,13 @@
 from rest_framework import viewsets, permissions, parsers, status, filters
-from .models import Campaign, Category, Donation, File
-from .serializers import CampaignSerializer, CategorySerializer, FileSerializer, DonationSerializer, DonationCreateSerializer
+from .models import Campaign, Category, Donation, File, SimilarCampaign
+from .serializers import CampaignSerializer, CategorySerializer, FileSerializer, DonationSerializer, DonationCreateSerializer, \
+    UploadIntentSerializer, CompleteUploadsSerializer
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Count, Case, When, Sum, Count, Q, F, FloatField, Value
 from rest_framework import filters
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import requests
@@ -15,9 +16,23 @@ from django.conf import settings
 import logging
 from rest_framework import parsers
 from .services.payment_service import PaymentServiceManager
+from .services.donation_status import apply_polled_status
+from .services.webhook_ingestion import enqueue_webhook
+from .services.urgency import MIN_AGE as URGENCY_MIN_AGE, urgency_level
+from .services.direct_uploads import complete_file_uploads, create_file_intents
+from .services.donor_summary import get_donor_summary
+from .services.platform_stats import get_platform_statistics
+from .services.recommendation_client import RecommendationServiceError, get_recommendation_client
+from .pagination import CampaignCursorPagination, decode_keyset_cursor, encode_keyset_cursor, keyset_after
+from .renderers import NDJSONRenderer
+from .search import CampaignSearchFilter, search_campaigns
+from .utils.cache_tags import CAMPAIGN_LIST_TAG, CATEGORIES_TAG, category_tag, tagged_key
+from .utils.representation_cache import public_files, representation_queryset, serialize_campaign_ids, serialize_campaigns
 from django.utils import timezone
+from sadagha.upload_storage import UploadStorageError
 from .utils.facebook_live import FacebookLiveAPI, update_campaign_live_status
-from rest_framework.decorators import api_view, permission_classes,authentication_classes
+from rest_framework.decorators import api_view, permission_classes,authentication_classes, renderer_classes
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.permissions import IsAuthenticated
 from django.utils.decorators import method_decorator
 from datetime import datetime, timedelta
@@ -27,7 +42,9 @@ from .utils.supabase_storage import delete_file
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied
 from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 import hashlib
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +54,13 @@ class FileViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
 
+    def get_queryset(self):
+        # Pending and failed uploads are visible to their campaign's owner only
+        visible = Q(status='uploaded')
+        if self.request.user.is_authenticated:
+            visible |= Q(campaign__owner=self.request.user)
+        return File.objects.filter(visible)
+
 
 class CategoryViewSet(viewsets.ModelViewSet):
     # sort them by dated created
@@ -47,7 +71,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     # fetch 6 categories with most campaigns
     @action(detail=False, methods=['get'])
     def top_categories(self, request, *args, **kwargs):
-        cache_key = 'top_categories'
+        cache_key = tagged_key('top_categories', CATEGORIES_TAG)
 
         cache_data = cache.get(cache_key)
         if cache_data: 
@@ -56,7 +80,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
         top_categories = self.get_queryset().order_by('-campaign_count')[:6]
         serializer = self.get_serializer(top_categories, many=True)
         response_data = serializer.data
-        cache.set(cache_key, response_data, timeout=3600)  # Cache for 1 hour
+        cache.set(cache_key, response_data, timeout=settings.TAGGED_CACHE_TIMEOUT)
         return Response(response_data)
     
 
@@ -222,13 +246,13 @@ def campaign_live_status(request, campaign_id):
     
 class CampaignViewSet(viewsets.ModelViewSet):
     # Add prefetch_related to avoid N+1 queries
-    queryset = Campaign.objects.select_related('category', 'owner').prefetch_related('files').all().order_by('-created_at')
+    queryset = Campaign.objects.select_related('category', 'owner').prefetch_related(public_files()).all().order_by('-created_at')
     serializer_class = CampaignSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     parser_classes = [parsers.JSONParser, parsers.MultiPartParser, parsers.FormParser]
     
     # Add filtering and search capabilities
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, CampaignSearchFilter]
     filterset_fields = ['category', 'featured']
     search_fields = ['name', 'description']
     ordering_fields = ['created_at', 'current_amount', 'number_of_donors', 'target']
@@ -238,7 +262,7 @@ class CampaignViewSet(viewsets.ModelViewSet):
         """
         Optimized queryset with proper prefetching
         """
-        queryset = Campaign.objects.select_related('category', 'owner').prefetch_related('files').all().order_by('-created_at')
+        queryset = Campaign.objects.select_related('category', 'owner').prefetch_related(public_files()).all().order_by('-created_at')
         
         # Category filtering
         category_id = self.request.query_params.get('category', None)
@@ -249,14 +273,6 @@ class CampaignViewSet(viewsets.ModelViewSet):
             except (ValueError, TypeError):
                 pass
         
-        # Search filtering
-        search = self.request.query_params.get('search', None)
-        if search is not None:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(description__icontains=search)
-            )
-        
         # Featured filtering
         featured = self.request.query_params.get('featured', None)
         if featured is not None:
@@ -264,6 +280,26 @@ class CampaignViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    @property
+    def paginator(self):
+        """Keyset pagination when the client asks for it (?pagination=cursor or ?cursor=...)"""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request else {}
+            if self.action == 'list' and (params.get('pagination') == 'cursor' or 'cursor' in params):
+                self._paginator = CampaignCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
+    def filter_queryset(self, queryset):
+        # Cursor pages are always ordered by (created_at, id); ?ordering= does not apply
+        if isinstance(self.paginator, CampaignCursorPagination):
+            for backend in self.filter_backends:
+                if backend is not filters.OrderingFilter:
+                    queryset = backend().filter_queryset(self.request, queryset, self)
+            return queryset
+        return super().filter_queryset(queryset)
+    
     def list(self, request, *args, **kwargs):
         # Build cache key from query params
         category = request.query_params.get('category', '')
@@ -272,85 +308,66 @@ class CampaignViewSet(viewsets.ModelViewSet):
         page = request.query_params.get('page', '1')
         
         cache_key = f"campaigns:list:cat={category}:search={search}:feat={featured}:page={page}"
+        if isinstance(self.paginator, CampaignCursorPagination):
+            cursor = request.query_params.get('cursor', '')
+            page_size = request.query_params.get('page_size', '')
+            total = request.query_params.get('include_total', '')
+            cache_key = (
+                f"campaigns:list:cursor:cat={category}:search={search}:feat={featured}"
+                f":cursor={cursor}:size={page_size}:total={total}"
+            )
+        # Category pages also go stale when the category itself is edited
+        tags = [CAMPAIGN_LIST_TAG]
+        if category.isdigit():
+            tags.append(category_tag(category))
+        cache_key = tagged_key(cache_key, *tags)
         
         cached_data = cache.get(cache_key)
         if cached_data:
             return Response(cached_data)
         
-        # Default DRF list logic
-        queryset = self.filter_queryset(self.get_queryset())
+        # Paginate over slim rows, then assemble the page from cached representations
+        queryset = representation_queryset(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response_data = self.get_paginated_response(serializer.data).data
-            cache.set(cache_key, response_data, timeout=300)  # 5 minutes
+            data = serialize_campaigns(page, context=self.get_serializer_context())
+            response_data = self.get_paginated_response(data).data
+            cache.set(cache_key, response_data, timeout=settings.TAGGED_CACHE_TIMEOUT)
             return Response(response_data)
         
-        serializer = self.get_serializer(queryset, many=True)
-        cache.set(cache_key, serializer.data, timeout=300)
-        return Response(serializer.data)
+        data = serialize_campaigns(queryset, context=self.get_serializer_context())
+        cache.set(cache_key, data, timeout=settings.TAGGED_CACHE_TIMEOUT)
+        return Response(data)
 
     @action(detail=False, methods=['get'])
     def urgent(self, request):
         """Get 5 most urgent campaigns based on multiple factors"""
         
         now = timezone.now()
-        cache_key = 'urgent_campaigns'
+        cache_key = tagged_key('urgent_campaigns', CAMPAIGN_LIST_TAG)
         cache_data = cache.get(cache_key)
         if cache_data:
             return Response(cache_data)
         
-        # Calculate urgency score using existing fields
-        urgent_campaigns = self.get_queryset().select_related('category', 'owner', 'organization').annotate(
-            # Calculate funding ratio (0-1)
-            funding_ratio=Case(
-                When(target__gt=0, then=F('current_amount') / F('target')),
-                default=Value(0),
-                output_field=FloatField()
-            ),
-            
-            # Calculate urgency score based on conditions
-            urgency_score=Case(
-                # Funding gap score (40% weight)
-                When(funding_ratio__lt=0.20, then=Value(0.4)),  # 1.0 * 0.4
-                When(funding_ratio__lt=0.50, then=Value(0.32)), # 0.8 * 0.4
-                default=Value(0.12),  # 0.3 * 0.4
-                output_field=FloatField()
-            ) + Case(
-                # Time pressure score (30% weight) - older campaigns more urgent
-                When(created_at__lt=now - timedelta(days=30), then=Value(0.27)), # 0.9 * 0.3
-                When(created_at__lt=now - timedelta(days=14), then=Value(0.21)), # 0.7 * 0.3
-                default=Value(0.12),  # 0.4 * 0.3
-                output_field=FloatField()
-            ) + Case(
-                # Activity momentum score (20% weight) - stagnant campaigns more urgent
-                When(updated_at__lt=now - timedelta(days=7), then=Value(0.18)),  # 0.9 * 0.2
-                When(updated_at__lt=now - timedelta(days=3), then=Value(0.12)),  # 0.6 * 0.2
-                default=Value(0.04),  # 0.2 * 0.2
-                output_field=FloatField()
-            ) + Case(
-                # Donor engagement score (10% weight)
-                When(number_of_donors__lt=5, then=Value(0.10)),   # 1.0 * 0.1
-                When(number_of_donors__lt=20, then=Value(0.06)),  # 0.6 * 0.1
-                default=Value(0.03),  # 0.3 * 0.1
-                output_field=FloatField()
-            )
-        ).filter(
-            # Only active campaigns (not fully funded)
-            current_amount__lt=F('target'),
-            # Exclude very new campaigns (less than 2 days old)
-            created_at__lt=now - timedelta(days=2)
+        # urgency_score is materialized (see campaign.services.urgency), so this
+        # is a top-k scan of its index; NULL marks funded campaigns
+        urgent_campaigns = representation_queryset(self.get_queryset(), 'target', 'urgency_score').filter(
+            urgency_score__isnull=False,
+            # New campaigns are scored too but only ranked from URGENCY_MIN_AGE on
+            created_at__lt=now - URGENCY_MIN_AGE
         ).order_by(
             '-urgency_score', '-created_at'
         )[:5]  # Get top 5 most urgent
         
+        urgent_campaigns = list(urgent_campaigns)
+        
         # Serialize the campaigns
-        serializer = self.get_serializer(urgent_campaigns, many=True)
+        campaigns_data = serialize_campaigns(urgent_campaigns, context=self.get_serializer_context())
         
         # Add urgency metadata to each campaign
         campaigns_with_urgency = []
-        for campaign_data, campaign_obj in zip(serializer.data, urgent_campaigns):
+        for campaign_data, campaign_obj in zip(campaigns_data, urgent_campaigns):
             # Calculate days manually for response
             days_created = (now - campaign_obj.created_at).days if campaign_obj.created_at else 0
             days_updated = (now - campaign_obj.updated_at).days if campaign_obj.updated_at else 0
@@ -361,11 +378,7 @@ class CampaignViewSet(viewsets.ModelViewSet):
             ) if campaign_obj.target > 0 else 0
             campaign_data['days_since_created'] = days_created
             campaign_data['days_since_update'] = days_updated
-            campaign_data['urgency_level'] = (
-                'critical' if campaign_obj.urgency_score >= 0.8 else
-                'high' if campaign_obj.urgency_score >= 0.6 else
-                'medium'
-            )
+            campaign_data['urgency_level'] = urgency_level(campaign_obj.urgency_score)
             campaigns_with_urgency.append(campaign_data)
         
         response_data = {
@@ -450,7 +463,7 @@ class CampaignViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             # Delete related files (will also remove them from Supabase via File.delete override)
-        instance.files.all().delete()
+        File.objects.filter(campaign=instance).delete()
 
         # Now delete the campaign
         self.perform_destroy(instance)
@@ -577,25 +590,14 @@ class CampaignViewSet(viewsets.ModelViewSet):
             
             if result['success']:
                 old_status = donation.status
-                new_status = result.get('status')
+                donation, updated = apply_polled_status(donation.id, result.get('status'))
                 
-                if new_status and new_status != donation.status:
-                    with transaction.atomic():
-                        donation.status = new_status
-                        
-                        if new_status == 'completed' and old_status != 'completed':
-                            donation.completed_at = timezone.now()
-                            # Update campaign totals
-                            donation.campaign.current_amount += donation.amount
-                            donation.campaign.number_of_donors += 1
-                            donation.campaign.save()
-                        
-                        donation.save()
-                        logger.info(f"Synced donation {donation.id}: {old_status} -> {donation.status}")
+                if updated:
+                    logger.info(f"Synced donation {donation.id}: {old_status} -> {donation.status}")
                 
                 return Response({
                     'status': donation.status,
-                    'updated': new_status != old_status,
+                    'updated': updated,
                     'donation_id': donation.id
                 })
             else:
@@ -612,91 +614,41 @@ class CampaignViewSet(viewsets.ModelViewSet):
         """
         Handle webhooks from NextRemitly for donation status updates
         POST /api/campaigns/donation-webhook/
+        
+        The callback is stored and acknowledged with 202; donations are updated in
+        batches by the webhook worker (campaign.services.webhook_ingestion).
         """
-        logger.info(f"=== DONATION WEBHOOK RECEIVED ===")
-        logger.info(f"Webhook payload: {request.data}")
+        session_id = request.data.get('session_id')
+        status_value = request.data.get('status')
+        
+        if not session_id:
+            logger.error("No session_id in webhook payload")
+            return Response({
+                'error': 'Missing session_id'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            session_id = request.data.get('session_id')
-            status_value = request.data.get('status')
-            
-            if not session_id:
-                logger.error("No session_id in webhook payload")
-                return Response({
-                    'error': 'Missing session_id'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            logger.info(f"Processing webhook - Session: {session_id}, Status: {status_value}")
-            
-            # Find the donation by session_id
-            try:
-                donation = Donation.objects.select_related('campaign', 'campaign__organization').get(
-                    payment_session_id=session_id
-                )
-                logger.info(f"Found donation: {donation.id} for campaign: {donation.campaign.name}")
-            except Donation.DoesNotExist:
-                logger.error(f"No donation found for session_id: {session_id}")
-                return Response({
-                    'error': 'Donation not found'
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            # Process webhook with database transaction
-            with transaction.atomic():
-                old_status = donation.status
-                
-                if status_value == 'completed':
-                    donation.status = 'completed'
-                    donation.completed_at = timezone.now()
-                    
-                    # Update campaign totals when payment is completed
-                    campaign = donation.campaign
-                    campaign.current_amount += donation.amount
-                    campaign.number_of_donors += 1
-                    campaign.save()
-                    
-                    logger.info(f"Donation completed: {donation.id}, Campaign totals updated")
-                    
-                elif status_value == 'failed':
-                    donation.status = 'failed'
-                    logger.info(f"Donation failed: {donation.id}")
-                    
-                elif status_value == 'cancelled':
-                    donation.status = 'cancelled'
-                    logger.info(f"Donation cancelled: {donation.id}")
-                
-                elif status_value == 'processing':
-                    donation.status = 'processing'
-                    logger.info(f"Donation processing: {donation.id}")
-                
-                # Store webhook data for debugging/audit
-                donation.payment_metadata = {
-                    **donation.payment_metadata,
-                    'last_webhook': request.data,
-                    'webhook_timestamp': timezone.now().isoformat()
-                }
-                
-                # Store transaction ID if provided
-                if request.data.get('transaction_id'):
-                    donation.payment_metadata['transaction_id'] = request.data.get('transaction_id')
-                
-                donation.save()
-                
-                logger.info(f"Donation status updated from {old_status} to {donation.status}")
-            
+            session_uuid = uuid.UUID(str(session_id))
+        except ValueError:
             return Response({
-                'status': 'ok',
-                'donation_id': donation.id,
-                'updated_status': donation.status,
-                'processed_at': timezone.now().isoformat()
-            }, status=status.HTTP_200_OK)
-            
+                'error': 'Invalid session_id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            payload = request.data.dict() if hasattr(request.data, 'dict') else request.data
+            event = enqueue_webhook(session_uuid, status_value, payload)
         except Exception as e:
-            logger.error(f"Error processing webhook: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"Error storing webhook: {str(e)}")
             return Response({
                 'error': 'Webhook processing failed'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        logger.debug(f"Queued webhook {event.id} - Session: {session_id}, Status: {status_value}")
+        return Response({
+            'status': 'queued',
+            'event_id': event.id,
+            'received_at': event.received_at.isoformat()
+        }, status=status.HTTP_202_ACCEPTED)
     
     @action(detail=True, methods=['get'])
     def donation_status(self, request, pk=None):
@@ -724,9 +676,8 @@ class CampaignViewSet(viewsets.ModelViewSet):
             
             if result['success']:
                 # Update donation with latest status if different
-                if result.get('status') and result['status'] != donation.status:
-                    donation.status = result['status']
-                    donation.save()
+                donation, updated = apply_polled_status(donation.id, result.get('status'))
+                if updated:
                     logger.info(f"Updated donation {donation.id} status to {donation.status}")
                 
                 serializer = DonationSerializer(donation)
@@ -789,9 +740,10 @@ class CampaignViewSet(viewsets.ModelViewSet):
     def my_campaigns(self, request):
         """
         Custom action to retrieve campaigns owned by the logged-in user.
+        Unlike the public views, `files` includes pending and failed uploads.
         """
         user = request.user
-        campaigns = self.get_queryset().filter(owner=user)
+        campaigns = self.get_queryset().prefetch_related(None).prefetch_related('files').filter(owner=user)
         serializer = self.get_serializer(campaigns, many=True)
         return Response(serializer.data)
     
@@ -800,9 +752,8 @@ class CampaignViewSet(viewsets.ModelViewSet):
         """
         Returns campaigns where 'featured' is True.
         """
-        featured_campaigns = self.get_queryset().filter(featured=True)
-        serializer = self.get_serializer(featured_campaigns, many=True)
-        return Response(serializer.data)
+        featured_campaigns = representation_queryset(self.get_queryset().filter(featured=True))
+        return Response(serialize_campaigns(featured_campaigns, context=self.get_serializer_context()))
     
     @action(detail=False, methods=['post'], url_path='batch', permission_classes=[permissions.AllowAny], parser_classes=[parsers.JSONParser])
     def get_multiple(self, request):
@@ -842,23 +793,15 @@ class CampaignViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get campaigns with optimized query
-        campaigns = Campaign.objects.select_related('category', 'owner').prefetch_related('files').filter(id__in=ids)
-        
-        # Preserve the order of requested IDs
-        preserved_order = Case(
-            *[When(id=pk, then=pos) for pos, pk in enumerate(ids)]
-        )
-        campaigns = campaigns.annotate(ordering=preserved_order).order_by('ordering')
-        
-        serializer = self.get_serializer(campaigns, many=True)
+        # Cached representations in the order of the requested IDs
+        campaigns = serialize_campaign_ids(ids, context=self.get_serializer_context())
         
         # Include metadata about missing IDs
-        found_ids = {campaign.id for campaign in campaigns}
+        found_ids = {campaign['id'] for campaign in campaigns}
         missing_ids = [id for id in ids if id not in found_ids]
         
         response_data = {
-            'campaigns': serializer.data,
+            'campaigns': campaigns,
             'requested_count': len(ids),
             'found_count': len(campaigns),
         }
@@ -868,6 +811,68 @@ class CampaignViewSet(viewsets.ModelViewSet):
             
         return Response(response_data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['post'], url_path='upload-intents',
+            permission_classes=[permissions.IsAuthenticated], parser_classes=[parsers.JSONParser])
+    def upload_intents(self, request, pk=None):
+        """
+        Sign direct-to-storage uploads for new campaign files.
+
+        Body: {"files": [{"name", "content_type", "size"}]}. Each file gets a
+        pending File row and an upload URL the client PUTs the file to, then
+        the client calls upload-intents/complete with the file ids.
+        """
+        campaign = self.get_object()
+        if campaign.owner != request.user:
+            return Response({'detail': 'You do not have permission to update this campaign.'}, status=403)
+
+        serializer = UploadIntentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            intents = create_file_intents(campaign, serializer.validated_data['files'])
+        except UploadStorageError as e:
+            logger.error(f"Could not sign uploads for campaign {campaign.id}: {str(e)}")
+            return Response({'error': 'Storage is unavailable, try again later'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        return Response({
+            'uploads': [
+                {'file_id': file.id, 'name': file.name, **target}
+                for file, target in intents
+            ]
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'], url_path='upload-intents/complete',
+            permission_classes=[permissions.IsAuthenticated], parser_classes=[parsers.JSONParser])
+    def complete_uploads(self, request, pk=None):
+        """
+        Finalize files uploaded with upload-intents. Body: {"file_ids": [...]}.
+        Files not yet found in storage stay pending and are listed in `waiting`.
+        """
+        campaign = self.get_object()
+        if campaign.owner != request.user:
+            return Response({'detail': 'You do not have permission to update this campaign.'}, status=403)
+
+        serializer = CompleteUploadsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        finalized, waiting = complete_file_uploads(campaign, serializer.validated_data['file_ids'])
+        return Response({
+            'files': FileSerializer(finalized, many=True).data,
+            'waiting': waiting,
+        })
+
+    @action(detail=True, methods=['get'], url_path='files', permission_classes=[permissions.IsAuthenticated])
+    def owner_files(self, request, pk=None):
+        """
+        Every file of the campaign with its upload status, for its owner.
+        Public campaign responses list uploaded files only.
+        """
+        campaign = self.get_object()
+        if campaign.owner != request.user:
+            return Response({'detail': 'You do not have permission to view these files.'}, status=403)
+
+        # Not campaign.files: get_object() prefetched the public files only
+        files = File.objects.filter(campaign=campaign).order_by('created_at', 'id')
+        return Response({'files': FileSerializer(files, many=True).data})
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def refresh_live_status(self, request, pk=None):
         """
@@ -948,9 +953,8 @@ def user_donations(request):
     # Search functionality
     search = request.query_params.get('search')
     if search:
-        queryset = queryset.filter(
-            Q(campaign__name__icontains=search) |
-            Q(message__icontains=search)
+        queryset = search_campaigns(
+            queryset, search, prefix='campaign__', extra_q=Q(message__icontains=search), rank=False
         )
     
     # Sorting
@@ -962,15 +966,27 @@ def user_donations(request):
     else:
         queryset = queryset.order_by('-created_at')
     
-    # Calculate statistics
-    stats = queryset.aggregate(
-        total_donated=Sum('amount'),
-        donation_count=Count('id'),
-        completed_donations=Count('id', filter=Q(status='completed')),
-        pending_donations=Count('id', filter=Q(status='pending')),
-        failed_donations=Count('id', filter=Q(status='failed')),
-        campaigns_supported=Count('campaign', distinct=True)
+    # Calculate statistics: the running summary unless filters narrow the set
+    filtered = any(
+        request.query_params.get(param)
+        for param in ('status', 'campaign', 'start_date', 'end_date', 'search')
     )
+    if filtered:
+        stats = queryset.aggregate(
+            total_donated=Sum('amount'),
+            donation_count=Count('id'),
+            completed_donations=Count('id', filter=Q(status='completed')),
+            pending_donations=Count('id', filter=Q(status='pending')),
+            failed_donations=Count('id', filter=Q(status='failed')),
+            campaigns_supported=Count('campaign', distinct=True)
+        )
+    else:
+        summary = get_donor_summary(user.pk)
+        stats = {
+            field: getattr(summary, field)
+            for field in ('total_donated', 'donation_count', 'completed_donations', 'pending_donations',
+                          'failed_donations', 'campaigns_supported')
+        }
     
     # Calculate average donation (avoid division by zero)
     stats['average_donation'] = (
@@ -989,7 +1005,7 @@ def user_donations(request):
         limit = 20
     
     offset = (page - 1) * limit
-    total_count = queryset.count()
+    total_count = stats['donation_count']
     donations = queryset[offset:offset + limit]
     
     # Serialize data
@@ -1023,41 +1039,104 @@ def donation_summary(request):
     """
     Optimized donation summary - much faster than full donation list
     """
-    user = request.user
-    
-    # Use only aggregations - no individual record fetching
-    summary = Donation.objects.filter(donor=user).aggregate(
-        total_donated=Sum('amount'),
-        total_donations=Count('id'),
-        campaigns_supported=Count('campaign', distinct=True)
-    )
+    # Running per-donor summary - one primary key lookup
+    summary = get_donor_summary(request.user.pk)
     
     return Response({
         'summary': {
-            'total_donated': str(summary['total_donated'] or 0),
-            'total_donations': summary['total_donations'],
-            'campaigns_supported': summary['campaigns_supported']
+            'total_donated': str(summary.total_donated),
+            'total_donations': summary.donation_count,
+            'campaigns_supported': summary.campaigns_supported
         }
     }, status=status.HTTP_200_OK)
 
 
+# Columns of the donations feed; campaign-level fields are the same on every row and left out
+DONATION_FEED_FIELDS = (
+    'id', 'donor_id', 'donor__first_name', 'donor_name', 'amount', 'message', 'is_anonymous',
+    'created_at', 'completed_at',
+)
+DONATION_FEED_PAGE_SIZE = 50
+DONATION_FEED_MAX_PAGE_SIZE = 200
+DONATION_FEED_STREAM_BATCH_SIZE = 1000
+
+
+def _donation_feed_item(row):
+    if row['is_anonymous']:
+        display_name = "Anonymous"
+    elif row['donor_id']:
+        display_name = row['donor__first_name']
+    else:
+        display_name = row['donor_name'] or "Anonymous"
+    return {
+        'id': row['id'],
+        'donor': row['donor_id'],
+        'donor_display_name': display_name,
+        'donor_name': row['donor_name'],
+        'amount': str(row['amount']),
+        'message': row['message'],
+        'is_anonymous': row['is_anonymous'],
+        'created_at': row['created_at'],
+        'completed_at': row['completed_at'],
+    }
+
+
+def _donation_feed_page(queryset, after, size):
+    """Up to `size` rows after the (created_at, id) position `after`, and whether more follow"""
+    if after is not None:
+        queryset = keyset_after(queryset, *after)
+    rows = list(queryset.order_by('-created_at', '-id').values(*DONATION_FEED_FIELDS)[:size + 1])
+    return rows[:size], len(rows) > size
+
+
+def _stream_donation_feed(queryset, after):
+    """Newline-delimited JSON of every row after `after`, read in keyset batches"""
+    while True:
+        rows, has_more = _donation_feed_page(queryset, after, DONATION_FEED_STREAM_BATCH_SIZE)
+        if rows:
+            yield ''.join(json.dumps(_donation_feed_item(row), cls=DjangoJSONEncoder) + '\n' for row in rows)
+        if not has_more:
+            return
+        after = (rows[-1]['created_at'], rows[-1]['id'])
+
+
 @api_view(['GET'])
 @authentication_classes([SupabaseAuthentication])
 @permission_classes([permissions.AllowAny])
+@renderer_classes([JSONRenderer, BrowsableAPIRenderer, NDJSONRenderer])
 def campaign_donations(request, campaign_id):
     """
-    Return all donations for a specific campaign.
+    Completed donations for a campaign, newest first, paginated on (created_at, id).
+
+    Pass `next_cursor` back as `?cursor=` for the following page (`?limit=`, max 200).
+    `?format=ndjson` streams every donation from the cursor on as newline-delimited JSON.
     """
     # Ensure campaign exists
-    campaign = get_object_or_404(Campaign, id=campaign_id)
+    if not Campaign.objects.filter(id=campaign_id).exists():
+        raise Http404("No Campaign matches the given query.")
 
-    # Get donations related to this campaign
-    donations = Donation.objects.filter(campaign=campaign,status='completed').order_by('-created_at')
+    cursor = request.query_params.get('cursor')
+    after = decode_keyset_cursor(cursor)[:2] if cursor else None
+    donations = Donation.objects.filter(campaign_id=campaign_id, status='completed')
 
-    serializer = DonationSerializer(donations, many=True)
+    if request.accepted_renderer.format == 'ndjson':
+        return StreamingHttpResponse(
+            _stream_donation_feed(donations, after), content_type='application/x-ndjson'
+        )
+
+    try:
+        limit = min(max(int(request.query_params.get('limit', DONATION_FEED_PAGE_SIZE)), 1),
+                    DONATION_FEED_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = DONATION_FEED_PAGE_SIZE
+    rows, has_more = _donation_feed_page(donations, after, limit)
 
     return Response(
-        {"donations": serializer.data},
+        {
+            "donations": [_donation_feed_item(row) for row in rows],
+            "next_cursor": encode_keyset_cursor(rows[-1]['created_at'], rows[-1]['id']) if has_more else None,
+            "has_more": has_more,
+        },
         status=status.HTTP_200_OK
     )
 
@@ -1101,48 +1180,52 @@ def campaign_donations(request, campaign_id):
 
 
 
-@api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-def user_recommendations(request, user_id):
-    # Generate cache key
-    cache_key = f"recommendations:user:{user_id}"
-    
-    # Try to get from cache
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response(cached_data)
-    
-    # Existing FastAPI call
-    fastapi_url = f"{settings.FASTAPI_URL}/recommendations/{user_id}"
-    resp = requests.get(fastapi_url)
-    
-    if resp.status_code != 200:
-        return Response(
-            {"error": "Failed to fetch from recommendation service"},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-    
-    recommendations = resp.json().get("recommendations", [])
-    campaign_ids = [rec["campaign_id"] for rec in recommendations]
-    
-    campaigns = Campaign.objects.filter(id__in=campaign_ids)
-    serializer = CampaignSerializer(campaigns, many=True)
-    
-    # Merge recommendation metadata
+def _enrich_recommendations(recommendations):
+    """Attach score and reason to cached campaign representations, keeping the service's order"""
+    campaigns = {c["id"]: c for c in serialize_campaign_ids([rec["campaign_id"] for rec in recommendations])}
     enriched = []
     for rec in recommendations:
-        campaign = next((c for c in serializer.data if c["id"] == rec["campaign_id"]), None)
+        campaign = campaigns.get(rec["campaign_id"])
         if campaign:
             campaign["score"] = rec["score"]
             campaign["reason"] = rec["reason"]
             enriched.append(campaign)
+    return enriched
+
+
+def _fallback_campaigns(queryset, reason, limit=10):
+    """Campaigns to show when the recommendation service is unavailable and nothing is cached"""
+    campaigns = serialize_campaigns(representation_queryset(queryset)[:limit])
+    for campaign in campaigns:
+        campaign["score"] = None
+        campaign["reason"] = reason
+    return campaigns
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def user_recommendations(request, user_id):
+    """
+    Get campaign recommendations for a user (via FastAPI + Django campaigns).
+    Serves the last good result while refreshing, and popular campaigns if the
+    service is down with nothing cached.
+    """
+    try:
+        recommendations, stale = get_recommendation_client().user_recommendations(user_id)
+    except RecommendationServiceError as e:
+        logger.warning(f"Recommendation service unavailable for user {user_id}: {str(e)}")
+        popular = Campaign.objects.filter(current_amount__lt=F('target')).order_by('-number_of_donors', '-created_at')
+        return Response({
+            "user_id": user_id,
+            "recommendations": _fallback_campaigns(popular, "Popular campaign"),
+            "degraded": True,
+        })
     
-    response_data = {"user_id": user_id, "recommendations": enriched}
-    
-    # Cache the result
-    cache.set(cache_key, response_data, timeout=settings.RECOMMENDATION_CACHE_TIMEOUT)
-    
-    return Response(response_data)
+    return Response({
+        "user_id": user_id,
+        "recommendations": _enrich_recommendations(recommendations),
+        "stale": stale,
+    })
 
 # @api_view(['GET'])
 # @permission_classes([permissions.AllowAny])
@@ -1180,124 +1263,80 @@ def user_recommendations(request, user_id):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def similar_campaigns(request, campaign_id):
-
-    cache_key = f"similar_campaigns:campaign:{campaign_id}"
-
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return Response(cached_data)
-    
     """
-    Get similar campaigns for a given campaign (via FastAPI + Django campaigns)
+    Get similar campaigns for a given campaign from the neighbours precomputed
+    by the recommendation service's similarity job (one indexed query, no call
+    to the service). Falls back to recent campaigns of the same category until
+    the job has covered the campaign.
     """
-    fastapi_url = f"{settings.FASTAPI_URL}/recommendations/similar/{campaign_id}"
-    resp = requests.get(fastapi_url)
-
-    if resp.status_code != 200:
-        return Response(
-            {"error": "Failed to fetch from recommendation service"},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-
-    recommendations = resp.json().get("similar_campaigns", [])
-    campaign_ids = [rec["campaign_id"] for rec in recommendations]
-
-    campaigns = Campaign.objects.filter(id__in=campaign_ids)
-    serializer = CampaignSerializer(campaigns, many=True)
+    try:
+        limit = min(max(int(request.GET.get('limit', 5)), 1), 10)
+    except ValueError:
+        limit = 5
 
-    # Merge recommendation metadata
-    enriched = []
-    for rec in recommendations:
-        campaign = next((c for c in serializer.data if c["id"] == rec["campaign_id"]), None)
-        if campaign:
-            campaign["score"] = rec["score"]
-            campaign["reason"] = rec["reason"]
-            enriched.append(campaign)
+    neighbours = list(
+        SimilarCampaign.objects.filter(campaign_id=campaign_id).order_by('rank').values_list(
+            'similar_campaign_id', 'score'
+        )[:limit]
+    )
+    if not neighbours:
+        campaign = get_object_or_404(Campaign.objects.only('id', 'category_id'), pk=campaign_id)
+        same_category = Campaign.objects.filter(
+            category_id=campaign.category_id, current_amount__lt=F('target')
+        ).exclude(pk=campaign_id).order_by('-created_at')
+        return Response({
+            "campaign_id": campaign_id,
+            "similar_campaigns": _fallback_campaigns(same_category, "Same category", limit),
+            "degraded": True,
+        })
 
-    cache.set(cache_key, {"campaign_id": campaign_id, "similar_campaigns": enriched}, timeout=settings.RECOMMENDATION_CACHE_TIMEOUT)
-    return Response({"campaign_id": campaign_id, "similar_campaigns": enriched})
+    recommendations = [
+        {"campaign_id": similar_id, "score": score, "reason": f"AI semantic similarity ({score:.3f})"}
+        for similar_id, score in neighbours
+    ]
+    return Response({
+        "campaign_id": campaign_id,
+        "similar_campaigns": _enrich_recommendations(recommendations),
+    })
 
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def platform_statistics(request):
     """
-    Get real platform statistics for About Us page
+    Get real platform statistics for About Us page, read from the single
+    incrementally maintained statistics row
     """
-    logger.info("Platform statistics endpoint called")
     try:
-        # Get campaign statistics
-        campaign_stats = Campaign.objects.aggregate(
-            total_campaigns=Count('id'),
-            active_campaigns=Count('id', filter=Q(current_amount__lt=F('target'))),
-            total_raised=Sum('current_amount'),
-            total_donors=Sum('number_of_donors')
-        )
-        
-        # Get category count
-        category_count = Category.objects.count()
-        
-        # Get organization statistics
-        from accounts.models import User
-        organization_count = User.objects.filter(role='organization').count()
-        
-        # Try to get verified orgs with error handling
-        try:
-            verified_orgs = User.objects.filter(
-                role='organization',
-                organization_profile__is_verified=True
-            ).count()
-        except Exception as org_error:
-            logger.warning(f"Error getting verified orgs: {org_error}")
-            verified_orgs = 0
-        
-        # Get volunteer statistics
-        volunteer_count = User.objects.filter(role='volunteer').count()
-        
-        # Get donation statistics
-        donation_stats = Donation.objects.filter(status='completed').aggregate(
-            total_donations=Count('id'),
-            unique_donors=Count('donor', distinct=True)
-        )
-        
-        # Calculate success rate
-        completed_campaigns = Campaign.objects.filter(
-            current_amount__gte=F('target')
-        ).count()
-        
+        stats = get_platform_statistics()
+
         success_rate = 0
-        if campaign_stats['total_campaigns'] > 0:
-            success_rate = round((completed_campaigns / campaign_stats['total_campaigns']) * 100, 1)
-        
-        logger.info(f"Campaign stats: {campaign_stats}")
-        logger.info(f"Donation stats: {donation_stats}")
-        logger.info(f"Organization count: {organization_count}")
-        
+        if stats.total_campaigns > 0:
+            success_rate = round((stats.completed_campaigns / stats.total_campaigns) * 100, 1)
+
         response_data = {
             'campaigns': {
-                'total': campaign_stats['total_campaigns'] or 0,
-                'active': campaign_stats['active_campaigns'] or 0,
-                'completed': completed_campaigns
+                'total': stats.total_campaigns,
+                'active': stats.active_campaigns,
+                'completed': stats.completed_campaigns
             },
             'financial': {
-                'total_raised': str(campaign_stats['total_raised'] or 0),
-                'total_donations': donation_stats['total_donations'] or 0,
+                'total_raised': str(stats.total_raised),
+                'total_donations': stats.total_donations,
                 'average_donation': str(
-                    (campaign_stats['total_raised'] / donation_stats['total_donations']) 
-                    if donation_stats['total_donations'] > 0 else 0
+                    (stats.total_raised / stats.total_donations)
+                    if stats.total_donations > 0 else 0
                 )
             },
             'community': {
-                'total_donors': donation_stats['unique_donors'] or 0,
-                'organizations': organization_count,
-                'verified_organizations': verified_orgs,
-                'volunteers': volunteer_count
+                'total_donors': stats.unique_donors,
+                'organizations': stats.organizations,
+                'verified_organizations': stats.verified_organizations,
+                'volunteers': stats.volunteers
             },
-            'categories': category_count,
+            'categories': stats.categories,
             'success_rate': success_rate,
-            'last_updated': timezone.now().isoformat()
+            'last_updated': stats.updated_at.isoformat()
         }
-        
-        logger.info(f"Returning response data: {response_data}")
         return Response(response_data, status=status.HTTP_200_OK)
         
     except Exception as e:
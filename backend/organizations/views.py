@@ -8,7 +8,10 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from .models import OrganizationProfile
 from campaign.models import Campaign, Donation
-from .utils.supabase_storage import upload_organization_image, delete_organization_image
+from .utils.supabase_storage import upload_organization_image, delete_organization_image, ORG_IMAGES_BUCKET
+from sadagha.upload_storage import SUPABASE_UPLOAD_URL_TTL, UploadStorageError, get_upload_storage
+from django.core import signing
+import uuid
 
 from .serializers import (
     OrganizationProfileSerializer, 
@@ -16,6 +19,8 @@ from .serializers import (
 )
 from campaign.serializers import CampaignSerializer, DonationSerializer
 from campaign.services.payment_service import PaymentServiceManager
+from campaign.utils.cache_tags import organization_tag, tagged_key
+from campaign.utils.representation_cache import representation_queryset, serialize_campaigns
 
 from rest_framework import serializers
 from django.db import models
@@ -33,6 +38,12 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
 
+# Direct image uploads: accepted types (with the extension stored) and size limit
+IMAGE_EXTENSIONS = {'image/jpeg': '.jpg', 'image/jpg': '.jpg', 'image/png': '.png', 'image/webp': '.webp'}
+MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
+IMAGE_UPLOAD_SALT = 'organizations.image-upload'
+
+
 class OrganizationProfileViewSet(viewsets.ModelViewSet):
     queryset = OrganizationProfile.objects.all()
     serializer_class = OrganizationProfileSerializer
@@ -175,6 +186,84 @@ class OrganizationProfileViewSet(viewsets.ModelViewSet):
         else:
             return Response({'error': 'Failed to delete cover image'}, status=500)
 
+    @action(detail=True, methods=['post'])
+    def image_upload_intent(self, request, pk=None):
+        """
+        Sign a direct-to-storage upload for a profile or cover image.
+
+        Body: {"image_type": "profile" | "cover", "content_type", "size"}.
+        The client PUTs the image to `upload_url`, then posts `upload_token`
+        to complete_image_upload.
+        """
+        organization = self.get_object()
+
+        image_type = request.data.get('image_type')
+        if image_type not in ['profile', 'cover']:
+            return Response({'error': 'image_type must be profile or cover'}, status=400)
+
+        content_type = request.data.get('content_type')
+        if content_type not in IMAGE_EXTENSIONS:
+            return Response({'error': 'Invalid file type. Please upload JPEG, PNG, or WebP images only.'}, status=400)
+
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'size is required'}, status=400)
+        if size > MAX_IMAGE_SIZE:
+            return Response({'error': 'File size too large. Maximum size is 5MB.'}, status=400)
+
+        filename = f"org_{organization.id}_{image_type}_{uuid.uuid4()}{IMAGE_EXTENSIONS[content_type]}"
+        try:
+            target = get_upload_storage().create_upload(ORG_IMAGES_BUCKET, filename, content_type, MAX_IMAGE_SIZE)
+        except UploadStorageError as e:
+            print(f"Could not sign image upload: {str(e)}")
+            return Response({'error': 'Storage is unavailable, try again later'}, status=503)
+
+        # The pending image lives in the signed token until the upload is completed
+        upload_token = signing.dumps(
+            {'org': organization.id, 'type': image_type, 'file': filename}, salt=IMAGE_UPLOAD_SALT
+        )
+        return Response({**target, 'upload_token': upload_token}, status=201)
+
+    @action(detail=True, methods=['post'])
+    def complete_image_upload(self, request, pk=None):
+        """Make an image uploaded with image_upload_intent the organization's profile or cover image"""
+        organization = self.get_object()
+
+        try:
+            intent = signing.loads(
+                request.data.get('upload_token', ''),
+                salt=IMAGE_UPLOAD_SALT,
+                max_age=SUPABASE_UPLOAD_URL_TTL
+            )
+        except signing.BadSignature:
+            return Response({'error': 'Invalid or expired upload token'}, status=400)
+        if intent['org'] != organization.id:
+            return Response({'error': 'Invalid or expired upload token'}, status=400)
+
+        storage = get_upload_storage()
+        size = storage.object_size(ORG_IMAGES_BUCKET, intent['file'])
+        if size is None:
+            return Response({'error': 'Image has not been uploaded yet'}, status=409)
+        if size > MAX_IMAGE_SIZE:
+            storage.delete(ORG_IMAGES_BUCKET, intent['file'])
+            return Response({'error': 'File size too large. Maximum size is 5MB.'}, status=400)
+
+        url_field, path_field = f"{intent['type']}_image_url", f"{intent['type']}_image_path"
+        path = f"{ORG_IMAGES_BUCKET}/{intent['file']}"
+        old_path = getattr(organization, path_field)
+        if old_path and old_path != path:
+            storage.delete(*old_path.split('/', 1))
+
+        url = storage.public_url(ORG_IMAGES_BUCKET, intent['file'])
+        setattr(organization, url_field, url)
+        setattr(organization, path_field, path)
+        organization.save()
+        return Response({
+            url_field: url,
+            'message': f"{intent['type'].capitalize()} image uploaded successfully"
+        })
+
     @action(detail=True, methods=['get'])
     def payment_methods(self, request, pk=None):
         """Get payment configuration for this organization"""
@@ -864,6 +953,7 @@ class OrganizationDashboardViewSet(viewsets.ModelViewSet):
             )
 
 
+from django.conf import settings
 from django.core.cache import cache
 from rest_framework.pagination import PageNumberPagination
 import time
@@ -877,7 +967,7 @@ class PublicOrganizationViewSet(viewsets.ReadOnlyModelViewSet):
     def retrieve(self, request, pk=None):
         start = time.time()
         page = request.GET.get('page', 1)
-        cache_key = f"organization:detail:{pk}:page:{page}"
+        cache_key = tagged_key(f"organization:detail:{pk}:page:{page}", organization_tag(pk))
 
         cached_data = cache.get(cache_key)
         if cached_data:
@@ -890,15 +980,14 @@ class PublicOrganizationViewSet(viewsets.ReadOnlyModelViewSet):
         campaigns = Campaign.objects.filter(
             owner=organization.owner,
             current_amount__lt=models.F('target')
-        ).select_related('owner').prefetch_related('donations').order_by('-created_at')
+        ).order_by('-created_at')
 
         paginator = PageNumberPagination()
         paginator.page_size = 10
-        paginated_campaigns = paginator.paginate_queryset(campaigns, request)
-        campaign_serializer = CampaignSerializer(paginated_campaigns, many=True)
+        paginated_campaigns = paginator.paginate_queryset(representation_queryset(campaigns), request)
 
         # 👇 Instead of returning only the campaigns, use paginator.get_paginated_response
-        campaigns_paginated_response = paginator.get_paginated_response(campaign_serializer.data)
+        campaigns_paginated_response = paginator.get_paginated_response(serialize_campaigns(paginated_campaigns))
 
         response_data = {
             "organization": serializer.data,
@@ -910,7 +999,7 @@ class PublicOrganizationViewSet(viewsets.ReadOnlyModelViewSet):
             },
         }
 
-        cache.set(cache_key, response_data, timeout=120)
+        cache.set(cache_key, response_data, timeout=settings.TAGGED_CACHE_TIMEOUT)
 
         print(f"######################## Total time: {time.time() - start}s")
         return Response(response_data)
@@ -0,0 +1,246 @@
+"""
+Streaming CSV and XLSX exports shared by the admin panel and volunteer views.
+
+Rows come from a `values()` projection read in keyset batches on the primary
+key, so neither model instances nor the whole result set are held in memory,
+and no cursor stays open between batches (server-side cursors don't survive
+the transaction pooler):
+
+    columns = [
+        ExportColumn('ID', 'id'),
+        ExportColumn('Admin User', 'admin_user__username'),
+        ExportColumn('Timestamp', 'timestamp', format_datetime),
+    ]
+    return export_response(request, queryset, columns, 'admin_actions')
+
+CSV is written row by row into a StreamingHttpResponse. XLSX can't be sent
+before the zip container is complete, so it is built on disk with
+xlsxwriter's constant_memory mode and then streamed from the temporary file.
+
+Files written ahead of time (background export jobs) are served with
+`ranged_file_response`, which honours single byte ranges so interrupted
+downloads can resume.
+"""
+import csv
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+import xlsxwriter
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Query parameter selecting the file type; `format` is taken by DRF content negotiation
+FORMAT_QUERY_PARAM = 'export_format'
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RANGE_BLOCK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """
+    One exported column.
+
+    `field` is the values() lookup read from each row; `fields` lists extra
+    lookups a `render` callable needs, and `render(value, row)` turns the raw
+    value into the cell text.
+    """
+    header: str
+    field: str
+    render: Optional[Callable[[Any, dict], Any]] = None
+    fields: Sequence[str] = ()
+
+    def value(self, row: dict) -> Any:
+        value = row.get(self.field)
+        if self.render is not None:
+            return self.render(value, row)
+        return '' if value is None else value
+
+
+def format_datetime(value, row=None, fmt='%Y-%m-%d %H:%M:%S'):
+    return value.strftime(fmt) if value else ''
+
+
+def projection(columns: Sequence[ExportColumn]) -> List[str]:
+    """Every values() lookup the columns read, in order and without duplicates"""
+    fields = []
+    for column in columns:
+        for field in (column.field, *column.fields):
+            if field not in fields:
+                fields.append(field)
+    return fields
+
+
+def iter_batches(queryset, columns: Sequence[ExportColumn], chunk_size: Optional[int] = None,
+                 descending: bool = False) -> Iterator[List[list]]:
+    """
+    Cell values of up to `chunk_size` rows at a time, in primary key order
+    (newest first with `descending`).
+
+    Each batch is a separate query continuing after the last key of the
+    previous one, so the caller may run other queries between batches.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset = queryset.order_by('-pk' if descending else 'pk')
+    fields = projection(columns)
+    last_pk = None
+    while True:
+        batch = queryset
+        if last_pk is not None:
+            batch = batch.filter(pk__lt=last_pk) if descending else batch.filter(pk__gt=last_pk)
+        rows = list(batch.values(*fields, 'pk')[:chunk_size])
+        if rows:
+            yield [[column.value(row) for column in columns] for row in rows]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1]['pk']
+
+
+def iter_rows(queryset, columns: Sequence[ExportColumn], chunk_size: Optional[int] = None,
+              descending: bool = False) -> Iterator[list]:
+    """Cell values per row, read with iter_batches"""
+    for batch in iter_batches(queryset, columns, chunk_size, descending):
+        yield from batch
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows: Iterable[list], headers: Sequence[str], filename: str, bom: bool = False) -> StreamingHttpResponse:
+    """
+    CSV response written one row at a time.
+
+    Args:
+        bom: Start with a UTF-8 byte order mark so Excel detects the encoding
+    """
+    writer = csv.writer(_Echo())
+
+    def lines():
+        if bom:
+            yield '\ufeff'
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type=CSV_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_file_response(rows: Iterable[list], headers: Sequence[str], filename: str,
+                       sheet_name: str = 'Export') -> FileResponse:
+    """
+    XLSX response built in constant memory.
+
+    Rows are flushed to disk as they are written, the workbook is assembled in
+    an anonymous temporary file, and that file is streamed and then deleted.
+    """
+    output = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_urls': False})
+    worksheet = workbook.add_worksheet(sheet_name[:31])
+    bold = workbook.add_format({'bold': True})
+    worksheet.write_row(0, 0, headers, bold)
+    for index, row in enumerate(rows, start=1):
+        worksheet.write_row(index, 0, row)
+    workbook.close()
+
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=f'{filename}.xlsx', content_type=XLSX_CONTENT_TYPE)
+
+
+def export_response(request, queryset, columns: Sequence[ExportColumn], filename: str,
+                    bom: bool = False, sheet_name: str = 'Export', descending: bool = False):
+    """
+    CSV (default) or XLSX export of `queryset`, chosen by `?export_format=xlsx`.
+
+    Args:
+        filename: File name without extension
+        bom: Prefix CSV output with a UTF-8 byte order mark
+        descending: Newest rows (highest primary key) first
+    """
+    headers = [column.header for column in columns]
+    rows = iter_rows(queryset, columns, descending=descending)
+    if request.GET.get(FORMAT_QUERY_PARAM) == 'xlsx':
+        return xlsx_file_response(rows, headers, filename, sheet_name)
+    return stream_csv(rows, headers, filename, bom=bom)
+
+
+def parse_range(header: str, size: int):
+    """
+    (start, end) inclusive for a single `bytes=` range, None to send the
+    whole file, or False when the range can't be satisfied.
+
+    Multiple ranges are answered with the whole file, which RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(RANGE_BLOCK_SIZE, length))
+            if not block:
+                return
+            length -= len(block)
+            yield block
+
+
+def ranged_file_response(request, path, filename: str, content_type: str, etag: str):
+    """
+    Stored file download supporting `Range` and `If-Range`.
+
+    Args:
+        etag: Strong validator of this exact file; a resumed download whose
+            If-Range no longer matches gets the whole file again
+    """
+    size = os.path.getsize(path)
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range', etag) == etag:
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        response = FileResponse(open(path, 'rb'), as_attachment=True, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206,
+                                         content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    # Byte offsets refer to the stored file, so the compression middleware must leave the body alone
+    response['Content-Encoding'] = 'identity'
+    return response
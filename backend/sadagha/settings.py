@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     'rest_framework',
     'django_extensions',
@@ -58,14 +59,15 @@ MIDDLEWARE = [
 ]
 
 
-# NEXTREMITLY_BASE_URL = os.getenv('NEXTREMITLY_BASE_URL')
-NEXTREMITLY_BASE_URL = "https://nextremitly-backend-fe52128f2003.herokuapp.com"
-NEXTREMITLY_FRONTEND_URL = "https://next-remitly-frontend.vercel.app"
+NEXTREMITLY_BASE_URL = os.getenv('NEXTREMITLY_BASE_URL', "https://nextremitly-backend-fe52128f2003.herokuapp.com")
+NEXTREMITLY_FRONTEND_URL = os.getenv('NEXTREMITLY_FRONTEND_URL', "https://next-remitly-frontend.vercel.app")
+NEXTREMITLY_POOL_SIZE = int(os.getenv('NEXTREMITLY_POOL_SIZE', 10))
+NEXTREMITLY_HEALTH_INTERVAL = int(os.getenv('NEXTREMITLY_HEALTH_INTERVAL', 30))  # seconds, 0 disables
 
 # Your frontend URLs
 FRONTEND_URL = 'http://localhost:5174'  # Sada9a frontend URL
 BACKEND_URL = 'http://localhost:8002'   # Sada9a backend URL
-FASTAPI_URL = "https://recommendation-service-1012340654195.us-central1.run.app"
+FASTAPI_URL = os.getenv("FASTAPI_URL", "https://recommendation-service-1012340654195.us-central1.run.app")
 
 # Add to CORS_ALLOWED_ORIGINS
 CORS_ALLOWED_ORIGINS = [
@@ -168,6 +170,8 @@ DATABASES = {
         'OPTIONS': {
             'sslmode': 'require',
         },
+        # Transaction pooler: a server-side cursor's later FETCHes may reach another backend
+        'DISABLE_SERVER_SIDE_CURSORS': True,
     }
 }
 
@@ -275,6 +279,70 @@ CHANNEL_LAYERS = {
 
 # Cache timeout (in seconds)
 RECOMMENDATION_CACHE_TIMEOUT = 300  # 5 minutes
+# Past RECOMMENDATION_CACHE_TIMEOUT the last good result is served while it refreshes
+RECOMMENDATION_STALE_TIMEOUT = 24 * 60 * 60  # 24 hours
+RECOMMENDATION_CONNECT_TIMEOUT = 1.0  # seconds
+RECOMMENDATION_READ_TIMEOUT = 3.0  # seconds
+RECOMMENDATION_POOL_SIZE = 10
+# Shared with the recommendation service (its SERVICE_API_TOKEN) for the routes only the backend may call
+RECOMMENDATION_SERVICE_TOKEN = os.getenv('RECOMMENDATION_SERVICE_TOKEN', '')
+# Responses keyed by cache tags are invalidated on write, so they can live much longer
+TAGGED_CACHE_TIMEOUT = 6 * 60 * 60  # 6 hours
+# Per-campaign serialized representations, versioned by updated_at and current_amount
+REPRESENTATION_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+# Completed donations are appended to a ledger and folded into campaign totals in batches
+# by rollup_donation_ledger --loop; True also rolls up one batch in the background after each commit
+DONATION_ROLLUP_INLINE = os.getenv('DONATION_ROLLUP_INLINE', 'False') == 'True'
+DONATION_ROLLUP_INTERVAL = int(os.getenv('DONATION_ROLLUP_INTERVAL', 5))  # seconds, rollup_donation_ledger --loop
+DONATION_ROLLUP_BATCH_SIZE = 1000
+
+# Payment webhooks are stored on receipt and applied in batches by process_webhook_events --loop;
+# True also applies one batch in the background after each webhook commits
+WEBHOOK_PROCESS_INLINE = os.getenv('WEBHOOK_PROCESS_INLINE', 'False') == 'True'
+WEBHOOK_PROCESS_INTERVAL = int(os.getenv('WEBHOOK_PROCESS_INTERVAL', 1))  # seconds, process_webhook_events --loop
+WEBHOOK_BATCH_SIZE = 500
+
+# Campaign files are uploaded to storage concurrently on a bounded pool per process
+CAMPAIGN_UPLOAD_WORKERS = int(os.getenv('CAMPAIGN_UPLOAD_WORKERS', 4))
+# True: campaign create/update returns before uploads finish; each file reports its own status
+CAMPAIGN_UPLOADS_IN_BACKGROUND = os.getenv('CAMPAIGN_UPLOADS_IN_BACKGROUND', 'False') == 'True'
+# Background uploads still pending after this long are marked failed by expire_pending_uploads,
+# which also settles direct upload intents once their upload URL has expired
+CAMPAIGN_UPLOAD_PENDING_TIMEOUT = int(os.getenv('CAMPAIGN_UPLOAD_PENDING_TIMEOUT', 15 * 60))  # seconds
+# Failed files stay visible to the campaign owner this long, then expire_pending_uploads deletes them
+CAMPAIGN_FAILED_FILE_RETENTION = int(os.getenv('CAMPAIGN_FAILED_FILE_RETENTION', 24 * 60 * 60))  # seconds
+EXPIRE_PENDING_UPLOADS_INTERVAL = int(os.getenv('EXPIRE_PENDING_UPLOADS_INTERVAL', 60))  # seconds, expire_pending_uploads --loop
+
+# Direct-to-storage uploads: 'supabase' signs real upload URLs, 'local' is a stand-in for development and tests
+UPLOAD_STORAGE_BACKEND = os.getenv('UPLOAD_STORAGE_BACKEND', 'supabase')
+UPLOAD_URL_EXPIRY = int(os.getenv('UPLOAD_URL_EXPIRY', 15 * 60))  # seconds, local backend (Supabase: 2 hours)
+LOCAL_UPLOAD_DIR = os.getenv('LOCAL_UPLOAD_DIR', os.path.join(BASE_DIR, 'local_uploads'))
+LOCAL_UPLOAD_BASE_URL = os.getenv('LOCAL_UPLOAD_BASE_URL', 'http://localhost:8000')
+CAMPAIGN_FILE_MAX_SIZE = 20 * 1024 * 1024  # bytes
+
+# Rows fetched per round trip by streaming CSV/XLSX exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Background export jobs: the process_export_jobs worker stores files in this (private) storage bucket
+EXPORT_STORAGE_BUCKET = os.getenv('EXPORT_STORAGE_BUCKET', 'exports')
+EXPORT_DOWNLOAD_URL_EXPIRY = int(os.getenv('EXPORT_DOWNLOAD_URL_EXPIRY', 5 * 60))  # seconds
+EXPORT_JOB_INTERVAL = int(os.getenv('EXPORT_JOB_INTERVAL', 5))  # seconds
+EXPORT_JOB_RETENTION_DAYS = int(os.getenv('EXPORT_JOB_RETENTION_DAYS', 7))
+# A running job whose progress hasn't moved for this long is assumed dead and restarted
+EXPORT_JOB_STALE_MINUTES = int(os.getenv('EXPORT_JOB_STALE_MINUTES', 15))
+
+# refresh_urgency_scores --loop re-scores every campaign, since the time-based parts change without any write
+URGENCY_REFRESH_INTERVAL = int(os.getenv('URGENCY_REFRESH_INTERVAL', 60 * 60))  # seconds
+
+# Platform statistics are kept current incrementally; the full recount corrects drift
+PLATFORM_STATS_RECONCILE_INTERVAL = int(os.getenv('PLATFORM_STATS_RECONCILE_INTERVAL', 60 * 60))  # seconds
+
+# Reconciliation of donations whose webhook never arrived
+RECONCILE_STALE_MINUTES = int(os.getenv('RECONCILE_STALE_MINUTES', 5))
+RECONCILE_MAX_AGE_DAYS = int(os.getenv('RECONCILE_MAX_AGE_DAYS', 2))
+RECONCILE_BATCH_SIZE = 200
+RECONCILE_WORKERS = int(os.getenv('RECONCILE_WORKERS', 8))
 
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -0,0 +1,267 @@
+"""
+Direct-to-storage uploads.
+
+Django only signs short-lived upload URLs and later checks that the object
+arrived; the browser sends the bytes straight to storage, so API workers never
+carry upload bodies:
+
+    target = get_upload_storage().create_upload(bucket, path, content_type, max_size)
+    # client: PUT <target['upload_url']> with target['headers'] and the file as body
+    size = get_upload_storage().object_size(bucket, path)   # None until it arrived
+
+Files produced by the backend itself (export jobs) are stored with
+`upload_file` and handed out with `signed_download_url`, so any instance can
+serve a file another one wrote.
+
+UPLOAD_STORAGE_BACKEND selects Supabase Storage (signed upload URLs) or a local
+stand-in for development and tests, whose URLs are HMAC-signed and served by
+`local_upload` from LOCAL_UPLOAD_DIR under LOCAL_UPLOAD_BASE_URL.
+"""
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.views.decorators.csrf import csrf_exempt
+
+from .exports import ranged_file_response
+
+logger = logging.getLogger(__name__)
+
+# Fixed by Supabase Storage for signed upload URLs
+SUPABASE_UPLOAD_URL_TTL = timedelta(hours=2)
+
+
+class UploadStorageError(Exception):
+    """The storage backend could not sign or store an object"""
+
+
+class SupabaseUploadStorage:
+    """Signed upload URLs and object checks against Supabase Storage"""
+
+    upload_url_ttl = SUPABASE_UPLOAD_URL_TTL
+
+    def _bucket(self, bucket):
+        from campaign.utils.supabase_storage import supabase
+        if not supabase:
+            raise UploadStorageError("Supabase client not initialized")
+        return supabase.storage.from_(bucket)
+
+    def create_upload(self, bucket: str, path: str, content_type: str, max_size: int) -> Dict:
+        # max_size can't be part of a Supabase signed URL; it is checked when the upload is completed
+        try:
+            signed = self._bucket(bucket).create_signed_upload_url(path)
+        except UploadStorageError:
+            raise
+        except Exception as e:
+            raise UploadStorageError(str(e))
+        return {
+            'upload_url': signed['signed_url'],
+            'method': 'PUT',
+            'headers': {'Content-Type': content_type},
+            'expires_at': datetime.now(dt_timezone.utc) + SUPABASE_UPLOAD_URL_TTL,
+        }
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return self._bucket(bucket).get_public_url(path)
+
+    def upload_file(self, bucket: str, path: str, file_path: str, content_type: str):
+        try:
+            with open(file_path, 'rb') as f:
+                self._bucket(bucket).upload(path, f, {'content-type': content_type})
+        except UploadStorageError:
+            raise
+        except Exception as e:
+            raise UploadStorageError(str(e))
+
+    def signed_download_url(self, bucket: str, path: str, expires_in: int, download_name: str) -> str:
+        # Supabase serves signed URLs with Range support, so downloads can resume
+        try:
+            signed = self._bucket(bucket).create_signed_url(path, expires_in, {'download': download_name})
+        except UploadStorageError:
+            raise
+        except Exception as e:
+            raise UploadStorageError(str(e))
+        return signed['signedURL']
+
+    def object_size(self, bucket: str, path: str) -> Optional[int]:
+        try:
+            return int(self._bucket(bucket).info(path)['size'])
+        except Exception:
+            return None
+
+    def delete(self, bucket: str, path: str) -> bool:
+        try:
+            self._bucket(bucket).remove([path])
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting {bucket}/{path}: {str(e)}")
+            return False
+
+
+def _local_signature(bucket, path, content_type, max_size, expires):
+    value = f"{bucket}/{path}:{content_type}:{max_size}:{expires}"
+    return salted_hmac('sadagha.upload_storage.local', value, algorithm='sha256').hexdigest()
+
+
+def _local_download_signature(bucket, path, download, expires):
+    value = f"{bucket}/{path}:{download}:{expires}"
+    return salted_hmac('sadagha.upload_storage.local.download', value, algorithm='sha256').hexdigest()
+
+
+class LocalUploadStorage:
+    """
+    Stand-in for Supabase Storage: objects are files under LOCAL_UPLOAD_DIR,
+    uploaded and served by the `local_upload` view. Not meant for production,
+    where the bytes would pass through Django again.
+    """
+
+    @property
+    def upload_url_ttl(self) -> timedelta:
+        return timedelta(seconds=settings.UPLOAD_URL_EXPIRY)
+
+    def _file_path(self, bucket, path):
+        return safe_join(settings.LOCAL_UPLOAD_DIR, bucket, path)
+
+    def create_upload(self, bucket: str, path: str, content_type: str, max_size: int) -> Dict:
+        expires = int(time.time()) + settings.UPLOAD_URL_EXPIRY
+        query = urlencode({
+            'content_type': content_type,
+            'max_size': max_size,
+            'expires': expires,
+            'signature': _local_signature(bucket, path, content_type, max_size, expires),
+        })
+        return {
+            'upload_url': f"{self.public_url(bucket, path)}?{query}",
+            'method': 'PUT',
+            'headers': {'Content-Type': content_type},
+            'expires_at': datetime.fromtimestamp(expires, dt_timezone.utc),
+        }
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return f"{settings.LOCAL_UPLOAD_BASE_URL.rstrip('/')}{reverse('local-upload', args=[bucket, path])}"
+
+    def upload_file(self, bucket: str, path: str, file_path: str, content_type: str):
+        target = self._file_path(bucket, path)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(file_path, target)
+        except OSError as e:
+            raise UploadStorageError(str(e))
+
+    def signed_download_url(self, bucket: str, path: str, expires_in: int, download_name: str) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode({
+            'download': download_name,
+            'expires': expires,
+            'signature': _local_download_signature(bucket, path, download_name, expires),
+        })
+        return f"{self.public_url(bucket, path)}?{query}"
+
+    def object_size(self, bucket: str, path: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self._file_path(bucket, path))
+        except OSError:
+            return None
+
+    def delete(self, bucket: str, path: str) -> bool:
+        try:
+            os.remove(self._file_path(bucket, path))
+            return True
+        except OSError:
+            return False
+
+
+BACKENDS = {
+    'supabase': SupabaseUploadStorage,
+    'local': LocalUploadStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_upload_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = BACKENDS[settings.UPLOAD_STORAGE_BACKEND]()
+    return _storage
+
+
+@csrf_exempt
+def local_upload(request, bucket, path):
+    """
+    LocalUploadStorage endpoint: PUT with a signed URL stores the body, GET
+    serves the stored file (the local equivalent of a public object URL), or
+    with a signed download URL sends it as an attachment with Range support.
+    """
+    storage = LocalUploadStorage()
+    try:
+        file_path = storage._file_path(bucket, path)
+    except ValueError:
+        raise Http404()
+
+    if request.method == 'GET':
+        if not os.path.isfile(file_path):
+            raise Http404()
+        if 'signature' not in request.GET:
+            return FileResponse(open(file_path, 'rb'))
+        return _local_download(request, bucket, path, file_path)
+
+    if request.method != 'PUT':
+        return HttpResponse(status=405, headers={'Allow': 'GET, PUT'})
+
+    params = request.GET
+    try:
+        expires = int(params.get('expires', ''))
+        max_size = int(params.get('max_size', ''))
+    except ValueError:
+        return HttpResponse('Invalid upload URL', status=403)
+    content_type = params.get('content_type', '')
+    expected = _local_signature(bucket, path, content_type, max_size, expires)
+    if not constant_time_compare(expected, params.get('signature', '')) or expires < time.time():
+        return HttpResponse('Invalid or expired upload URL', status=403)
+    if request.content_type != content_type.split(';')[0]:
+        return HttpResponse('Content type does not match the upload URL', status=400)
+    if int(request.META.get('CONTENT_LENGTH') or 0) > max_size:
+        return HttpResponse('File too large', status=413)
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    written = 0
+    # Read from the stream: request.body would be capped by DATA_UPLOAD_MAX_MEMORY_SIZE
+    with open(file_path, 'wb') as f:
+        for chunk in iter(lambda: request.read(64 * 1024), b''):
+            written += len(chunk)
+            if written > max_size:
+                break
+            f.write(chunk)
+    if written > max_size:
+        os.remove(file_path)
+        return HttpResponse('File too large', status=413)
+    return HttpResponse(status=201)
+
+
+def _local_download(request, bucket, path, file_path):
+    params = request.GET
+    download = params.get('download', '')
+    try:
+        expires = int(params.get('expires', ''))
+    except ValueError:
+        return HttpResponse('Invalid download URL', status=403)
+    expected = _local_download_signature(bucket, path, download, expires)
+    if not constant_time_compare(expected, params.get('signature', '')) or expires < time.time():
+        return HttpResponse('Invalid or expired download URL', status=403)
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    return ranged_file_response(request, file_path, download, content_type, etag=f'"{path}"')
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
+from .upload_storage import local_upload
 
 urlpatterns = [
     path("api/auth/", include("accounts.urls")),
@@ -11,3 +13,9 @@ urlpatterns = [
     
     path("admin/", admin.site.urls),
 ]
+
+if settings.UPLOAD_STORAGE_BACKEND == 'local':
+    # Stand-in object storage, never mounted with a real storage backend
+    urlpatterns.append(
+        path("api/uploads/local/<str:bucket>/<path:path>", local_upload, name="local-upload")
+    )
@@ -283,6 +283,32 @@ class VolunteerNotificationSerializer(serializers.ModelSerializer):
 
 
 # a serializer for exporting invited volunteers that has accepted invitations
+def location_names(locations_data):
+    """Comma-separated names from a volunteer's parsed location data"""
+    try:
+        if locations_data:
+            if isinstance(locations_data, list):
+                # Extract names from location objects
+                names = []
+                for loc in locations_data:
+                    if isinstance(loc, dict) and 'name' in loc:
+                        names.append(loc['name'])
+                    elif isinstance(loc, str):
+                        names.append(loc)
+                    else:
+                        names.append(str(loc))
+                return ', '.join(names)
+            elif isinstance(locations_data, dict):
+                # Single location object
+                return locations_data.get('name', str(locations_data))
+            else:
+                return str(locations_data)
+        return ""
+    except Exception as e:
+        print(f"Error parsing location data: {e}")
+        return ""
+
+
 class ExportInvitedVolunteersSerializer(serializers.ModelSerializer):
     # Volunteer basic info
     volunteer_name = serializers.CharField(source='volunteer.user.get_full_name', read_only=True)
@@ -332,29 +358,7 @@ class ExportInvitedVolunteersSerializer(serializers.ModelSerializer):
 
     def get_volunteer_location(self, obj):
         """Get volunteer locations from JSON data"""
-        try:
-            locations_data = obj.volunteer.get_available_locations_data()
-            if locations_data:
-                if isinstance(locations_data, list):
-                    # Extract names from location objects
-                    names = []
-                    for loc in locations_data:
-                        if isinstance(loc, dict) and 'name' in loc:
-                            names.append(loc['name'])
-                        elif isinstance(loc, str):
-                            names.append(loc)
-                        else:
-                            names.append(str(loc))
-                    return ', '.join(names)
-                elif isinstance(locations_data, dict):
-                    # Single location object
-                    return locations_data.get('name', str(locations_data))
-                else:
-                    return str(locations_data)
-            return ""
-        except Exception as e:
-            print(f"Error parsing location data: {e}")
-            return ""
+        return location_names(obj.volunteer.get_available_locations_data())
 
     def get_volunteer_skills(self, obj):
         """Get volunteer skills as list"""
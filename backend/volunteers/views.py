@@ -5,7 +5,7 @@ from rest_framework.response import Response
 from .models import VolunteerProfile, VolunteerRequest, VolunteerInvitation, VolunteerNotification
 from django.db.models import Count, Q
 from .serializers import VolunteerProfileSerializer, VolunteerRequestSerializer, VolunteerInvitationSerializer, VolunteerNotificationSerializer, BulkInviteSerializer \
-    , ExportInvitedVolunteersSerializer
+    , location_names
 from .services import VolunteerMatchingService, VolunteerInvitationService, VolunteerNotificationService
 import requests
 from django.http import HttpResponse
@@ -13,6 +13,8 @@ import csv
 from datetime import datetime
 from django.http import HttpResponse, JsonResponse
 from django.utils.text import slugify
+from django.utils import timezone
+from sadagha.exports import ExportColumn, export_response
 
 class VolunteerProfileViewSet(viewsets.ModelViewSet):
     """ViewSet for volunteer profiles"""
@@ -462,12 +464,46 @@ class VolunteerNotificationViewSet(viewsets.ReadOnlyModelViewSet):
         })
 
 
-# a view to export volunteers who have accepted invitations to a CSV file
+def _full_name(value, row):
+    return f"{row['volunteer__user__first_name']} {row['volunteer__user__last_name']}".strip()
+
+
+def _comma_list(value, row):
+    return ", ".join(item.strip() for item in (value or '').split(',') if item.strip())
+
+
+def _location_names(value, row):
+    return location_names(VolunteerProfile(available_locations=value).get_available_locations_data())
+
+
+def _local_datetime(value, row):
+    # Same text the serializer-based export produced: ISO format in local time, to the second
+    return timezone.localtime(value).strftime('%Y-%m-%dT%H:%M:%S') if value else ''
+
 
+INVITATION_EXPORT_COLUMNS = [
+    ExportColumn('Volunteer Name', 'volunteer__user__first_name', _full_name, fields=('volunteer__user__last_name',)),
+    ExportColumn('Email', 'volunteer__user__email'),
+    ExportColumn('Phone', 'volunteer__phone'),
+    ExportColumn('Age', 'volunteer__age'),
+    ExportColumn('Profession', 'volunteer__profession'),
+    ExportColumn('Location', 'volunteer__available_locations', _location_names),
+    ExportColumn('Skills', 'volunteer__skills', _comma_list),
+    ExportColumn('Languages', 'volunteer__languages', _comma_list),
+    ExportColumn('Interests', 'volunteer__interests', _comma_list),
+    ExportColumn('Match Score', 'match_score'),
+    ExportColumn('Status', 'status'),
+    ExportColumn('Invited At', 'invited_at', _local_datetime),
+    ExportColumn('Responded At', 'responded_at', _local_datetime),
+    ExportColumn('Organization Message', 'message'),
+    ExportColumn('Volunteer Response', 'response_message'),
+]
 
 
+# a view to export volunteers who have accepted invitations to a CSV file
+
 def export_volunteer_invitations(request, request_id):
-    """Export only accepted volunteer invitations to CSV with clean rows"""
+    """Export only accepted volunteer invitations to CSV (or XLSX) with clean rows"""
     if request.method == 'GET':
         try:
             volunteer_request = VolunteerRequest.objects.get(id=request_id)
@@ -477,53 +513,18 @@ def export_volunteer_invitations(request, request_id):
         invitations = VolunteerInvitation.objects.filter(
             request=volunteer_request,
             status='accepted'
-        ).select_related('volunteer__user')
+        )
 
         if not invitations.exists():
             return HttpResponse('No accepted volunteers found for this request', status=404)
 
-        serializer = ExportInvitedVolunteersSerializer(invitations, many=True)
-
-        # CSV Header with UTF-8 BOM
-        csv_data = "\ufeff"
-        csv_data += (
-            "Volunteer Name,Email,Phone,Age,Profession,Location,Skills,"
-            "Languages,Interests,Match Score,Status,Invited At,Responded At,"
-            "Organization Message,Volunteer Response\n"
-        )
-
-        for invitation in serializer.data:
-            # Format fields
-            def escape(field):
-                if not field:
-                    return ""
-                field = str(field).replace('"', '""')
-                return f'"{field}"' if any(c in field for c in [',', '\n', '"']) else field
-
-            csv_data += ",".join([
-                escape(invitation.get('volunteer_name')),
-                escape(invitation.get('volunteer_email')),
-                escape(invitation.get('volunteer_phone')),
-                str(invitation.get('volunteer_age') or ''),
-                escape(invitation.get('volunteer_profession')),
-                escape(invitation.get('volunteer_location')),
-                escape(", ".join(invitation.get('volunteer_skills', []))),
-                escape(", ".join(invitation.get('volunteer_languages', []))),
-                escape(", ".join(invitation.get('volunteer_interests', []))),
-                str(invitation.get('match_score') or ''),
-                invitation.get('status') or '',
-                invitation.get('invited_at', '')[:19],
-                (invitation.get('responded_at') or '')[:19],
-                escape(invitation.get('message')),
-                escape(invitation.get('response_message')),
-            ]) + "\n"
-
         # Clean file name: program_title_YYYY-MM-DD.csv
         program_title = volunteer_request.title or "volunteer_export"
         safe_title = slugify(program_title)
         date_str = datetime.now().strftime('%Y-%m-%d')
-        filename = f"{safe_title}_{date_str}.csv"
 
-        response = HttpResponse(csv_data, content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
\ No newline at end of file
+        # CSV with UTF-8 BOM, streamed from a values() projection
+        return export_response(
+            request, invitations, INVITATION_EXPORT_COLUMNS, f"{safe_title}_{date_str}",
+            bom=True, sheet_name='Volunteers'
+        )
\ No newline at end of file
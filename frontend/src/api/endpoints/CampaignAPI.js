@@ -264,9 +264,12 @@ export const toggleFeatured = async (id, featured = true) => {
 };
 
 
-export const campaignDonations = async(camapignId) => {
+// Completed donations, newest first, one page at a time: pass the previous page's next_cursor for the next one
+export const campaignDonations = async(camapignId, cursor = null) => {
   try {
-    const response = await api.get(`/campaigns/${camapignId}/donations-list/`)
+    const response = await api.get(`/campaigns/${camapignId}/donations-list/`, {
+      params: cursor ? { cursor } : {}
+    })
     return response;
   } catch (error) {
     const errorMessage = error.response?.data?.message || `Failed to list donations ${camapignId}`;
@@ -7,13 +7,16 @@ import { useTranslation } from "react-i18next";
 const CampaignDonationsMessages = ({ campaignId }) => {
     const { t } = useTranslation();
     const [donations, setDonations] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         const fetchDonations = async () => {
             try {
                 const res = await campaignDonations(campaignId);
                 setDonations(res.donations || []);
+                setNextCursor(res.next_cursor || null);
             } catch (error) {
                 console.error("Error fetching donations:", error);
             } finally {
@@ -26,6 +29,21 @@ const CampaignDonationsMessages = ({ campaignId }) => {
         }
     }, [campaignId]);
 
+    // The feed is paginated: older donations are loaded page by page
+    const loadMoreDonations = async () => {
+        if (!nextCursor || loadingMore) return;
+        try {
+            setLoadingMore(true);
+            const res = await campaignDonations(campaignId, nextCursor);
+            setDonations((prev) => [...prev, ...(res.donations || [])]);
+            setNextCursor(res.next_cursor || null);
+        } catch (error) {
+            console.error("Error fetching donations:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     if (loading) {
         return (
             <div className="flex justify-center items-center py-8">
@@ -68,6 +86,18 @@ const CampaignDonationsMessages = ({ campaignId }) => {
                     </li>
                 ))}
             </ul>
+            {nextCursor && (
+                <div className="flex justify-center pt-3">
+                    <button
+                        onClick={loadMoreDonations}
+                        disabled={loadingMore}
+                        className="text-sm text-blue-600 hover:underline disabled:opacity-50 flex items-center"
+                    >
+                        {loadingMore && <Loader2 className="animate-spin w-4 h-4 me-1" />}
+                        {t("common.loadMore")}
+                    </button>
+                </div>
+            )}
         </div>
     );
 };
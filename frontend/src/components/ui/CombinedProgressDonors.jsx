@@ -13,7 +13,9 @@ const CombinedProgressDonors = ({
 }) => {
   const { t } = useTranslation();
   const [donations, setDonations] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [currentDonorIndex, setCurrentDonorIndex] = useState(0);
   const [showModal, setShowModal] = useState(false);
 
@@ -29,6 +31,7 @@ const CombinedProgressDonors = ({
         setLoading(true);
         const res = await campaignDonations(campaignId);
         setDonations(res.donations || []);
+        setNextCursor(res.next_cursor || null);
       } catch (error) {
         console.error("Error fetching donations:", error);
       } finally {
@@ -41,6 +44,24 @@ const CombinedProgressDonors = ({
     }
   }, [campaignId, refreshTrigger]); // Add refreshTrigger as dependency
 
+  // The feed is paginated: the modal loads older donations page by page
+  const loadMoreDonations = async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const res = await campaignDonations(campaignId, nextCursor);
+      setDonations((prev) => [...prev, ...(res.donations || [])]);
+      setNextCursor(res.next_cursor || null);
+    } catch (error) {
+      console.error("Error fetching donations:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // The list holds only the pages loaded so far; the campaign keeps the full count
+  const totalDonations = Math.max(donorsCount || 0, donations.length);
+
   // Rotate donors every 3 seconds
   useEffect(() => {
     if (donations.length <= visibleDonors) return;
@@ -112,12 +133,12 @@ const CombinedProgressDonors = ({
                 <p className="text-sm font-semibold text-gray-700">
                   {t('campaignDonationsMessage.recentDonors')}
                 </p>
-                {donations.length > visibleDonors && (
+                {(donations.length > visibleDonors || nextCursor) && (
                   <button
                     onClick={() => setShowModal(true)}
                     className="text-xs text-blue-600 hover:underline self-start sm:self-auto"
                   >
-                    {t('campaignDonationsMessage.viewAll')} ({donations.length})
+                    {t('campaignDonationsMessage.viewAll')} ({totalDonations})
                   </button>
                 )}
               </div>
@@ -157,7 +178,7 @@ const CombinedProgressDonors = ({
           <div className="bg-white rounded-xl max-w-2xl w-full max-h-[80vh] overflow-hidden shadow-2xl">
             <div className="flex justify-between items-center p-4 border-b border-gray-200">
               <h3 className="text-lg font-bold text-gray-900">
-                {t('campaignDonationsMessage.allDonors')} ({donations.length})
+                {t('campaignDonationsMessage.allDonors')} ({totalDonations})
               </h3>
               <button
                 onClick={() => setShowModal(false)}
@@ -192,6 +213,18 @@ const CombinedProgressDonors = ({
                   </li>
                 ))}
               </ul>
+              {nextCursor && (
+                <div className="flex justify-center pt-3">
+                  <button
+                    onClick={loadMoreDonations}
+                    disabled={loadingMore}
+                    className="text-sm text-blue-600 hover:underline disabled:opacity-50 flex items-center"
+                  >
+                    {loadingMore && <Loader2 className="animate-spin w-4 h-4 me-1" />}
+                    {t('common.loadMore')}
+                  </button>
+                </div>
+              )}
             </div>
           </div>
         </div>
@@ -0,0 +1,245 @@
+"""
+Offline evaluation of recommendation quality against latency.
+
+Donation history is split at a point in time: the engine only sees donations
+before the cutoff, and each donor's new campaigns after it are the relevant
+items. Every strategy is scored with recall@k and NDCG@k next to its per-query
+latency, so a faster engine that recommends worse campaigns shows up.
+
+Usage (from recommendation_service/):
+    python -m benchmarks.evaluate --source synthetic --scale 5 --encoder hashing
+    python -m benchmarks.evaluate --source database --save-snapshot snapshots/2025-06
+    python -m benchmarks.evaluate --source snapshot --snapshot-dir snapshots/2025-06
+"""
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmark import DEFAULT_OUTPUT_DIR, _git_commit
+from benchmarks.synthetic_data import (
+    HashingEncoder, StaticDataLoader, SyntheticScale, generate_dataset
+)
+from services.recommendation_engine import RecommendationEngine
+
+# strategy(engine, user_id, user_donations, k) -> ranked campaign ids
+Strategy = Callable[[RecommendationEngine, str, pd.DataFrame, int], List[int]]
+
+
+def _ids(recommendations: List[Dict]) -> List[int]:
+    return [int(r['campaign_id']) for r in recommendations]
+
+
+def _without_donated(campaign_ids: List[int], user_donations: pd.DataFrame) -> List[int]:
+    donated = set(user_donations['campaign_id'].astype(int))
+    return [c for c in campaign_ids if c not in donated]
+
+
+def _latest_campaign(user_donations: pd.DataFrame) -> int:
+    return int(user_donations.sort_values('created_at').iloc[-1]['campaign_id'])
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "pipeline": lambda engine, user_id, donations, k: _ids(engine.get_recommendations(user_id, k)),
+    "ai": lambda engine, user_id, donations, k: _ids(engine._get_ai_recommendations(engine.snapshot, donations, k)),
+    "collaborative": lambda engine, user_id, donations, k: _ids(
+        engine._get_collaborative_recommendations(engine.snapshot, donations, k)
+    ),
+    "popular": lambda engine, user_id, donations, k: _ids(engine._get_popular_recommendations(
+        engine.snapshot, exclude_campaigns=donations['campaign_id'].astype(int).tolist(), top_n=k
+    )),
+    # Similar-campaign strategies are seeded with the donor's latest campaign
+    "similar_rule_based": lambda engine, user_id, donations, k: _without_donated(
+        _ids(engine._get_rule_based_similar_campaigns(engine.snapshot, _latest_campaign(donations), k * 2)), donations
+    )[:k],
+    "similar_ai": lambda engine, user_id, donations, k: _without_donated(
+        _ids(engine.get_similar_campaigns(_latest_campaign(donations), k * 2)), donations
+    )[:k],
+}
+
+
+def recall_at_k(ranked: Sequence[int], relevant: set, k: int) -> float:
+    if not relevant:
+        return 0.0
+    return len(set(ranked[:k]) & relevant) / len(relevant)
+
+
+def ndcg_at_k(ranked: Sequence[int], relevant: set, k: int) -> float:
+    gains = [1.0 / np.log2(rank + 2) for rank, campaign_id in enumerate(ranked[:k]) if campaign_id in relevant]
+    ideal = sum(1.0 / np.log2(rank + 2) for rank in range(min(len(relevant), k)))
+    return sum(gains) / ideal if ideal > 0 else 0.0
+
+
+def load_source(args) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return (completed donations, campaigns) from the requested source"""
+    if args.source == "synthetic":
+        donations_df, campaigns_df, _ = generate_dataset(SyntheticScale(multiplier=args.scale, seed=args.seed))
+    elif args.source == "snapshot":
+        donations_df = pd.read_pickle(os.path.join(args.snapshot_dir, "donations.pkl"))
+        campaigns_df = pd.read_pickle(os.path.join(args.snapshot_dir, "campaigns.pkl"))
+    else:
+        from services.django_data_loader import DjangoDataLoader
+        donations_df, campaigns_df, _ = DjangoDataLoader().load_all_data()
+
+    if args.save_snapshot:
+        os.makedirs(args.save_snapshot, exist_ok=True)
+        donations_df.to_pickle(os.path.join(args.save_snapshot, "donations.pkl"))
+        campaigns_df.to_pickle(os.path.join(args.save_snapshot, "campaigns.pkl"))
+
+    donations_df = donations_df[donations_df['status'] == 'completed'].copy()
+    donations_df['created_at'] = pd.to_datetime(donations_df['created_at'], utc=True)
+    campaigns_df = campaigns_df.copy()
+    campaigns_df['created_at'] = pd.to_datetime(campaigns_df['created_at'], utc=True)
+    return donations_df, campaigns_df
+
+
+def time_split(donations_df: pd.DataFrame, campaigns_df: pd.DataFrame, test_fraction: float):
+    """
+    Split history at the donation-time quantile so `test_fraction` of donations are held out
+
+    Campaign aggregates are recomputed from training donations only, and campaigns created
+    after the cutoff are dropped, so nothing from the test period leaks into the engine.
+    """
+    cutoff = donations_df['created_at'].quantile(1 - test_fraction)
+    train = donations_df[donations_df['created_at'] < cutoff].copy()
+    test = donations_df[donations_df['created_at'] >= cutoff]
+
+    campaigns = campaigns_df[campaigns_df['created_at'] < cutoff].copy()
+    stats = train.groupby('campaign_id')['amount'].agg(['count', 'sum'])
+    campaigns['donation_count'] = campaigns['id'].map(stats['count']).fillna(0).astype(int)
+    campaigns['current_amount'] = campaigns['id'].map(stats['sum']).fillna(0)
+    campaigns['progress_percentage'] = (
+        campaigns['current_amount'] / campaigns['goal_amount'].astype(float) * 100
+    ).clip(upper=100).fillna(0)
+    train['current_amount'] = train['campaign_id'].map(stats['sum'])
+    return train, test, campaigns, cutoff
+
+
+def relevant_items(train: pd.DataFrame, test: pd.DataFrame, catalog_ids: set) -> Dict[int, set]:
+    """Per donor: campaigns first supported after the cutoff that the engine could recommend"""
+    train_pairs = set(zip(train['donor_id'], train['campaign_id']))
+    known_donors = set(train['donor_id']) - {0}
+    relevant: Dict[int, set] = {}
+    for donor_id, campaign_id in zip(test['donor_id'], test['campaign_id']):
+        if donor_id in known_donors and campaign_id in catalog_ids and (donor_id, campaign_id) not in train_pairs:
+            relevant.setdefault(int(donor_id), set()).add(int(campaign_id))
+    return relevant
+
+
+def evaluate(engine: RecommendationEngine, train: pd.DataFrame, relevant: Dict[int, set],
+             strategies: List[str], ks: List[int], catalog_size: int) -> Dict:
+    max_k = max(ks)
+    donations_by_donor = {int(donor): group for donor, group in train.groupby('donor_id')}
+    results = {}
+
+    for name in strategies:
+        strategy = STRATEGIES[name]
+        recalls = {k: [] for k in ks}
+        ndcgs = {k: [] for k in ks}
+        latencies = []
+        recommended = set()
+
+        for donor_id, items in relevant.items():
+            user_donations = donations_by_donor[donor_id]
+            start = time.perf_counter()
+            ranked = strategy(engine, str(donor_id), user_donations, max_k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            recommended.update(ranked)
+            for k in ks:
+                recalls[k].append(recall_at_k(ranked, items, k))
+                ndcgs[k].append(ndcg_at_k(ranked, items, k))
+
+        latencies = np.asarray(latencies)
+        results[name] = {
+            **{f"recall@{k}": round(float(np.mean(recalls[k])), 4) for k in ks},
+            **{f"ndcg@{k}": round(float(np.mean(ndcgs[k])), 4) for k in ks},
+            "coverage": round(len(recommended) / catalog_size, 4) if catalog_size else 0.0,
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+            "mean_ms": round(float(latencies.mean()), 3),
+        }
+    return results
+
+
+def print_table(results: Dict, ks: List[int]):
+    columns = [f"recall@{k}" for k in ks] + [f"ndcg@{k}" for k in ks] + ["coverage", "p50_ms", "p95_ms"]
+    print(f"{'strategy':<20}" + "".join(f"{c:>12}" for c in columns))
+    for name, metrics in results.items():
+        print(f"{name:<20}" + "".join(f"{metrics[c]:>12.4f}" for c in columns))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate recommendation strategies on a time split")
+    parser.add_argument("--source", choices=["synthetic", "snapshot", "database"], default="synthetic")
+    parser.add_argument("--snapshot-dir", help="Directory with donations.pkl and campaigns.pkl")
+    parser.add_argument("--save-snapshot", help="Write the loaded data here for repeatable runs")
+    parser.add_argument("--scale", type=float, default=1.0, help="Synthetic dataset multiplier")
+    parser.add_argument("--seed", type=int, default=SyntheticScale.seed)
+    parser.add_argument("--encoder", choices=["model", "hashing"], default="model",
+                        help="'hashing' skips the transformer; only useful for lexical baselines")
+    parser.add_argument("--test-fraction", type=float, default=0.2, help="Share of donations held out")
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10])
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--max-users", type=int, default=1000, help="Sample of donors to evaluate")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.source == "snapshot" and not args.snapshot_dir:
+        parser.error("--source snapshot requires --snapshot-dir")
+
+    logging.basicConfig(level=logging.WARNING)
+
+    donations_df, campaigns_df = load_source(args)
+    train, test, campaigns, cutoff = time_split(donations_df, campaigns_df, args.test_fraction)
+    catalog_ids = set(campaigns.loc[campaigns['is_active'] == True, 'id'].astype(int))
+    relevant = relevant_items(train, test, catalog_ids)
+    if len(relevant) > args.max_users:
+        sampled = np.random.default_rng(args.seed).choice(sorted(relevant), args.max_users, replace=False)
+        relevant = {int(donor): relevant[int(donor)] for donor in sampled}
+    if not relevant:
+        print("No donors with history on both sides of the cutoff; nothing to evaluate")
+        return 1
+
+    engine = RecommendationEngine(
+        data_loader=StaticDataLoader(train, campaigns),
+        sentence_model=HashingEncoder() if args.encoder == "hashing" else None,
+        embedding_store=None,
+    )
+    engine._refresh_data_if_needed()
+
+    print(f"Cutoff {cutoff:%Y-%m-%d %H:%M} | train {len(train)} donations, {len(catalog_ids)} campaigns | "
+          f"{len(relevant)} donors evaluated")
+    results = evaluate(engine, train, relevant, args.strategies, args.k, len(catalog_ids))
+    print_table(results, args.k)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "source": args.source,
+        "encoder": args.encoder,
+        "cutoff": cutoff.isoformat(),
+        "test_fraction": args.test_fraction,
+        "train_donations": len(train),
+        "catalog_size": len(catalog_ids),
+        "donors_evaluated": len(relevant),
+        "strategies": results,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"evaluation_{report['commit'] or 'local'}_{int(time.time())}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Benchmark the recommendation engine on synthetic data.
+
+Usage (from recommendation_service/):
+    python -m benchmarks.run_benchmark --scale 10
+    python -m benchmarks.run_benchmark --scale 100 --compare benchmarks/results/baseline.json
+
+Reports throughput, p50/p95/p99 latency and peak memory for the refresh,
+embedding, recommendations and similar-campaigns phases, and writes them to
+a JSON file so runs can be compared across commits.
+"""
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import (
+    HashingEncoder, StaticDataLoader, SyntheticScale, generate_dataset
+)
+from services.recommendation_engine import RecommendationEngine
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Relative slowdown of p95 latency reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _summarize(durations_ms: List[float], wall_seconds: float, peak_bytes: int) -> Dict:
+    samples = np.asarray(durations_ms, dtype=np.float64)
+    return {
+        "count": int(len(samples)),
+        "throughput_per_s": round(len(samples) / wall_seconds, 2) if wall_seconds > 0 else None,
+        "mean_ms": round(float(samples.mean()), 3),
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples, 95)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "max_ms": round(float(samples.max()), 3),
+        "peak_python_mb": round(peak_bytes / (1024 * 1024), 2),
+    }
+
+
+def _measure(operation: Callable, arguments: List) -> Dict:
+    """Run `operation` once per argument and summarize latency and peak allocations"""
+    durations = []
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    wall_start = time.perf_counter()
+    for argument in arguments:
+        start = time.perf_counter()
+        operation(argument)
+        durations.append((time.perf_counter() - start) * 1000)
+    wall_seconds = time.perf_counter() - wall_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return _summarize(durations, wall_seconds, peak)
+
+
+def _sample_users(donations_df, count: int, rng: np.random.Generator) -> List[str]:
+    """Mix of heavy, regular and cold-start donors, weighted like real traffic"""
+    donors = donations_df["donor_id"].value_counts()
+    heavy = donors.index[: max(1, len(donors) // 20)].to_numpy()
+    regular = donors.index.to_numpy()
+    users = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.2:
+            users.append(str(int(rng.choice(heavy))))
+        elif roll < 0.9:
+            users.append(str(int(rng.choice(regular))))
+        else:
+            # Unknown donor: exercises the popular-campaigns fallback
+            users.append(f"new-donor-{rng.integers(1_000_000)}@example.com")
+    return users
+
+
+def run(scale: SyntheticScale, encoder: str = "hashing", queries: int = 500,
+        refresh_runs: int = 5, top_n: int = 5) -> Dict:
+    rng = np.random.default_rng(scale.seed)
+
+    generation_start = time.perf_counter()
+    donations_df, campaigns_df, orgs_df = generate_dataset(scale)
+    generation_seconds = time.perf_counter() - generation_start
+
+    sentence_model = HashingEncoder() if encoder == "hashing" else None
+    engine = RecommendationEngine(
+        data_loader=StaticDataLoader(donations_df, campaigns_df, orgs_df),
+        sentence_model=sentence_model
+    )
+    if engine.sentence_model is None:
+        raise RuntimeError("No sentence model available for the benchmark")
+
+    def force_refresh(_):
+        engine._last_refresh = None
+        engine._refresh_data_if_needed()
+
+    phases = {}
+    phases["refresh"] = _measure(force_refresh, range(refresh_runs))
+    phases["embedding"] = _measure(
+        lambda _: engine._generate_campaign_embeddings(engine.snapshot.campaigns_df), range(refresh_runs)
+    )
+    # Leave the engine with embeddings consistent with its arrays
+    force_refresh(None)
+
+    users = _sample_users(donations_df, queries, rng)
+    phases["recommendations"] = _measure(lambda user: engine.get_recommendations(user, top_n), users)
+
+    campaign_ids = rng.choice(engine.snapshot.campaign_ids, size=queries)
+    phases["similar_campaigns"] = _measure(
+        lambda campaign_id: engine.get_similar_campaigns(int(campaign_id), top_n), campaign_ids
+    )
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "encoder": encoder,
+        "scale": scale.as_dict(),
+        "dataset": {
+            "campaigns": len(campaigns_df),
+            "organizations": len(orgs_df),
+            "donations": len(donations_df),
+            "donors": int(donations_df["donor_id"].nunique()),
+            "generation_seconds": round(generation_seconds, 2),
+        },
+        "snapshot": engine.snapshot_stats(),
+        "phases": phases,
+        "max_rss_mb": round(_max_rss_mb(), 2),
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Describe p95 changes per phase; regressions beyond the threshold are flagged"""
+    lines = []
+    if current.get("scale") != baseline.get("scale"):
+        lines.append("warning: baseline was run at a different scale, latencies are not comparable")
+    for phase, stats in current["phases"].items():
+        previous = baseline.get("phases", {}).get(phase)
+        if not previous or not previous.get("p95_ms"):
+            continue
+        change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"]
+        flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ""
+        lines.append(
+            f"{phase:<18} p95 {previous['p95_ms']:>9.2f}ms -> {stats['p95_ms']:>9.2f}ms ({change:+.1%}){flag}"
+        )
+    return lines
+
+
+def print_report(result: Dict):
+    dataset = result["dataset"]
+    print(f"Commit {result['commit']} | encoder={result['encoder']} | "
+          f"{dataset['campaigns']} campaigns, {dataset['donations']} donations, {dataset['donors']} donors")
+    print(f"{'phase':<18}{'count':>7}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for phase, stats in result["phases"].items():
+        print(f"{phase:<18}{stats['count']:>7}{stats['throughput_per_s'] or 0:>10.1f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+              f"{stats['peak_python_mb']:>10.1f}")
+    print(f"Max RSS: {result['max_rss_mb']} MB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the recommendation engine on synthetic data")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier applied to every dataset size")
+    parser.add_argument("--campaigns", type=int, default=SyntheticScale.campaigns)
+    parser.add_argument("--organizations", type=int, default=SyntheticScale.organizations)
+    parser.add_argument("--donors", type=int, default=SyntheticScale.donors)
+    parser.add_argument("--donations", type=int, default=SyntheticScale.donations)
+    parser.add_argument("--seed", type=int, default=SyntheticScale.seed)
+    parser.add_argument("--encoder", choices=["hashing", "model"], default="hashing",
+                        help="'model' loads the real SentenceTransformer")
+    parser.add_argument("--queries", type=int, default=500, help="Requests per query phase")
+    parser.add_argument("--refresh-runs", type=int, default=5)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Directory for the JSON result")
+    parser.add_argument("--compare", help="Previous result JSON to compare against")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    scale = SyntheticScale(
+        campaigns=args.campaigns,
+        organizations=args.organizations,
+        donors=args.donors,
+        donations=args.donations,
+        multiplier=args.scale,
+        seed=args.seed,
+    )
+    result = run(scale, args.encoder, args.queries, args.refresh_runs, args.top_n)
+    print_report(result)
+
+    os.makedirs(args.output, exist_ok=True)
+    filename = f"benchmark_{result['commit'] or 'local'}_x{args.scale:g}_{int(time.time())}.json"
+    path = os.path.join(args.output, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, default=str)
+    print(f"Saved results to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines = compare(result, baseline)
+        print(f"Compared with {baseline.get('commit')}:")
+        for line in lines:
+            print(line)
+        if any(line.endswith("REGRESSION") for line in lines):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Synthetic campaigns, organizations and donations shaped like the frames returned
+by DjangoDataLoader, for benchmarking the engine beyond production data sizes.
+
+Donor activity and campaign popularity follow power laws, and campaign texts
+mix Arabic, French and English like the real catalog.
+"""
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+import hashlib
+
+CATEGORIES = [
+    ("Health", "الصحة", "Santé"),
+    ("Education", "التعليم", "Éducation"),
+    ("Water", "الماء", "Eau"),
+    ("Food", "الغذاء", "Alimentation"),
+    ("Orphans", "الأيتام", "Orphelins"),
+    ("Emergency", "الإغاثة", "Urgence"),
+    ("Mosques", "المساجد", "Mosquées"),
+    ("Housing", "السكن", "Logement"),
+]
+
+VOCABULARY = {
+    "ar": {
+        "subjects": ["بناء بئر", "دعم مدرسة", "علاج مريض", "كفالة يتيم", "سلة غذائية", "ترميم مسجد", "إغاثة أسر", "توفير أدوية"],
+        "places": ["في نواكشوط", "في نواذيبو", "في كيفة", "في روصو", "في أطار", "في الريف"],
+        "details": ["لمساعدة العائلات المحتاجة", "بالتعاون مع المتطوعين", "قبل فصل الشتاء", "خلال شهر رمضان", "للأطفال والنساء"],
+    },
+    "fr": {
+        "subjects": ["Construction d'un puits", "Soutien scolaire", "Soins médicaux", "Parrainage d'orphelins", "Paniers alimentaires", "Rénovation de mosquée", "Aide aux familles", "Achat de médicaments"],
+        "places": ["à Nouakchott", "à Nouadhibou", "à Kiffa", "à Rosso", "à Atar", "en zone rurale"],
+        "details": ["pour les familles démunies", "avec des bénévoles", "avant l'hiver", "pendant le Ramadan", "pour les enfants"],
+    },
+    "en": {
+        "subjects": ["Build a water well", "Support a school", "Medical treatment", "Sponsor an orphan", "Food baskets", "Mosque renovation", "Family relief", "Medicine supplies"],
+        "places": ["in Nouakchott", "in Nouadhibou", "in Kiffa", "in Rosso", "in Atar", "in rural areas"],
+        "details": ["for families in need", "with local volunteers", "before winter", "during Ramadan", "for women and children"],
+    },
+}
+
+
+@dataclass
+class SyntheticScale:
+    """Size of the generated dataset; `multiplier` scales every count"""
+    campaigns: int = 100
+    organizations: int = 15
+    donors: int = 1000
+    donations: int = 5000
+    days: int = 365
+    multiplier: float = 1.0
+    seed: int = 42
+
+    def scaled(self) -> Dict[str, int]:
+        return {
+            "campaigns": max(1, int(self.campaigns * self.multiplier)),
+            "organizations": max(1, int(self.organizations * self.multiplier)),
+            "donors": max(1, int(self.donors * self.multiplier)),
+            "donations": max(1, int(self.donations * self.multiplier)),
+        }
+
+    def as_dict(self) -> Dict:
+        return {**asdict(self), **{f"scaled_{k}": v for k, v in self.scaled().items()}}
+
+
+def _power_law_weights(rng: np.random.Generator, size: int, exponent: float) -> np.ndarray:
+    """Normalized Pareto weights: a few items receive most of the activity"""
+    weights = rng.pareto(exponent, size) + 1
+    return weights / weights.sum()
+
+
+def _campaign_text(rng: np.random.Generator, category_index: int) -> Tuple[str, str]:
+    language = rng.choice(["ar", "fr", "en"], p=[0.5, 0.3, 0.2])
+    vocabulary = VOCABULARY[language]
+    title = f"{rng.choice(vocabulary['subjects'])} {rng.choice(vocabulary['places'])}"
+    detail_count = int(rng.integers(1, 4))
+    details = " ".join(rng.choice(vocabulary["details"], detail_count))
+    category_name = CATEGORIES[category_index][{"en": 0, "ar": 1, "fr": 2}[language]]
+    description = f"{title} {details}. {category_name}"
+    return title, description
+
+
+def generate_dataset(scale: Optional[SyntheticScale] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Generate (donations_df, campaigns_df, orgs_df) with the DjangoDataLoader schema
+
+    Args:
+        scale: Dataset size and seed
+
+    Returns:
+        Tuple of (donations_df, campaigns_df, orgs_df)
+    """
+    scale = scale or SyntheticScale()
+    sizes = scale.scaled()
+    rng = np.random.default_rng(scale.seed)
+    now = pd.Timestamp.now(tz="UTC")
+
+    # Organizations
+    org_ids = np.arange(1, sizes["organizations"] + 1)
+    orgs_df = pd.DataFrame({
+        "id": org_ids,
+        "name": [f"Organization {i}" for i in org_ids],
+        "description": "",
+        "website": "",
+        "phone": "",
+        "address": "",
+        "city": rng.choice(["Nouakchott", "Nouadhibou", "Kiffa", "Rosso"], len(org_ids)),
+        "country": "Mauritania",
+        "is_verified": rng.random(len(org_ids)) < 0.8,
+        "created_at": now - pd.to_timedelta(rng.integers(30, scale.days + 30, len(org_ids)), unit="D"),
+        "updated_at": now,
+        "org_type": "nonprofit",
+    })
+
+    # Campaigns
+    campaign_count = sizes["campaigns"]
+    campaign_ids = np.arange(1, campaign_count + 1)
+    category_index = rng.integers(0, len(CATEGORIES), campaign_count)
+    texts = [_campaign_text(rng, int(c)) for c in category_index]
+    campaign_org = rng.choice(org_ids, campaign_count, p=_power_law_weights(rng, len(org_ids), 1.5))
+    org_verified = orgs_df.set_index("id")["is_verified"]
+    campaigns_df = pd.DataFrame({
+        "id": campaign_ids,
+        "title": [t[0] for t in texts],
+        "description": [t[1] for t in texts],
+        "goal_amount": rng.choice([5000, 10000, 25000, 50000, 100000], campaign_count).astype(float),
+        "category": [CATEGORIES[c][0] for c in category_index],
+        "created_at": now - pd.to_timedelta(rng.integers(1, scale.days, campaign_count), unit="D"),
+        "organization_id": campaign_org,
+        "is_featured": rng.random(campaign_count) < 0.05,
+        "is_active": True,
+        "organization_name": [f"Organization {o}" for o in campaign_org],
+        "organization_verified": org_verified.loc[campaign_org].to_numpy(),
+    })
+    campaigns_df["updated_at"] = campaigns_df["created_at"]
+
+    # Donations: power-law donors give mostly to a preferred category and to popular campaigns
+    donation_count = sizes["donations"]
+    donor_ids = np.arange(1, sizes["donors"] + 1)
+    donor_weights = _power_law_weights(rng, len(donor_ids), 1.2)
+    donation_donors = rng.choice(donor_ids, donation_count, p=donor_weights)
+    donor_preference = rng.integers(0, len(CATEGORIES), len(donor_ids) + 1)
+
+    popularity = _power_law_weights(rng, campaign_count, 1.1)
+    in_preferred = rng.random(donation_count) < 0.7
+    donation_campaign_pos = rng.choice(campaign_count, donation_count, p=popularity)
+    by_category = {c: np.flatnonzero(category_index == c) for c in range(len(CATEGORIES))}
+    for position in np.flatnonzero(in_preferred):
+        candidates = by_category[donor_preference[donation_donors[position]]]
+        if len(candidates):
+            weights = popularity[candidates] / popularity[candidates].sum()
+            donation_campaign_pos[position] = rng.choice(candidates, p=weights)
+
+    campaign_created = campaigns_df["created_at"].to_numpy()[donation_campaign_pos]
+    age_limit = (now - pd.to_datetime(campaign_created, utc=True)).days.to_numpy().clip(min=1)
+    donation_dates = now - pd.to_timedelta(rng.random(donation_count) * age_limit, unit="D")
+    amounts = np.round(rng.lognormal(mean=6.5, sigma=1.0, size=donation_count), 2)
+
+    donations_df = pd.DataFrame({
+        "id": np.arange(1, donation_count + 1),
+        "amount": amounts,
+        "donor_name": [f"Donor {d}" for d in donation_donors],
+        "status": "completed",
+        "created_at": donation_dates,
+        "message": None,
+        "is_anonymous": rng.random(donation_count) < 0.1,
+        "campaign_id": campaign_ids[donation_campaign_pos],
+        "donor_id": donation_donors,
+        "donor_email": [f"donor{d}@example.com" for d in donation_donors],
+    })
+    campaign_columns = campaigns_df.set_index("id")
+    donations_df["campaign_title"] = campaign_columns.loc[donations_df["campaign_id"], "title"].to_numpy()
+    donations_df["campaign_category"] = campaign_columns.loc[donations_df["campaign_id"], "category"].to_numpy()
+    donations_df["campaign_goal"] = campaign_columns.loc[donations_df["campaign_id"], "goal_amount"].to_numpy()
+    donations_df["organization_id"] = campaign_columns.loc[donations_df["campaign_id"], "organization_id"].to_numpy()
+    donations_df["organization_name"] = campaign_columns.loc[donations_df["campaign_id"], "organization_name"].to_numpy()
+    donations_df = donations_df.sort_values("created_at", ascending=False).reset_index(drop=True)
+
+    # Aggregates computed by _load_campaigns in SQL
+    stats = donations_df.groupby("campaign_id")["amount"].agg(["count", "mean", "max", "min", "sum"])
+    campaigns_df["donation_count"] = campaigns_df["id"].map(stats["count"]).fillna(0).astype(int)
+    campaigns_df["avg_donation_amount"] = campaigns_df["id"].map(stats["mean"]).fillna(0)
+    campaigns_df["max_donation_amount"] = campaigns_df["id"].map(stats["max"]).fillna(0)
+    campaigns_df["min_donation_amount"] = campaigns_df["id"].map(stats["min"]).fillna(0)
+    campaigns_df["current_amount"] = campaigns_df["id"].map(stats["sum"]).fillna(0)
+    campaigns_df["progress_percentage"] = (
+        campaigns_df["current_amount"] / campaigns_df["goal_amount"] * 100
+    ).clip(upper=100)
+    campaigns_df = campaigns_df.sort_values("created_at", ascending=False).reset_index(drop=True)
+
+    donations_df["current_amount"] = donations_df["campaign_id"].map(stats["sum"])
+
+    return donations_df, campaigns_df, orgs_df
+
+
+class StaticDataLoader:
+    """Stand-in for DjangoDataLoader that serves prepared frames"""
+
+    def __init__(self, donations_df: pd.DataFrame, campaigns_df: pd.DataFrame,
+                 orgs_df: Optional[pd.DataFrame] = None):
+        self.donations_df = donations_df
+        self.campaigns_df = campaigns_df
+        self.orgs_df = orgs_df if orgs_df is not None else pd.DataFrame()
+
+    def load_all_data(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        # Copies so the engine's filtering never mutates the prepared frames
+        return self.donations_df.copy(), self.campaigns_df.copy(), self.orgs_df.copy()
+
+
+class SyntheticDataLoader(StaticDataLoader):
+    """Stand-in for DjangoDataLoader backed by generate_dataset()"""
+
+    def __init__(self, scale: Optional[SyntheticScale] = None):
+        self.scale = scale or SyntheticScale()
+        super().__init__(*generate_dataset(self.scale))
+
+
+class HashingEncoder:
+    """
+    Deterministic bag-of-words encoder with the SentenceTransformer encode() API.
+
+    Lets benchmarks exercise the engine without downloading the transformer;
+    its vectors are meaningless for quality, only for timing.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimension, 1.0 if (value >> 63) & 1 else -1.0
+
+    def encode(self, sentences, show_progress_bar: bool = False, convert_to_numpy: bool = True, **kwargs):
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        vectors = np.zeros((len(sentences), self.dimension), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for token in str(sentence).lower().split():
+                column, sign = self._bucket(token)
+                vectors[row, column] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors /= norms
+        return vectors[0] if single else vectors
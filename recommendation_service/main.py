@@ -1,5 +1,7 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.routing import Match
+import time
 
 app = FastAPI(
     title="Recommendation Service",
@@ -27,6 +29,7 @@ async def root():
         "features": [
             "AI-powered personalized recommendations",
             "Semantic similarity matching",
+            "Multilingual semantic campaign search",
             "Multilingual support (Arabic + English)",
             "Neural embedding-based recommendations",
             "Real-time data from Supabase"
@@ -44,7 +47,47 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from routes.recommendations import router as recommendations_router
+from routes.metrics import router as metrics_router
+from routes.search import router as search_router
+from services import metrics
+
 app.include_router(recommendations_router)
+app.include_router(metrics_router)
+app.include_router(search_router)
+
+# Server-Timing is opt-in: enable for every response or per request with `X-Server-Timing: 1`
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+
+def _route_template(request: Request) -> str:
+    """Use the route path template as the metric label to keep cardinality bounded"""
+    for route in request.app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stages = metrics.begin_request()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.REQUEST_LATENCY.observe(
+            elapsed,
+            route=_route_template(request),
+            method=request.method,
+            status=str(status_code)
+        )
+
+    if SERVER_TIMING_ENABLED or request.headers.get("x-server-timing") == "1":
+        response.headers["Server-Timing"] = metrics.server_timing_header(stages, elapsed * 1000)
+    return response
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,3 +1,5 @@
 from .recommendations import router as recommendations_router
+from .metrics import router as metrics_router
+from .search import router as search_router
 
-__all__ = ["recommendations_router"]
\ No newline at end of file
+__all__ = ["recommendations_router", "metrics_router", "search_router"]
\ No newline at end of file
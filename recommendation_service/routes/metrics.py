@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+import logging
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import metrics
+from services.recommendation_engine import peek_engine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+
+def _update_snapshot_gauges():
+    """Copy the engine's snapshot size and age into the gauges before a scrape"""
+    engine = peek_engine()
+    if engine is None:
+        return
+
+    stats = engine.snapshot_stats()
+    if stats['age_seconds'] is not None:
+        metrics.SNAPSHOT_AGE.set(stats['age_seconds'])
+    metrics.SNAPSHOT_ROWS.set(stats['campaigns'], table="campaigns")
+    metrics.SNAPSHOT_ROWS.set(stats['donations'], table="donations")
+    for matrix, size in stats['embedding_bytes'].items():
+        metrics.EMBEDDING_BYTES.set(size, matrix=matrix)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Service metrics in the Prometheus text exposition format"""
+    _update_snapshot_gauges()
+    return PlainTextResponse(
+        metrics.REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from pydantic import BaseModel
+from typing import List, Dict, Any, Union, Optional
+from datetime import datetime
 import logging
+import threading
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.recommendation_engine import get_user_recommendations, RecommendationEngine
+from services.recommendation_engine import get_user_recommendations, get_engine
+from services.similarity_job import SimilarityJob
+from routes.service_auth import require_service_token
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +35,14 @@ async def get_personalized_recommendations(
     """
     try:
         logger.info(f"Getting recommendations for user: {user_id} with limit: {limit}")
-        recommendations = get_user_recommendations(user_id, limit)
+        timings = {}
+        recommendations = get_user_recommendations(user_id, limit, timings)
         
         response = {
             "user_id": user_id,
             "recommendations": recommendations,
-            "total": len(recommendations)
+            "total": len(recommendations),
+            "timings_ms": timings
         }
         
         logger.info(f"Successfully generated {len(recommendations)} recommendations for user {user_id}")
@@ -51,6 +58,90 @@ async def get_personalized_recommendations(
         )
 
 
+class CompletedDonation(BaseModel):
+    donation_id: int
+    campaign_id: int
+    amount: float
+    created_at: Optional[datetime] = None
+
+
+@router.post("/profiles/{donor_id}/donations", dependencies=[Depends(require_service_token)])
+def push_completed_donation(donor_id: int, donation: CompletedDonation) -> Dict[str, Any]:
+    """
+    Update a donor's profile vector the moment a donation completes.
+    Called by the Django backend only (X-Service-Token)
+
+    Args:
+        donor_id: Django user id of the donor
+        donation: The completed donation
+
+    Returns:
+        Whether the profile changed (False for repeats or campaigns not yet embedded)
+    """
+    try:
+        updated = get_engine().record_donation(
+            donor_id, donation.donation_id, donation.campaign_id, donation.amount, donation.created_at
+        )
+        return {"donor_id": donor_id, "donation_id": donation.donation_id, "updated": updated}
+
+    except Exception as e:
+        logger.error(f"Error updating profile for donor {donor_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update donor profile: {str(e)}"
+        )
+
+
+# Refreshes requested while a job runs are folded into a single follow-up run
+_similarity_lock = threading.Lock()
+_similarity_state = {"running": False, "pending": False, "pending_full": False}
+
+
+def _run_similarity_jobs(full: bool):
+    while True:
+        try:
+            engine = get_engine()
+            engine.refresh_now()
+            SimilarityJob(engine).run(full=full)
+        except Exception as e:
+            logger.error(f"Similarity job failed: {str(e)}")
+        
+        with _similarity_lock:
+            if not _similarity_state["pending"]:
+                _similarity_state["running"] = False
+                return
+            full = _similarity_state["pending_full"]
+            _similarity_state["pending"] = _similarity_state["pending_full"] = False
+
+
+@router.post("/similar/refresh", status_code=202, dependencies=[Depends(require_service_token)])
+def refresh_similar_campaigns(
+    background_tasks: BackgroundTasks,
+    full: bool = Query(default=False, description="Recompute every campaign, not only changed ones")
+) -> Dict[str, Any]:
+    """
+    Recompute the stored similar campaigns in the background.
+    Called by the Django backend (X-Service-Token) whenever a campaign is
+    created, edited or deleted
+    
+    Args:
+        full: Recompute all campaigns instead of only those affected by changes
+        
+    Returns:
+        Acknowledgement; the job writes to campaign_similarcampaign when done.
+        "queued" means a job is already running and another one follows it
+    """
+    with _similarity_lock:
+        if _similarity_state["running"]:
+            _similarity_state["pending"] = True
+            _similarity_state["pending_full"] = _similarity_state["pending_full"] or full
+            return {"status": "queued", "full": full}
+        _similarity_state["running"] = True
+    
+    background_tasks.add_task(_run_similarity_jobs, full)
+    return {"status": "scheduled", "full": full}
+
+
 @router.get("/similar/{campaign_id}")
 async def get_similar_campaigns(
     campaign_id: int,
@@ -68,7 +159,7 @@ async def get_similar_campaigns(
     """
     try:
         logger.info(f"Getting similar campaigns for campaign_id: {campaign_id} with limit: {limit}")
-        engine = RecommendationEngine()
+        engine = get_engine()
         similar_campaigns = engine.get_similar_campaigns(campaign_id, limit)
         
         response = {
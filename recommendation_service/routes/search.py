@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Any, Optional
+import logging
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recommendation_engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+# Plain `def` so query encoding runs in the threadpool instead of blocking the event loop
+@router.get("")
+def search_campaigns(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text (Arabic, French or English)"),
+    category: Optional[str] = Query(default=None, description="Only return campaigns in this category"),
+    limit: int = Query(default=20, ge=1, le=100, description="Number of campaign ids to return")
+) -> Dict[str, Any]:
+    """
+    Semantic campaign search over the campaign embedding index
+
+    Args:
+        q: Free-text query, encoded once and cached for repeated searches
+        category: Optional category filter
+        limit: Number of results (defaults to 20, max 100)
+
+    Returns:
+        Ranked campaign ids with similarity scores, for the caller to hydrate
+    """
+    try:
+        timings = {}
+        results = get_engine().search_campaigns(q, limit, category, timings)
+
+        return {
+            "query": q,
+            "category": category,
+            "results": results,
+            "total": len(results),
+            "timings_ms": timings
+        }
+
+    except Exception as e:
+        logger.error(f"Error searching campaigns for '{q}': {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search campaigns: {str(e)}"
+        )
@@ -0,0 +1,21 @@
+from fastapi import Header, HTTPException
+from typing import Optional
+import hmac
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Shared secret for routes only the Django backend may call (writes and batch jobs);
+# they are refused while it is unset
+SERVICE_API_TOKEN = os.environ.get("SERVICE_API_TOKEN", "")
+
+
+def require_service_token(x_service_token: Optional[str] = Header(default=None)) -> None:
+    """FastAPI dependency rejecting requests without the backend's X-Service-Token header"""
+    if not SERVICE_API_TOKEN:
+        logger.warning("Rejected a service-only request: SERVICE_API_TOKEN is not set")
+        raise HTTPException(status_code=503, detail="Service token not configured")
+
+    if not x_service_token or not hmac.compare_digest(x_service_token, SERVICE_API_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid service token")
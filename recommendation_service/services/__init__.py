@@ -1,9 +1,10 @@
 from .django_data_loader import DjangoDataLoader, load_django_data
-from .recommendation_engine import RecommendationEngine, get_user_recommendations
+from .recommendation_engine import RecommendationEngine, get_engine, get_user_recommendations
 
 __all__ = [
     "DjangoDataLoader",
     "load_django_data", 
     "RecommendationEngine", 
+    "get_engine",
     "get_user_recommendations"
 ]
\ No newline at end of file
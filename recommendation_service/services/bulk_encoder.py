@@ -0,0 +1,164 @@
+"""
+Bulk re-embedding of the campaign catalog.
+
+Texts are sorted by length so each chunk pads to similar sizes, then chunks are
+encoded across a process pool (one model per worker) and checkpointed to the
+embedding store as they finish. Re-running after an interruption only encodes
+what the store does not already hold.
+
+Usage (from recommendation_service/):
+    python -m services.bulk_encoder --workers 4 --chunk-size 512
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Sequence
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+try:
+    from .embedding_store import EmbeddingStore, campaign_text, text_hash
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.embedding_store import EmbeddingStore, campaign_text, text_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_name: str, torch_threads: int):
+    global _worker_model
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Split the cores between workers instead of letting each one grab all of them
+    torch.set_num_threads(torch_threads)
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_chunk(texts: List[str], batch_size: int) -> np.ndarray:
+    return _worker_model.encode(
+        texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+    )
+
+
+class BulkEncoder:
+    """Encodes campaign texts in length-sorted chunks, checkpointing each to the store"""
+
+    def __init__(self, store: EmbeddingStore, model=None, workers: Optional[int] = None,
+                 chunk_size: int = 256, batch_size: int = 64):
+        """
+        Args:
+            store: Embedding store for the model being encoded
+            model: In-process encoder used when workers == 1
+            workers: Encoding processes; defaults to BULK_ENCODE_WORKERS or 1
+            chunk_size: Texts per checkpointed chunk
+            batch_size: Texts per forward pass inside a chunk
+        """
+        self.store = store
+        self.model = model
+        self.workers = workers or int(os.getenv("BULK_ENCODE_WORKERS", 1))
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    def _chunks(self, ids: Sequence[int], hashes: Sequence[str], texts: Sequence[str]):
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.chunk_size):
+            rows = order[start:start + self.chunk_size]
+            yield [ids[i] for i in rows], [hashes[i] for i in rows], [texts[i] for i in rows]
+
+    def encode(self, ids: Sequence[int], texts: Sequence[str]) -> int:
+        """
+        Encode every text the store does not hold yet
+
+        Returns:
+            Number of texts encoded in this run
+        """
+        hashes = [text_hash(text) for text in texts]
+        _, missing = self.store.lookup(ids, hashes)
+        if not missing:
+            return 0
+
+        ids = [ids[i] for i in missing]
+        hashes = [hashes[i] for i in missing]
+        texts = [texts[i] for i in missing]
+        chunks = list(self._chunks(ids, hashes, texts))
+        run_id = time.time_ns()
+        start = time.perf_counter()
+        logger.info(f"Encoding {len(texts)} texts in {len(chunks)} chunks with {self.workers} worker(s)")
+
+        if self.workers <= 1 or len(chunks) == 1:
+            if self.model is None:
+                _init_worker(self.store.model_name, os.cpu_count() or 1)
+                self.model = _worker_model
+            for index, (chunk_ids, chunk_hashes, chunk_texts) in enumerate(chunks):
+                vectors = self.model.encode(
+                    chunk_texts, batch_size=self.batch_size, show_progress_bar=False, convert_to_numpy=True
+                )
+                self.store.write_chunk(chunk_ids, chunk_hashes, vectors, name=f"{run_id}-{index:05d}")
+        else:
+            torch_threads = max(1, (os.cpu_count() or 1) // self.workers)
+            # spawn: forking a process that already initialised torch can deadlock
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.store.model_name, torch_threads),
+            ) as pool:
+                futures = {
+                    pool.submit(_encode_chunk, chunk_texts, self.batch_size): (index, chunk_ids, chunk_hashes)
+                    for index, (chunk_ids, chunk_hashes, chunk_texts) in enumerate(chunks)
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    index, chunk_ids, chunk_hashes = futures[future]
+                    self.store.write_chunk(chunk_ids, chunk_hashes, future.result(), name=f"{run_id}-{index:05d}")
+                    logger.info(f"Checkpointed chunk {done}/{len(chunks)}")
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Encoded {len(texts)} texts in {elapsed:.1f}s ({len(texts) / max(elapsed, 1e-9):.0f} texts/s)")
+        return len(texts)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-embed the campaign catalog into the embedding store")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--store-dir", help="Defaults to EMBEDDING_STORE_DIR")
+    parser.add_argument("--include-inactive", action="store_true", help="Also encode inactive campaigns")
+    parser.add_argument("--compact", action="store_true", help="Merge the store into one chunk afterwards")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    from services.django_data_loader import DjangoDataLoader
+
+    _, campaigns_df, _ = DjangoDataLoader().load_all_data()
+    if not args.include_inactive:
+        campaigns_df = campaigns_df[campaigns_df['is_active'] == True]
+
+    ids = campaigns_df['id'].astype(int).tolist()
+    texts = [campaign_text(campaign) for _, campaign in campaigns_df.iterrows()]
+
+    store = EmbeddingStore(args.model, args.store_dir)
+    encoder = BulkEncoder(store, workers=args.workers, chunk_size=args.chunk_size, batch_size=args.batch_size)
+    encoded = encoder.encode(ids, texts)
+    print(f"Encoded {encoded} of {len(ids)} campaigns into {store.directory}")
+
+    if args.compact:
+        store.compact(keep_ids=ids if not args.include_inactive else None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
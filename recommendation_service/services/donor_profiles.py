@@ -0,0 +1,137 @@
+"""
+Incrementally maintained donor profile vectors.
+
+Each donor keeps a running weighted sum of the embeddings of campaigns they
+gave to plus the sum of the weights, so the profile (their ratio) can be read
+in O(1) and updated one donation at a time. A donation weighs log1p(amount),
+halved every PROFILE_HALF_LIFE_DAYS; decay is applied lazily whenever a donor's
+sums are touched.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class DonorProfile:
+    weight_sum: float
+    weighted_sum: np.ndarray
+    updated_at: float
+    donation_count: int = 0
+
+    def vector(self) -> Optional[np.ndarray]:
+        if self.weight_sum <= 0:
+            return None
+        return self.weighted_sum / self.weight_sum
+
+
+class DonorProfileStore:
+    """donor_id -> DonorProfile, fed by snapshot refresh deltas and pushed donations"""
+
+    def __init__(self, half_life_days: Optional[float] = None):
+        self.half_life_seconds = float(
+            half_life_days or os.getenv("PROFILE_HALF_LIFE_DAYS", 90)
+        ) * SECONDS_PER_DAY
+        self._profiles: Dict[int, DonorProfile] = {}
+        self._seen_donations = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def _decay(self, age_seconds):
+        return np.power(0.5, np.maximum(age_seconds, 0) / self.half_life_seconds)
+
+    def _add(self, donor_id: int, weight: float, weighted_vector: np.ndarray, now: float, count: int):
+        profile = self._profiles.get(donor_id)
+        if profile is None:
+            self._profiles[donor_id] = DonorProfile(weight, weighted_vector.astype(np.float64), now, count)
+            return
+        factor = float(self._decay(now - profile.updated_at))
+        profile.weight_sum = profile.weight_sum * factor + weight
+        profile.weighted_sum = profile.weighted_sum * factor + weighted_vector
+        profile.updated_at = now
+        profile.donation_count += count
+
+    def get(self, donor_id: int) -> Optional[np.ndarray]:
+        with self._lock:
+            profile = self._profiles.get(donor_id)
+            return profile.vector() if profile is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+            self._seen_donations.clear()
+
+    def apply_donations(self, donations_df: pd.DataFrame, positions: np.ndarray,
+                        embeddings: np.ndarray) -> int:
+        """
+        Fold completed donations not seen before into the donor profiles
+
+        Args:
+            donations_df: Completed donations (id, donor_id, amount, created_at)
+            positions: Row of each donation's campaign in `embeddings`, -1 if none
+            embeddings: Unit-length campaign embeddings
+
+        Returns:
+            Number of donations applied
+        """
+        donation_ids = donations_df['id'].to_numpy(dtype=np.int64)
+        donor_ids = donations_df['donor_id'].fillna(0).to_numpy(dtype=np.int64)
+
+        with self._lock:
+            # Anonymous donations (donor_id 0) and campaigns without a vector are skipped;
+            # the latter stay unseen so they apply once the campaign is embedded
+            new = (donor_ids != 0) & (positions >= 0)
+            if self._seen_donations:
+                new &= ~np.isin(donation_ids, np.fromiter(self._seen_donations, dtype=np.int64))
+            if not new.any():
+                return 0
+
+            now = time.time()
+            created = pd.to_datetime(donations_df['created_at'], utc=True)
+            ages = (pd.Timestamp.now(tz='UTC') - created).dt.total_seconds().to_numpy()[new]
+            amounts = donations_df['amount'].astype(float).to_numpy()[new]
+            weights = np.log1p(np.maximum(amounts, 0)) * self._decay(ages)
+
+            donors, inverse = np.unique(donor_ids[new], return_inverse=True)
+            weight_sums = np.bincount(inverse, weights=weights, minlength=len(donors))
+            weighted_sums = np.zeros((len(donors), embeddings.shape[1]))
+            np.add.at(weighted_sums, inverse, embeddings[positions[new]] * weights[:, None])
+            counts = np.bincount(inverse, minlength=len(donors))
+
+            for row, donor_id in enumerate(donors):
+                self._add(int(donor_id), weight_sums[row], weighted_sums[row], now, int(counts[row]))
+            self._seen_donations.update(donation_ids[new].tolist())
+
+        return int(new.sum())
+
+    def add_donation(self, donor_id: int, donation_id: int, vector: np.ndarray,
+                     amount: float, created_at: Optional[float] = None) -> bool:
+        """Apply one pushed donation; returns False if it was already applied"""
+        now = time.time()
+        created_at = created_at or now
+        with self._lock:
+            if donation_id in self._seen_donations:
+                return False
+            weight = float(np.log1p(max(amount, 0)) * self._decay(now - created_at))
+            self._add(donor_id, weight, vector * weight, now, 1)
+            self._seen_donations.add(donation_id)
+        return True
+
+    def rebuild(self, donations_df: pd.DataFrame, positions: np.ndarray, embeddings: np.ndarray) -> int:
+        """Recompute every profile from scratch, e.g. after campaign vectors changed"""
+        self.clear()
+        applied = self.apply_donations(donations_df, positions, embeddings)
+        logger.info(f"Rebuilt {len(self._profiles)} donor profiles from {applied} donations")
+        return applied
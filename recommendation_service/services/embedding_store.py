@@ -0,0 +1,153 @@
+"""
+On-disk store of campaign embeddings, one directory per model.
+
+Vectors are written in immutable .npz chunks holding campaign ids, the hash of
+the text that was encoded and the vectors themselves. A campaign is re-encoded
+only when its text hash changes, and a bulk run that dies half-way keeps every
+chunk it finished.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", "embedding_store")
+
+# Merge chunks into one once there are more than this many
+COMPACT_AFTER_CHUNKS = int(os.getenv("EMBEDDING_STORE_COMPACT_AFTER", 64))
+
+
+def campaign_text(campaign) -> str:
+    """Text encoded for a campaign: title, description, category and organization"""
+    text_parts = []
+
+    if pd.notna(campaign.get('title')):
+        text_parts.append(str(campaign['title']))
+
+    if pd.notna(campaign.get('description')):
+        text_parts.append(str(campaign['description']))
+
+    if pd.notna(campaign.get('category')):
+        text_parts.append(f"Category: {campaign['category']}")
+
+    if pd.notna(campaign.get('organization_name')):
+        text_parts.append(f"Organization: {campaign['organization_name']}")
+
+    return " ".join(text_parts) if text_parts else "No description available"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingStore:
+    """Chunked embedding files for one model, indexed in memory by campaign id"""
+
+    def __init__(self, model_name: str, root: Optional[str] = None):
+        self.model_name = model_name
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = os.path.join(root or DEFAULT_STORE_DIR, safe_name)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._loaded_chunks = set()
+        # campaign id -> (text hash, vector)
+        self._entries: Dict[int, Tuple[str, np.ndarray]] = {}
+
+    def _chunk_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.npz")
+
+    def chunk_names(self) -> List[str]:
+        # Names start with a timestamp so sorting replays chunks in write order
+        return sorted(f[:-4] for f in os.listdir(self.directory) if f.endswith(".npz"))
+
+    def has_chunk(self, name: str) -> bool:
+        return os.path.exists(self._chunk_path(name))
+
+    def _load_new_chunks(self):
+        for name in self.chunk_names():
+            if name in self._loaded_chunks:
+                continue
+            try:
+                with np.load(self._chunk_path(name), allow_pickle=False) as data:
+                    for campaign_id, digest, vector in zip(data["ids"], data["hashes"], data["vectors"]):
+                        self._entries[int(campaign_id)] = (str(digest), vector)
+                self._loaded_chunks.add(name)
+            except Exception as e:
+                logger.error(f"Skipping unreadable embedding chunk {name}: {str(e)}")
+
+    def lookup(self, ids: Iterable[int], hashes: Iterable[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Split campaigns into stored vectors and ids that still need encoding
+
+        Returns:
+            (id -> vector for up-to-date entries, positions of the missing ones)
+        """
+        with self._lock:
+            self._load_new_chunks()
+            found, missing = {}, []
+            for position, (campaign_id, digest) in enumerate(zip(ids, hashes)):
+                entry = self._entries.get(int(campaign_id))
+                if entry is not None and entry[0] == digest:
+                    found[int(campaign_id)] = entry[1]
+                else:
+                    missing.append(position)
+            return found, missing
+
+    def write_chunk(self, ids, hashes, vectors, name: Optional[str] = None) -> str:
+        """Persist one chunk atomically and add it to the in-memory index"""
+        name = name or f"{time.time_ns()}-incremental"
+        path = self._chunk_path(name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                ids=np.asarray(ids, dtype=np.int64),
+                hashes=np.asarray(hashes, dtype="U32"),
+                vectors=np.asarray(vectors, dtype=np.float32),
+            )
+        os.replace(temp_path, path)
+
+        with self._lock:
+            for campaign_id, digest, vector in zip(ids, hashes, np.asarray(vectors, dtype=np.float32)):
+                self._entries[int(campaign_id)] = (str(digest), vector)
+            self._loaded_chunks.add(name)
+        return name
+
+    def compact(self, keep_ids: Optional[Iterable[int]] = None):
+        """Rewrite all chunks as one, optionally dropping campaigns not in keep_ids"""
+        with self._lock:
+            self._load_new_chunks()
+            old_chunks = list(self._loaded_chunks)
+            if keep_ids is not None:
+                keep = {int(i) for i in keep_ids}
+                self._entries = {k: v for k, v in self._entries.items() if k in keep}
+            entries = list(self._entries.items())
+
+        if entries:
+            self.write_chunk(
+                [campaign_id for campaign_id, _ in entries],
+                [digest for _, (digest, _) in entries],
+                np.stack([vector for _, (_, vector) in entries]),
+                name=f"{time.time_ns()}-compacted",
+            )
+        with self._lock:
+            for name in old_chunks:
+                try:
+                    os.remove(self._chunk_path(name))
+                except FileNotFoundError:
+                    pass
+                self._loaded_chunks.discard(name)
+        logger.info(f"Compacted {len(old_chunks)} embedding chunks into {len(entries)} vectors")
+
+    def compact_if_needed(self, keep_ids: Optional[Iterable[int]] = None):
+        if len(self.chunk_names()) > COMPACT_AFTER_CHUNKS:
+            self.compact(keep_ids)
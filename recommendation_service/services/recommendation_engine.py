@@ -2,44 +2,148 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 import logging
-from collections import Counter
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
 import pickle
 import os
+import threading
+import time
 
 try:
     from .django_data_loader import DjangoDataLoader
+    from .retrieval_pipeline import RetrievalPipeline, RecommendationContext, _top_candidates
+    from .metrics import stage_timer, record_cache
+    from .embedding_store import EmbeddingStore, campaign_text, text_hash
+    from .bulk_encoder import BulkEncoder
+    from .donor_profiles import DonorProfileStore
 except ImportError:
     # Handle direct script execution
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from services.django_data_loader import DjangoDataLoader
+    from services.retrieval_pipeline import RetrievalPipeline, RecommendationContext, _top_candidates
+    from services.metrics import stage_timer, record_cache
+    from services.embedding_store import EmbeddingStore, campaign_text, text_hash
+    from services.bulk_encoder import BulkEncoder
+    from services.donor_profiles import DonorProfileStore
 
 logger = logging.getLogger(__name__)
 
 
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class EngineSnapshot:
+    """
+    One generation of the engine's data: the filtered dataframes, the campaign
+    embeddings and the dense per-campaign arrays derived from them.
+    
+    A refresh builds a complete new snapshot and publishes it by replacing
+    `engine.snapshot`, a single reference assignment. A request reads that
+    reference once and uses only the object it got, so it can never combine
+    arrays from two refreshes. Arrays are read-only; dataframes must be copied
+    before adding columns.
+    """
+    donations_df: Optional[pd.DataFrame]
+    campaigns_df: Optional[pd.DataFrame]
+    campaign_embeddings: Optional[np.ndarray]
+    normalized_embeddings: Optional[np.ndarray]
+    campaign_ids: np.ndarray
+    campaign_positions: Dict[int, int]
+    campaign_categories: np.ndarray
+    donation_counts: np.ndarray
+    progress: np.ndarray
+    verified: np.ndarray
+    featured: np.ndarray
+    donation_positions: Optional[np.ndarray]
+    donation_donor_ids: Optional[np.ndarray]
+    trending_scores: Optional[np.ndarray]
+    # Text hash per campaign id, to tell which campaigns were edited since
+    text_hashes: Dict[int, str]
+    
+    @property
+    def campaign_count(self) -> int:
+        return len(self.campaign_ids)
+    
+    @classmethod
+    def empty(cls) -> 'EngineSnapshot':
+        """Placeholder until the first refresh"""
+        return cls(
+            donations_df=None,
+            campaigns_df=None,
+            campaign_embeddings=None,
+            normalized_embeddings=None,
+            campaign_ids=np.empty(0, dtype=np.int64),
+            campaign_positions={},
+            campaign_categories=np.empty(0, dtype=object),
+            donation_counts=np.empty(0),
+            progress=np.empty(0),
+            verified=np.empty(0, dtype=bool),
+            featured=np.empty(0, dtype=bool),
+            donation_positions=None,
+            donation_donor_ids=None,
+            trending_scores=None,
+            text_hashes={},
+        )
+
+
 class RecommendationEngine:
     """AI-powered campaign recommendation engine using embedding-based models"""
     
-    def __init__(self):
-        self.data_loader = DjangoDataLoader()
-        self._donations_df = None
-        self._campaigns_df = None
+    def __init__(self, data_loader=None, sentence_model=None, embedding_store=None):
+        """
+        Args:
+            data_loader: Object with load_all_data(); defaults to DjangoDataLoader
+            sentence_model: Pre-built encoder with encode(); skips loading the transformer
+            embedding_store: Store of previously encoded campaigns; defaults to one for the
+                loaded model unless EMBEDDING_STORE_ENABLED=false
+        """
+        self.data_loader = data_loader or DjangoDataLoader()
         self._last_refresh = None
         
         # AI Model components
         self.sentence_model = None
-        self.campaign_embeddings = None
+        self.model_name = None
+        self.embedding_store = embedding_store
         self.user_embeddings = None
         self.scaler = StandardScaler()
         self.embeddings_cache_path = "embeddings_cache.pkl"
         
+        # Data, embeddings and dense arrays of the last refresh; replaced as a whole
+        self.snapshot = EngineSnapshot.empty()
+        self._refresh_lock = threading.Lock()
+        
+        # Donor profile vectors kept up to date from refresh deltas and pushed donations
+        self.donor_profiles = DonorProfileStore()
+        self._profiles_rebuilt_at = None
+        
+        # LRU of encoded search queries; they depend on the model only, not on the snapshot
+        self._query_cache = OrderedDict()
+        self._query_cache_size = int(os.getenv("QUERY_CACHE_SIZE", 1024))
+        self._query_cache_lock = threading.Lock()
+        
+        self.pipeline = RetrievalPipeline(self)
+        
         # Initialize the multilingual sentence transformer (supports Arabic)
-        self._initialize_ai_model()
+        if sentence_model is not None:
+            self.sentence_model = sentence_model
+        else:
+            self._initialize_ai_model()
+        
+        if (self.embedding_store is None and self.model_name
+                and os.getenv("EMBEDDING_STORE_ENABLED", "true").lower() == "true"):
+            try:
+                self.embedding_store = EmbeddingStore(self.model_name)
+            except OSError as e:
+                logger.warning(f"Embedding store unavailable, encoding every refresh: {str(e)}")
         
     def _initialize_ai_model(self):
         """Initialize the AI model for embeddings"""
@@ -47,121 +151,305 @@ class RecommendationEngine:
             # Use multilingual model that supports Arabic text
             logger.info("Loading multilingual sentence transformer model...")
             self.sentence_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+            self.model_name = 'paraphrase-multilingual-MiniLM-L12-v2'
             logger.info("AI model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load AI model: {str(e)}")
             # Fallback to a smaller model if the main one fails
             try:
                 self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.model_name = 'all-MiniLM-L6-v2'
                 logger.info("Loaded fallback AI model")
             except Exception as e2:
                 logger.error(f"Failed to load fallback model: {str(e2)}")
                 self.sentence_model = None
         
+    def _is_stale(self) -> bool:
+        return (self._last_refresh is None or 
+                datetime.now() - self._last_refresh > timedelta(hours=1))
+    
     def _refresh_data_if_needed(self):
         """Refresh data if it's older than 1 hour or not loaded"""
-        if (self._last_refresh is None or 
-            datetime.now() - self._last_refresh > timedelta(hours=1)):
+        if not self._is_stale():
+            record_cache("snapshot", hit=True)
+            return
+        
+        record_cache("snapshot", hit=False)
+        with self._refresh_lock:
+            # Another request may have refreshed while we waited for the lock
+            if not self._is_stale():
+                return
             
             logger.info("Refreshing recommendation data...")
-            donations_df, campaigns_df, _ = self.data_loader.load_all_data()
+            with stage_timer("data_load"):
+                donations_df, campaigns_df, _ = self.data_loader.load_all_data()
             
             # Filter for completed donations and active campaigns
-            self._donations_df = donations_df[donations_df['status'] == 'completed'].copy()
-            self._campaigns_df = campaigns_df[campaigns_df['is_active'] == True].copy()
+            donations_df = donations_df[donations_df['status'] == 'completed'].copy()
+            campaigns_df = campaigns_df[campaigns_df['is_active'] == True].copy()
             
             # Generate embeddings for campaigns
-            self._generate_campaign_embeddings()
+            embeddings, text_hashes = self._generate_campaign_embeddings(campaigns_df)
             
+            # Edited campaigns move in embedding space, so profiles built on them are stale
+            previous_hashes = self.snapshot.text_hashes
+            embeddings_changed = any(
+                previous_hashes.get(campaign_id, digest) != digest for campaign_id, digest in text_hashes.items()
+            )
+            
+            snapshot = self._build_snapshot(donations_df, campaigns_df, embeddings, text_hashes)
+            self._update_donor_profiles(snapshot, embeddings_changed)
+            
+            # Requests already running keep the snapshot they started with
+            self.snapshot = snapshot
             self._last_refresh = datetime.now()
-            logger.info(f"Data refreshed: {len(self._donations_df)} donations, {len(self._campaigns_df)} campaigns")
+            logger.info(f"Data refreshed: {len(donations_df)} donations, {len(campaigns_df)} campaigns")
     
-    def _generate_campaign_embeddings(self):
-        """Generate embeddings for all campaigns using AI model"""
-        if self.sentence_model is None or len(self._campaigns_df) == 0:
-            logger.warning("Cannot generate embeddings: model not loaded or no campaigns")
+    def refresh_now(self):
+        """Reload data and embeddings regardless of the snapshot's age"""
+        with self._refresh_lock:
+            self._last_refresh = None
+        self._refresh_data_if_needed()
+    
+    def similarity_snapshot(self) -> Tuple[np.ndarray, Optional[np.ndarray], List[str]]:
+        """Campaign ids, their normalized embeddings and text hashes, all from one snapshot"""
+        snapshot = self.snapshot
+        hashes = [snapshot.text_hashes.get(int(cid), '') for cid in snapshot.campaign_ids]
+        return snapshot.campaign_ids, snapshot.normalized_embeddings, hashes
+    
+    def _build_snapshot(self, donations: pd.DataFrame, campaigns: pd.DataFrame,
+                        embeddings: Optional[np.ndarray], text_hashes: Dict[int, str]) -> EngineSnapshot:
+        """Precompute dense arrays so retrievers and the ranker avoid dataframe scans"""
+        campaign_ids = campaigns['id'].to_numpy(dtype=np.int64)
+        campaign_count = len(campaigns)
+        campaign_positions = {int(cid): pos for pos, cid in enumerate(campaign_ids)}
+        
+        # Position of each donation's campaign in the arrays above (-1 when inactive)
+        donation_positions = (
+            donations['campaign_id'].map(campaign_positions).fillna(-1).astype(np.int64).to_numpy()
+        )
+        
+        # Recent activity (last 7 days) normalized to max 10 donations
+        created_dates = pd.to_datetime(donations['created_at'], utc=True)
+        cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=7)
+        recent_positions = donation_positions[(created_dates >= cutoff).to_numpy() & (donation_positions >= 0)]
+        trending_counts = np.bincount(recent_positions, minlength=campaign_count).astype(np.float64)
+        
+        normalized_embeddings = None
+        if embeddings is not None and len(embeddings) == campaign_count:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            normalized_embeddings = _read_only(embeddings / norms)
+        
+        return EngineSnapshot(
+            donations_df=donations,
+            campaigns_df=campaigns,
+            campaign_embeddings=_read_only(embeddings) if embeddings is not None else None,
+            normalized_embeddings=normalized_embeddings,
+            campaign_ids=_read_only(campaign_ids),
+            campaign_positions=campaign_positions,
+            campaign_categories=_read_only(campaigns['category'].to_numpy(dtype=object)),
+            donation_counts=_read_only(campaigns['donation_count'].fillna(0).to_numpy(dtype=np.float64)),
+            progress=_read_only(campaigns['progress_percentage'].fillna(0).astype(float).to_numpy()),
+            verified=_read_only(campaigns['organization_verified'].fillna(False).astype(bool).to_numpy()),
+            featured=_read_only(campaigns['is_featured'].fillna(False).astype(bool).to_numpy()),
+            donation_positions=_read_only(donation_positions),
+            donation_donor_ids=_read_only(donations['donor_id'].fillna(0).astype(np.int64).to_numpy()),
+            trending_scores=_read_only(np.minimum(trending_counts / 10, 1.0)),
+            text_hashes=text_hashes,
+        )
+    
+    def snapshot_stats(self) -> Dict:
+        """Size and age of the in-memory snapshot, exposed on /metrics"""
+        snapshot = self.snapshot
+        age_seconds = (datetime.now() - self._last_refresh).total_seconds() if self._last_refresh else None
+        matrices = {
+            'campaign_embeddings': snapshot.campaign_embeddings,
+            'normalized_embeddings': snapshot.normalized_embeddings,
+        }
+        return {
+            'age_seconds': age_seconds,
+            'campaigns': len(snapshot.campaigns_df) if snapshot.campaigns_df is not None else 0,
+            'donations': len(snapshot.donations_df) if snapshot.donations_df is not None else 0,
+            'embedding_bytes': {
+                name: int(matrix.nbytes) for name, matrix in matrices.items() if matrix is not None
+            },
+        }
+    
+    def _get_user_donations(self, snapshot: EngineSnapshot, user_id: str) -> pd.DataFrame:
+        """Get user's donation history by user ID, falling back to email"""
+        donations_df = snapshot.donations_df
+        try:
+            user_id_int = int(user_id)
+            return donations_df[donations_df['donor_id'] == user_id_int]
+        except (ValueError, TypeError):
+            return donations_df[donations_df['donor_email'] == user_id]
+    
+    def _build_context(self, snapshot: EngineSnapshot, user_id: str, user_donations: pd.DataFrame,
+                       top_n: int) -> RecommendationContext:
+        """Collect the donor-level inputs shared by every retriever"""
+        campaign_positions = snapshot.campaign_positions
+        donated_positions = np.array(
+            [campaign_positions[cid] for cid in user_donations['campaign_id'].unique()
+             if cid in campaign_positions],
+            dtype=np.int64
+        )
+        donor_id = None
+        if 'donor_id' in user_donations.columns and len(user_donations) > 0:
+            donor_id = int(user_donations['donor_id'].iloc[0]) or None
+        
+        return RecommendationContext(
+            snapshot=snapshot,
+            user_id=str(user_id),
+            user_donations=user_donations,
+            donor_id=donor_id,
+            donated_positions=donated_positions,
+            user_categories=user_donations['campaign_category'].dropna().unique(),
+            top_n=top_n
+        )
+    
+    def _update_donor_profiles(self, snapshot: EngineSnapshot, embeddings_changed: bool):
+        """Fold new completed donations into donor profiles, rebuilding when vectors moved"""
+        if snapshot.normalized_embeddings is None:
+            self.donor_profiles.clear()
+            self._profiles_rebuilt_at = None
             return
-            
+        
+        rebuild_after = timedelta(hours=float(os.getenv("PROFILE_REBUILD_HOURS", 24)))
+        with stage_timer("profiles"):
+            if (embeddings_changed or self._profiles_rebuilt_at is None
+                    or datetime.now() - self._profiles_rebuilt_at > rebuild_after):
+                self.donor_profiles.rebuild(
+                    snapshot.donations_df, snapshot.donation_positions, snapshot.normalized_embeddings
+                )
+                self._profiles_rebuilt_at = datetime.now()
+            else:
+                applied = self.donor_profiles.apply_donations(
+                    snapshot.donations_df, snapshot.donation_positions, snapshot.normalized_embeddings
+                )
+                logger.info(f"Applied {applied} new donations to {len(self.donor_profiles)} donor profiles")
+    
+    def record_donation(self, donor_id: int, donation_id: int, campaign_id: int, amount: float,
+                        created_at: Optional[datetime] = None) -> bool:
+        """
+        Update a donor's profile as soon as a donation completes, ahead of the next refresh
+        
+        Returns:
+            True if the profile changed, False if the donation was already applied or the
+            campaign has no embedding
+        """
+        self._refresh_data_if_needed()
+        snapshot = self.snapshot
+        position = snapshot.campaign_positions.get(int(campaign_id))
+        if position is None or snapshot.normalized_embeddings is None:
+            return False
+        
+        created_timestamp = created_at.timestamp() if created_at is not None else None
+        return self.donor_profiles.add_donation(
+            int(donor_id), int(donation_id), snapshot.normalized_embeddings[position], float(amount), created_timestamp
+        )
+    
+    def get_user_profile(self, snapshot: EngineSnapshot, user_donations: pd.DataFrame,
+                         donor_id: Optional[int] = None) -> Optional[np.ndarray]:
+        """Profile vector for a donor, used by the embedding retriever"""
+        if donor_id is not None:
+            profile = self.donor_profiles.get(donor_id)
+            record_cache("profile", hit=profile is not None)
+            if profile is not None:
+                return profile
+        
+        # Email-only donors and donors without a stored profile are computed from history
+        return self._create_user_profile_embedding(snapshot, user_donations)
+    
+    def _generate_campaign_embeddings(self, campaigns_df: pd.DataFrame) -> Tuple[Optional[np.ndarray], Dict[int, str]]:
+        """
+        Generate embeddings for all campaigns, reusing stored vectors for unchanged texts
+        
+        Returns:
+            (embeddings in campaigns_df order or None, text hash per campaign id)
+        """
+        if self.sentence_model is None or len(campaigns_df) == 0:
+            logger.warning("Cannot generate embeddings: model not loaded or no campaigns")
+            return None, {}
+        
+        # Text representations of campaigns (title + description + category + organization)
+        campaign_ids = campaigns_df['id'].astype(int).tolist()
+        campaign_texts = [campaign_text(campaign) for _, campaign in campaigns_df.iterrows()]
+        hashes = [text_hash(text) for text in campaign_texts]
+        text_hashes = dict(zip(campaign_ids, hashes))
+        
         try:
-            # Create text representations of campaigns (title + description + category)
-            campaign_texts = []
-            for _, campaign in self._campaigns_df.iterrows():
-                text_parts = []
-                
-                # Add title
-                if pd.notna(campaign.get('title')):
-                    text_parts.append(str(campaign['title']))
-                
-                # Add description
-                if pd.notna(campaign.get('description')):
-                    text_parts.append(str(campaign['description']))
-                
-                # Add category
-                if pd.notna(campaign.get('category')):
-                    text_parts.append(f"Category: {campaign['category']}")
-                
-                # Add organization name
-                if pd.notna(campaign.get('organization_name')):
-                    text_parts.append(f"Organization: {campaign['organization_name']}")
-                
-                campaign_text = " ".join(text_parts) if text_parts else "No description available"
-                campaign_texts.append(campaign_text)
-            
-            # Generate embeddings
-            logger.info(f"Generating embeddings for {len(campaign_texts)} campaigns...")
-            self.campaign_embeddings = self.sentence_model.encode(
-                campaign_texts, 
-                show_progress_bar=False,
-                convert_to_numpy=True
-            )
+            if self.embedding_store is None:
+                logger.info(f"Generating embeddings for {len(campaign_texts)} campaigns...")
+                with stage_timer("encoding"):
+                    embeddings = self.sentence_model.encode(
+                        campaign_texts, 
+                        show_progress_bar=False,
+                        convert_to_numpy=True
+                    )
+            else:
+                embeddings = self._embeddings_from_store(campaign_ids, campaign_texts, hashes)
             
-            logger.info(f"Generated embeddings with shape: {self.campaign_embeddings.shape}")
+            logger.info(f"Generated embeddings with shape: {embeddings.shape}")
+            return embeddings, text_hashes
             
         except Exception as e:
             logger.error(f"Error generating campaign embeddings: {str(e)}")
-            self.campaign_embeddings = None
+            return None, text_hashes
+    
+    def _embeddings_from_store(self, campaign_ids: List[int], campaign_texts: List[str],
+                               hashes: List[str]) -> np.ndarray:
+        """Encode only campaigns the store lacks (new or edited), then read every vector back"""
+        with stage_timer("encoding"):
+            encoded = BulkEncoder(self.embedding_store, model=self.sentence_model).encode(
+                campaign_ids, campaign_texts
+            )
+        
+        found, missing = self.embedding_store.lookup(campaign_ids, hashes)
+        record_cache("embedding_store", hit=encoded == 0)
+        logger.info(f"Embedding store: {len(found)} stored, {encoded} newly encoded campaigns")
+        if missing:
+            raise RuntimeError(f"{len(missing)} campaign embeddings missing from the store after encoding")
+        
+        self.embedding_store.compact_if_needed(keep_ids=campaign_ids)
+        return np.stack([found[campaign_id] for campaign_id in campaign_ids])
     
-    def get_recommendations(self, user_id: str, top_n: int = 5) -> List[Dict]:
+    def get_recommendations(self, user_id: str, top_n: int = 5,
+                            timings: Optional[Dict[str, float]] = None) -> List[Dict]:
         """
         Get campaign recommendations for a user
         
         Args:
             user_id: User identifier (using donor_email as user_id)
             top_n: Number of recommendations to return
+            timings: Optional dict that receives per-stage durations in milliseconds
             
         Returns:
             List of dicts with campaign_id and score
         """
+        if timings is None:
+            timings = {}
+        start = time.perf_counter()
+        
         self._refresh_data_if_needed()
+        snapshot = self.snapshot
+        timings["refresh"] = round((time.perf_counter() - start) * 1000, 2)
         
         try:
-            # Get user's donation history by user ID
-            try:
-                user_id_int = int(user_id)
-                user_donations = self._donations_df[
-                    self._donations_df['donor_id'] == user_id_int
-                ].copy()
-            except (ValueError, TypeError):
-                # Fallback to email if user_id is not a number
-                user_donations = self._donations_df[
-                    self._donations_df['donor_email'] == user_id
-                ].copy()
+            user_donations = self._get_user_donations(snapshot, user_id)
             
             recommendations = []
             
             if len(user_donations) > 0:
-                # User has donation history - use AI-powered recommendations
-                if self.campaign_embeddings is not None:
-                    recommendations = self._get_ai_recommendations(user_donations, top_n)
-                    logger.info(f"Generated {len(recommendations)} AI recommendations for user {user_id}")
-                else:
-                    # Fallback to collaborative filtering if AI not available
-                    recommendations = self._get_collaborative_recommendations(user_donations, top_n)
-                    logger.info(f"Generated {len(recommendations)} collaborative recommendations for user {user_id}")
+                # User has donation history - generate candidates from every retriever and rank them
+                context = self._build_context(snapshot, user_id, user_donations, top_n)
+                recommendations = self.pipeline.run(context, timings)
+                logger.info(f"Generated {len(recommendations)} pipeline recommendations for user {user_id}")
             
             # Fill remaining slots with popular campaigns
             if len(recommendations) < top_n:
                 popular_recs = self._get_popular_recommendations(
+                    snapshot,
                     exclude_campaigns=[r['campaign_id'] for r in recommendations],
                     top_n=top_n - len(recommendations)
                 )
@@ -173,24 +461,28 @@ class RecommendationEngine:
         except Exception as e:
             logger.error(f"Error generating recommendations for user {user_id}: {str(e)}")
             # Fallback to popular campaigns only
-            return self._get_popular_recommendations(top_n=top_n)
+            return self._get_popular_recommendations(snapshot, top_n=top_n)
+        
+        finally:
+            timings["total"] = round((time.perf_counter() - start) * 1000, 2)
     
-    def _get_ai_recommendations(self, user_donations: pd.DataFrame, top_n: int) -> List[Dict]:
+    def _get_ai_recommendations(self, snapshot: EngineSnapshot, user_donations: pd.DataFrame,
+                                top_n: int) -> List[Dict]:
         """Generate AI-powered recommendations based on user profile embedding"""
         
         # Create user profile embedding
-        user_profile = self._create_user_profile_embedding(user_donations)
+        user_profile = self._create_user_profile_embedding(snapshot, user_donations)
         
         if user_profile is None:
             logger.warning("Could not create user profile, falling back to collaborative filtering")
-            return self._get_collaborative_recommendations(user_donations, top_n)
+            return self._get_collaborative_recommendations(snapshot, user_donations, top_n)
         
         try:
             # Get campaigns user has already donated to
             donated_campaigns = set(user_donations['campaign_id'].unique())
             
             # Calculate similarities between user profile and all campaigns
-            similarities = cosine_similarity([user_profile], self.campaign_embeddings)[0]
+            similarities = cosine_similarity([user_profile], snapshot.campaign_embeddings)[0]
             
             # Create recommendations
             recommendations = []
@@ -199,7 +491,7 @@ class RecommendationEngine:
             sorted_indices = np.argsort(similarities)[::-1]
             
             for idx in sorted_indices:
-                campaign_row = self._campaigns_df.iloc[idx]
+                campaign_row = snapshot.campaigns_df.iloc[idx]
                 campaign_id = campaign_row['id']
                 
                 # Skip campaigns user has already donated to
@@ -226,11 +518,14 @@ class RecommendationEngine:
             
         except Exception as e:
             logger.error(f"Error in AI recommendations: {str(e)}")
-            return self._get_collaborative_recommendations(user_donations, top_n)
+            return self._get_collaborative_recommendations(snapshot, user_donations, top_n)
     
-    def _create_user_profile_embedding(self, user_donations: pd.DataFrame) -> Optional[np.ndarray]:
+    def _create_user_profile_embedding(self, snapshot: EngineSnapshot,
+                                       user_donations: pd.DataFrame) -> Optional[np.ndarray]:
         """Create user profile embedding from their donation history"""
-        if self.campaign_embeddings is None or len(user_donations) == 0:
+        campaigns_df = snapshot.campaigns_df
+        campaign_embeddings = snapshot.campaign_embeddings
+        if campaign_embeddings is None or len(user_donations) == 0:
             return None
             
         try:
@@ -243,15 +538,15 @@ class RecommendationEngine:
             
             for campaign_id in donated_campaign_ids:
                 # Find campaign in our dataframe
-                campaign_idx = self._campaigns_df[self._campaigns_df['id'] == campaign_id].index
+                campaign_idx = campaigns_df[campaigns_df['id'] == campaign_id].index
                 
                 if len(campaign_idx) > 0:
                     idx = campaign_idx[0]
                     # Get the position in our embeddings array
-                    embedding_idx = self._campaigns_df.index.get_loc(idx)
+                    embedding_idx = campaigns_df.index.get_loc(idx)
                     
-                    if embedding_idx < len(self.campaign_embeddings):
-                        user_campaign_embeddings.append(self.campaign_embeddings[embedding_idx])
+                    if embedding_idx < len(campaign_embeddings):
+                        user_campaign_embeddings.append(campaign_embeddings[embedding_idx])
                         
                         # Weight by donation amount and recency
                         campaign_donations = user_donations[user_donations['campaign_id'] == campaign_id]
@@ -324,7 +619,8 @@ class RecommendationEngine:
         
         return min(final_score, 1.0)  # Cap at 1.0
 
-    def _get_collaborative_recommendations(self, user_donations: pd.DataFrame, top_n: int) -> List[Dict]:
+    def _get_collaborative_recommendations(self, snapshot: EngineSnapshot, user_donations: pd.DataFrame,
+                                           top_n: int) -> List[Dict]:
         """Generate recommendations based on similar users' donation patterns"""
         
         # Get categories user has donated to
@@ -338,33 +634,34 @@ class RecommendationEngine:
         # 1. Recommend campaigns in same categories (category-based)
         if len(user_categories) > 0:
             category_recs = self._get_category_based_recommendations(
-                user_categories, donated_campaigns, top_n
+                snapshot, user_categories, donated_campaigns, top_n
             )
             recommendations.extend(category_recs)
         
         # 2. Recommend campaigns from same organizations (organization-based)
         if len(recommendations) < top_n:
             org_recs = self._get_organization_based_recommendations(
-                user_donations, donated_campaigns, top_n - len(recommendations)
+                snapshot, user_donations, donated_campaigns, top_n - len(recommendations)
             )
             recommendations.extend(org_recs)
         
         # 3. Find similar users and their donations (collaborative filtering)
         if len(recommendations) < top_n:
             similar_user_recs = self._get_similar_user_recommendations(
-                user_donations, donated_campaigns, top_n - len(recommendations)
+                snapshot, user_donations, donated_campaigns, top_n - len(recommendations)
             )
             recommendations.extend(similar_user_recs)
         
         return recommendations
     
-    def _get_category_based_recommendations(self, user_categories: List[str], 
+    def _get_category_based_recommendations(self, snapshot: EngineSnapshot, user_categories: List[str], 
                                          exclude_campaigns: set, top_n: int) -> List[Dict]:
         """Recommend popular campaigns in user's preferred categories"""
+        campaigns_df = snapshot.campaigns_df
         
-        category_campaigns = self._campaigns_df[
-            (self._campaigns_df['category'].isin(user_categories)) &
-            (~self._campaigns_df['id'].isin(exclude_campaigns))
+        category_campaigns = campaigns_df[
+            (campaigns_df['category'].isin(user_categories)) &
+            (~campaigns_df['id'].isin(exclude_campaigns))
         ].copy()
         
         if len(category_campaigns) == 0:
@@ -392,9 +689,10 @@ class RecommendationEngine:
             for _, row in top_campaigns.iterrows()
         ]
     
-    def _get_organization_based_recommendations(self, user_donations: pd.DataFrame,
+    def _get_organization_based_recommendations(self, snapshot: EngineSnapshot, user_donations: pd.DataFrame,
                                               exclude_campaigns: set, top_n: int) -> List[Dict]:
         """Recommend campaigns from organizations user has donated to before"""
+        campaigns_df = snapshot.campaigns_df
         
         # Get organizations user has donated to
         user_organizations = user_donations['organization_id'].dropna().unique()
@@ -403,9 +701,9 @@ class RecommendationEngine:
             return []
         
         # Find other campaigns from same organizations
-        org_campaigns = self._campaigns_df[
-            (self._campaigns_df['organization_id'].isin(user_organizations)) &
-            (~self._campaigns_df['id'].isin(exclude_campaigns))
+        org_campaigns = campaigns_df[
+            (campaigns_df['organization_id'].isin(user_organizations)) &
+            (~campaigns_df['id'].isin(exclude_campaigns))
         ].copy()
         
         if len(org_campaigns) == 0:
@@ -434,43 +732,45 @@ class RecommendationEngine:
             for _, row in top_org_campaigns.iterrows()
         ]
     
-    def _get_similar_user_recommendations(self, user_donations: pd.DataFrame, 
+    def _get_similar_user_recommendations(self, snapshot: EngineSnapshot, user_donations: pd.DataFrame, 
                                         exclude_campaigns: set, top_n: int) -> List[Dict]:
         """Find similar users and recommend their campaigns"""
+        donations_df = snapshot.donations_df
+        campaigns_df = snapshot.campaigns_df
         
         user_campaign_ids = set(user_donations['campaign_id'].unique())
         
         # Find users who donated to similar campaigns
         if 'donor_id' in user_donations.columns and len(user_donations) > 0:
             current_user_id = user_donations['donor_id'].iloc[0]
-            similar_users = self._donations_df[
-                self._donations_df['campaign_id'].isin(user_campaign_ids) &
-                (self._donations_df['donor_id'] != current_user_id)
+            similar_users = donations_df[
+                donations_df['campaign_id'].isin(user_campaign_ids) &
+                (donations_df['donor_id'] != current_user_id)
             ]['donor_id'].unique()
             
             if len(similar_users) == 0:
                 return []
             
             # Get campaigns donated to by similar users
-            similar_user_donations = self._donations_df[
-                (self._donations_df['donor_id'].isin(similar_users)) &
-                (~self._donations_df['campaign_id'].isin(exclude_campaigns))
+            similar_user_donations = donations_df[
+                (donations_df['donor_id'].isin(similar_users)) &
+                (~donations_df['campaign_id'].isin(exclude_campaigns))
             ]
         else:
             # Fallback to email-based logic
             current_user_email = user_donations['donor_email'].iloc[0] if len(user_donations) > 0 else ""
-            similar_users = self._donations_df[
-                self._donations_df['campaign_id'].isin(user_campaign_ids) &
-                (self._donations_df['donor_email'] != current_user_email)
+            similar_users = donations_df[
+                donations_df['campaign_id'].isin(user_campaign_ids) &
+                (donations_df['donor_email'] != current_user_email)
             ]['donor_email'].unique()
             
             if len(similar_users) == 0:
                 return []
             
             # Get campaigns donated to by similar users
-            similar_user_donations = self._donations_df[
-                (self._donations_df['donor_email'].isin(similar_users)) &
-                (~self._donations_df['campaign_id'].isin(exclude_campaigns))
+            similar_user_donations = donations_df[
+                (donations_df['donor_email'].isin(similar_users)) &
+                (~donations_df['campaign_id'].isin(exclude_campaigns))
             ]
         
         # Count how many similar users donated to each campaign
@@ -479,12 +779,12 @@ class RecommendationEngine:
         recommendations = []
         for campaign_id, count in campaign_counts.head(top_n).items():
             # Get campaign details
-            campaign = self._campaigns_df[self._campaigns_df['id'] == campaign_id]
+            campaign = campaigns_df[campaigns_df['id'] == campaign_id]
             if len(campaign) > 0:
                 # Score based on how many similar users donated
                 similarity_score = min(count / len(similar_users), 1.0)
                 
-                campaign_data = self._campaigns_df[self._campaigns_df['id'] == campaign_id].iloc[0]
+                campaign_data = campaigns_df[campaigns_df['id'] == campaign_id].iloc[0]
                 recommendations.append(
                     self._format_campaign_recommendation(
                         campaign_data,
@@ -495,7 +795,7 @@ class RecommendationEngine:
         
         return recommendations
     
-    def _get_popular_recommendations(self, exclude_campaigns: List[int] = None, 
+    def _get_popular_recommendations(self, snapshot: EngineSnapshot, exclude_campaigns: List[int] = None, 
                                    top_n: int = 5) -> List[Dict]:
         """Get popular campaigns as fallback recommendations"""
         
@@ -503,8 +803,8 @@ class RecommendationEngine:
             exclude_campaigns = []
         
         # Filter out excluded campaigns
-        popular_campaigns = self._campaigns_df[
-            ~self._campaigns_df['id'].isin(exclude_campaigns)
+        popular_campaigns = snapshot.campaigns_df[
+            ~snapshot.campaigns_df['id'].isin(exclude_campaigns)
         ].copy()
         
         if len(popular_campaigns) == 0:
@@ -537,11 +837,13 @@ class RecommendationEngine:
         """Get trending campaigns based on recent donation activity"""
         
         self._refresh_data_if_needed()
+        snapshot = self.snapshot
+        campaigns_df = snapshot.campaigns_df
         
         # Get recent donations
         cutoff_date = datetime.now() - timedelta(days=days)
-        recent_donations = self._donations_df[
-            pd.to_datetime(self._donations_df['created_at']) >= cutoff_date
+        recent_donations = snapshot.donations_df[
+            pd.to_datetime(snapshot.donations_df['created_at']) >= cutoff_date
         ]
         
         # Count donations per campaign in the period
@@ -549,7 +851,7 @@ class RecommendationEngine:
         
         recommendations = []
         for campaign_id, count in trending_counts.head(top_n).items():
-            campaign = self._campaigns_df[self._campaigns_df['id'] == campaign_id]
+            campaign = campaigns_df[campaigns_df['id'] == campaign_id]
             if len(campaign) > 0:
                 # Score based on recent activity
                 trend_score = min(count / 10, 1.0)  # Normalize to max 10 donations
@@ -584,20 +886,23 @@ class RecommendationEngine:
             List of similar campaigns with scores
         """
         self._refresh_data_if_needed()
+        snapshot = self.snapshot
         
         # Try AI-based similarity first
-        if self.campaign_embeddings is not None:
-            return self._get_ai_similar_campaigns(campaign_id, top_n)
+        if snapshot.campaign_embeddings is not None:
+            return self._get_ai_similar_campaigns(snapshot, campaign_id, top_n)
         else:
             # Fallback to rule-based similarity
-            return self._get_rule_based_similar_campaigns(campaign_id, top_n)
+            return self._get_rule_based_similar_campaigns(snapshot, campaign_id, top_n)
     
-    def _get_ai_similar_campaigns(self, campaign_id: int, top_n: int) -> List[Dict]:
+    def _get_ai_similar_campaigns(self, snapshot: EngineSnapshot, campaign_id: int, top_n: int) -> List[Dict]:
         """Get similar campaigns using AI embeddings"""
+        campaigns_df = snapshot.campaigns_df
+        campaign_embeddings = snapshot.campaign_embeddings
         try:
             # Find the target campaign
-            target_campaign_idx = self._campaigns_df[
-                self._campaigns_df['id'] == campaign_id
+            target_campaign_idx = campaigns_df[
+                campaigns_df['id'] == campaign_id
             ].index
             
             if len(target_campaign_idx) == 0:
@@ -605,17 +910,17 @@ class RecommendationEngine:
                 return []
             
             # Get the embedding index
-            target_idx = self._campaigns_df.index.get_loc(target_campaign_idx[0])
+            target_idx = campaigns_df.index.get_loc(target_campaign_idx[0])
             
-            if target_idx >= len(self.campaign_embeddings):
+            if target_idx >= len(campaign_embeddings):
                 logger.warning(f"Embedding not found for campaign {campaign_id}")
                 return []
             
             # Get target campaign embedding
-            target_embedding = self.campaign_embeddings[target_idx]
+            target_embedding = campaign_embeddings[target_idx]
             
             # Calculate similarities with all other campaigns
-            similarities = cosine_similarity([target_embedding], self.campaign_embeddings)[0]
+            similarities = cosine_similarity([target_embedding], campaign_embeddings)[0]
             
             # Get top similar campaigns (excluding the target campaign)
             similar_campaigns = []
@@ -625,7 +930,7 @@ class RecommendationEngine:
                 if idx == target_idx:  # Skip the target campaign itself
                     continue
                 
-                campaign_row = self._campaigns_df.iloc[idx]
+                campaign_row = campaigns_df.iloc[idx]
                 similarity_score = similarities[idx]
                 
                 similar_campaigns.append({
@@ -641,14 +946,15 @@ class RecommendationEngine:
             
         except Exception as e:
             logger.error(f"Error in AI similar campaigns for {campaign_id}: {str(e)}")
-            return self._get_rule_based_similar_campaigns(campaign_id, top_n)
+            return self._get_rule_based_similar_campaigns(snapshot, campaign_id, top_n)
     
-    def _get_rule_based_similar_campaigns(self, campaign_id: int, top_n: int) -> List[Dict]:
+    def _get_rule_based_similar_campaigns(self, snapshot: EngineSnapshot, campaign_id: int, top_n: int) -> List[Dict]:
         """Fallback rule-based similar campaigns"""
+        campaigns_df = snapshot.campaigns_df
         try:
             # Get the target campaign
-            target_campaign = self._campaigns_df[
-                self._campaigns_df['id'] == campaign_id
+            target_campaign = campaigns_df[
+                campaigns_df['id'] == campaign_id
             ]
             
             if len(target_campaign) == 0:
@@ -658,9 +964,9 @@ class RecommendationEngine:
             target = target_campaign.iloc[0]
             
             # Get all other active campaigns (exclude the target campaign)
-            other_campaigns = self._campaigns_df[
-                (self._campaigns_df['id'] != campaign_id) &
-                (self._campaigns_df['is_active'] == True)
+            other_campaigns = campaigns_df[
+                (campaigns_df['id'] != campaign_id) &
+                (campaigns_df['is_active'] == True)
             ].copy()
             
             if len(other_campaigns) == 0:
@@ -765,18 +1071,129 @@ class RecommendationEngine:
             for _, row in campaigns_df.iterrows()
         ]
 
+    
+    def _encode_query(self, query: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of a search query, served from the LRU when repeated"""
+        key = " ".join(query.lower().split())
+        with self._query_cache_lock:
+            vector = self._query_cache.get(key)
+            if vector is not None:
+                self._query_cache.move_to_end(key)
+        record_cache("query", hit=vector is not None)
+        if vector is not None:
+            return vector
+        
+        with stage_timer("query_encoding"):
+            vector = np.asarray(self.sentence_model.encode(key, convert_to_numpy=True), dtype=np.float64)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        vector = vector / norm
+        
+        with self._query_cache_lock:
+            self._query_cache[key] = vector
+            while len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+    
+    def search_campaigns(self, query: str, top_n: int = 10, category: Optional[str] = None,
+                         timings: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """
+        Semantic search over active campaigns using the campaign embedding index
+        
+        Args:
+            query: Free text in any supported language
+            top_n: Number of campaigns to return
+            category: Optional category name to restrict results to (case-insensitive)
+            timings: Optional dict that receives per-stage durations in milliseconds
+            
+        Returns:
+            List of dicts with campaign_id and score, best match first
+        """
+        if timings is None:
+            timings = {}
+        start = time.perf_counter()
+        
+        self._refresh_data_if_needed()
+        snapshot = self.snapshot
+        timings["refresh"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        try:
+            if category:
+                mask = np.array(
+                    [str(c).lower() == category.lower() for c in snapshot.campaign_categories], dtype=bool
+                )
+            else:
+                mask = np.ones(snapshot.campaign_count, dtype=bool)
+            
+            if snapshot.normalized_embeddings is None or self.sentence_model is None:
+                return self._keyword_search(snapshot, query, mask, top_n)
+            
+            encode_start = time.perf_counter()
+            query_vector = self._encode_query(query)
+            timings["encode"] = round((time.perf_counter() - encode_start) * 1000, 2)
+            if query_vector is None:
+                return []
+            
+            score_start = time.perf_counter()
+            similarities = snapshot.normalized_embeddings @ query_vector
+            positions, scores = _top_candidates(similarities, mask, top_n)
+            order = np.lexsort((positions, -scores))
+            timings["score"] = round((time.perf_counter() - score_start) * 1000, 2)
+            
+            return [
+                {'campaign_id': int(snapshot.campaign_ids[positions[i]]), 'score': float(scores[i])}
+                for i in order
+            ]
+        
+        finally:
+            timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+    
+    def _keyword_search(self, snapshot: EngineSnapshot, query: str, mask: np.ndarray, top_n: int) -> List[Dict]:
+        """Substring fallback used while no embedding index is available"""
+        terms = query.lower().split()
+        campaigns = snapshot.campaigns_df[mask]
+        text = (campaigns['title'].fillna('') + ' ' + campaigns['description'].fillna('')).str.lower()
+        hits = sum(text.str.contains(term, regex=False).astype(int) for term in terms)
+        matches = campaigns.assign(score=hits / max(len(terms), 1))
+        matches = matches[matches['score'] > 0].nlargest(top_n, 'score')
+        return [
+            {'campaign_id': int(row['id']), 'score': float(row['score'])}
+            for _, row in matches.iterrows()
+        ]
+
+
+_shared_engine = None
+_shared_engine_lock = threading.Lock()
+
+
+def peek_engine() -> Optional[RecommendationEngine]:
+    """Return the shared engine if it has been created, without loading it"""
+    return _shared_engine
+
+
+def get_engine() -> RecommendationEngine:
+    """Process-wide engine so the model, data and feature arrays are loaded once"""
+    global _shared_engine
+    if _shared_engine is None:
+        with _shared_engine_lock:
+            if _shared_engine is None:
+                _shared_engine = RecommendationEngine()
+    return _shared_engine
+
 
 # Convenience function
-def get_user_recommendations(user_id: str, top_n: int = 5) -> List[Dict]:
+def get_user_recommendations(user_id: str, top_n: int = 5,
+                             timings: Optional[Dict[str, float]] = None) -> List[Dict]:
     """
     Get campaign recommendations for a user
     
     Args:
         user_id: User identifier (donor_email)
         top_n: Number of recommendations to return
+        timings: Optional dict that receives per-stage durations in milliseconds
         
     Returns:
         List of dicts with campaign_id, score, and reason
     """
-    engine = RecommendationEngine()
-    return engine.get_recommendations(user_id, top_n)
\ No newline at end of file
+    return get_engine().get_recommendations(user_id, top_n, timings)
\ No newline at end of file
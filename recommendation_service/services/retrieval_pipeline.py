@@ -0,0 +1,326 @@
+import numpy as np
+import pandas as pd
+from typing import Any, List, Dict, Optional
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait
+import logging
+import time
+import os
+
+try:
+    from .metrics import record_stage
+except ImportError:
+    from services.metrics import record_stage
+
+logger = logging.getLogger(__name__)
+
+# Shared pool so retrievers of concurrent requests don't each spawn threads
+_RETRIEVER_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RETRIEVER_POOL_SIZE", 8)),
+    thread_name_prefix="retriever"
+)
+
+
+@dataclass
+class RecommendationContext:
+    """
+    Everything a retriever needs to know about the requesting donor, and the
+    engine snapshot the request started with; retrievers and the ranker read
+    campaign arrays only from that snapshot
+    """
+    snapshot: Any
+    user_id: str
+    user_donations: pd.DataFrame
+    donor_id: Optional[int]
+    donated_positions: np.ndarray
+    user_categories: np.ndarray
+    top_n: int
+
+
+@dataclass
+class CandidateSet:
+    """Candidates produced by one retriever (positions into the campaign arrays)"""
+    source: str
+    positions: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    scores: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+
+    def __len__(self):
+        return len(self.positions)
+
+
+def _top_candidates(scores: np.ndarray, mask: np.ndarray, limit: int):
+    """Return positions and scores of the best `limit` entries allowed by mask"""
+    candidate_positions = np.flatnonzero(mask)
+    if len(candidate_positions) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    candidate_scores = scores[candidate_positions]
+    if len(candidate_positions) > limit:
+        best = np.argpartition(-candidate_scores, limit - 1)[:limit]
+        candidate_positions = candidate_positions[best]
+        candidate_scores = candidate_scores[best]
+
+    return candidate_positions.astype(np.int64), candidate_scores.astype(np.float64)
+
+
+class BaseRetriever:
+    """Generates a bounded set of candidate campaigns for a donor"""
+
+    name = "base"
+    reason = "Recommended campaign"
+
+    def __init__(self, engine, max_candidates: int = 300):
+        self.engine = engine
+        self.max_candidates = max_candidates
+
+    def retrieve(self, context: RecommendationContext) -> CandidateSet:
+        raise NotImplementedError
+
+    def format_reason(self, context: RecommendationContext, position: int, raw_score: float) -> str:
+        return self.reason
+
+
+class EmbeddingRetriever(BaseRetriever):
+    """Nearest campaigns to the donor's profile in embedding space"""
+
+    name = "embedding"
+
+    def retrieve(self, context: RecommendationContext) -> CandidateSet:
+        embeddings = context.snapshot.normalized_embeddings
+        if embeddings is None:
+            return CandidateSet(self.name)
+
+        user_profile = self.engine.get_user_profile(context.snapshot, context.user_donations, context.donor_id)
+        if user_profile is None:
+            return CandidateSet(self.name)
+
+        norm = np.linalg.norm(user_profile)
+        if norm == 0:
+            return CandidateSet(self.name)
+
+        similarities = embeddings @ (user_profile / norm)
+        mask = np.ones(len(similarities), dtype=bool)
+        positions, scores = _top_candidates(similarities, mask, self.max_candidates)
+        return CandidateSet(self.name, positions, scores)
+
+    def format_reason(self, context: RecommendationContext, position: int, raw_score: float) -> str:
+        return f'AI semantic similarity ({raw_score:.3f})'
+
+
+class CoDonationRetriever(BaseRetriever):
+    """Campaigns supported by donors who gave to the same campaigns"""
+
+    name = "co_donation"
+
+    def retrieve(self, context: RecommendationContext) -> CandidateSet:
+        donation_positions = context.snapshot.donation_positions
+        donor_ids = context.snapshot.donation_donor_ids
+        if donation_positions is None or len(context.donated_positions) == 0:
+            return CandidateSet(self.name)
+
+        # donor_id 0 marks anonymous donations, which can't be linked to one donor
+        shared = np.isin(donation_positions, context.donated_positions) & (donor_ids != 0)
+        if context.donor_id is not None:
+            shared &= donor_ids != context.donor_id
+        similar_donors = np.unique(donor_ids[shared])
+        if len(similar_donors) == 0:
+            return CandidateSet(self.name)
+
+        co_mask = np.isin(donor_ids, similar_donors) & (donation_positions >= 0)
+        counts = np.bincount(
+            donation_positions[co_mask],
+            minlength=context.snapshot.campaign_count
+        ).astype(np.float64)
+
+        scores = np.minimum(counts / len(similar_donors), 1.0)
+        positions, scores = _top_candidates(scores, counts > 0, self.max_candidates)
+        return CandidateSet(self.name, positions, scores)
+
+    def format_reason(self, context: RecommendationContext, position: int, raw_score: float) -> str:
+        return 'Liked by similar donors'
+
+
+class CategoryRetriever(BaseRetriever):
+    """Popular campaigns in the categories the donor already supports"""
+
+    name = "category"
+
+    def retrieve(self, context: RecommendationContext) -> CandidateSet:
+        if len(context.user_categories) == 0:
+            return CandidateSet(self.name)
+
+        snapshot = context.snapshot
+        mask = np.isin(snapshot.campaign_categories, context.user_categories)
+        if not mask.any():
+            return CandidateSet(self.name)
+
+        raw = snapshot.donation_counts * 0.7 + snapshot.progress * 0.3
+        max_score = raw[mask].max()
+        scores = raw / max_score if max_score > 0 else raw
+        positions, scores = _top_candidates(scores, mask, self.max_candidates)
+        return CandidateSet(self.name, positions, scores)
+
+    def format_reason(self, context: RecommendationContext, position: int, raw_score: float) -> str:
+        return f'Popular in {context.snapshot.campaign_categories[position]} category'
+
+
+class TrendingRetriever(BaseRetriever):
+    """Campaigns with the most completed donations in the recent window"""
+
+    name = "trending"
+
+    def retrieve(self, context: RecommendationContext) -> CandidateSet:
+        trending = context.snapshot.trending_scores
+        if trending is None:
+            return CandidateSet(self.name)
+
+        positions, scores = _top_candidates(trending, trending > 0, self.max_candidates)
+        return CandidateSet(self.name, positions, scores)
+
+    def format_reason(self, context: RecommendationContext, position: int, raw_score: float) -> str:
+        return 'Trending with recent donations'
+
+
+class VectorizedRanker:
+    """Merges candidate sets and scores them in one pass over numpy arrays"""
+
+    # How much each retriever's own score counts towards relevance
+    SOURCE_WEIGHTS = {
+        "embedding": 1.0,
+        "co_donation": 0.9,
+        "category": 0.8,
+        "trending": 0.6,
+    }
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def rank(self, context: RecommendationContext, candidate_sets: List[CandidateSet],
+             retrievers: Dict[str, BaseRetriever]) -> List[Dict]:
+        candidate_sets = [c for c in candidate_sets if len(c) > 0]
+        if not candidate_sets:
+            return []
+
+        positions = np.unique(np.concatenate([c.positions for c in candidate_sets]))
+        positions = positions[~np.isin(positions, context.donated_positions)]
+        if len(positions) == 0:
+            return []
+
+        raw_scores = np.zeros((len(candidate_sets), len(positions)))
+        weighted = np.zeros_like(raw_scores)
+        for row, candidates in enumerate(candidate_sets):
+            keep = np.isin(candidates.positions, positions)
+            columns = np.searchsorted(positions, candidates.positions[keep])
+            raw_scores[row, columns] = candidates.scores[keep]
+            weighted[row, columns] = candidates.scores[keep] * self.SOURCE_WEIGHTS.get(candidates.source, 0.5)
+
+        best_source = weighted.argmax(axis=0)
+        relevance = weighted.max(axis=0)
+
+        snapshot = context.snapshot
+        progress = snapshot.progress[positions]
+        final_scores = (
+            relevance * 0.7
+            + np.minimum(snapshot.donation_counts[positions] / 100, 1.0) * 0.2
+            + np.where((progress >= 10) & (progress <= 80), 0.1, 0.05)
+            + np.isin(snapshot.campaign_categories[positions], context.user_categories) * 0.1
+            + snapshot.verified[positions] * 0.05
+            + snapshot.featured[positions] * 0.03
+        )
+        final_scores = np.minimum(final_scores, 1.0)
+
+        # Highest score first, ties broken by position to keep results stable
+        order = np.lexsort((positions, -final_scores))[:context.top_n]
+
+        recommendations = []
+        for column in order:
+            candidates = candidate_sets[best_source[column]]
+            position = int(positions[column])
+            retriever = retrievers[candidates.source]
+            recommendations.append({
+                'campaign_id': int(snapshot.campaign_ids[position]),
+                'score': float(final_scores[column]),
+                'reason': retriever.format_reason(context, position, raw_scores[best_source[column], column])
+            })
+
+        return recommendations
+
+
+class RetrievalPipeline:
+    """
+    Runs several retrievers concurrently within a latency budget, then ranks the
+    merged candidates once. Retrievers that miss the budget are dropped for the
+    request instead of delaying it.
+    """
+
+    def __init__(self, engine, retrievers: Optional[List[BaseRetriever]] = None,
+                 latency_budget_ms: Optional[float] = None):
+        self.engine = engine
+        self.retrievers = retrievers or [
+            EmbeddingRetriever(engine),
+            CoDonationRetriever(engine),
+            CategoryRetriever(engine),
+            TrendingRetriever(engine),
+        ]
+        self.latency_budget_ms = latency_budget_ms or float(os.getenv("RETRIEVAL_BUDGET_MS", 150))
+        self.ranker = VectorizedRanker(engine)
+
+    def _timed_retrieve(self, retriever: BaseRetriever, context: RecommendationContext):
+        start = time.perf_counter()
+        candidates = retriever.retrieve(context)
+        return candidates, (time.perf_counter() - start) * 1000
+
+    def run(self, context: RecommendationContext, timings: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """
+        Generate and rank candidates for one donor
+
+        Args:
+            context: Donor context built by the engine
+            timings: Optional dict that receives per-stage durations in milliseconds
+
+        Returns:
+            List of dicts with campaign_id, score and reason
+        """
+        if timings is None:
+            timings = {}
+
+        start = time.perf_counter()
+        futures = {
+            _RETRIEVER_POOL.submit(self._timed_retrieve, retriever, context): retriever
+            for retriever in self.retrievers
+        }
+        done, not_done = wait(futures, timeout=self.latency_budget_ms / 1000)
+
+        candidate_sets = []
+        for future in done:
+            retriever = futures[future]
+            try:
+                candidates, elapsed_ms = future.result()
+                candidate_sets.append(candidates)
+                timings[f"retrieve.{retriever.name}"] = round(elapsed_ms, 2)
+                record_stage(f"retrieve.{retriever.name}", elapsed_ms)
+            except Exception as e:
+                logger.error(f"Retriever {retriever.name} failed: {str(e)}")
+
+        for future in not_done:
+            retriever = futures[future]
+            future.cancel()
+            timings[f"retrieve.{retriever.name}"] = None
+            logger.warning(f"Retriever {retriever.name} exceeded {self.latency_budget_ms}ms budget, skipped")
+
+        retrieve_ms = (time.perf_counter() - start) * 1000
+        timings["retrieve"] = round(retrieve_ms, 2)
+        record_stage("retrieve", retrieve_ms)
+
+        rank_start = time.perf_counter()
+        retrievers_by_name = {r.name: r for r in self.retrievers}
+        recommendations = self.ranker.rank(context, candidate_sets, retrievers_by_name)
+        rank_ms = (time.perf_counter() - rank_start) * 1000
+        timings["rank"] = round(rank_ms, 2)
+        record_stage("rank", rank_ms)
+
+        logger.info(
+            f"Pipeline ranked {sum(len(c) for c in candidate_sets)} candidates from "
+            f"{len(candidate_sets)} retrievers for user {context.user_id}"
+        )
+        return recommendations
@@ -0,0 +1,220 @@
+"""
+Batch job writing the top-k similar campaigns of every active campaign into
+Django's campaign_similarcampaign table, which the similar campaigns endpoint
+reads with one indexed query instead of calling this service.
+
+Runs are incremental: every row stores the text hash its campaign had when it
+was computed, and only campaigns whose neighbours can have changed are
+recomputed and rewritten:
+  - new and edited campaigns
+  - campaigns with a neighbour that was edited, removed or deactivated
+  - campaigns a new or edited campaign now scores higher than their k-th neighbour
+
+The Django backend requests an incremental run (POST /recommendations/similar/refresh)
+whenever a campaign is created, edited or deleted.
+
+Usage (from recommendation_service/):
+    python -m services.similarity_job
+    python -m services.similarity_job --full --top-k 10
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import column, delete, insert, select, table
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = int(os.getenv("SIMILAR_TOP_K", 10))
+
+# Rows of the similarity matrix computed at once: BLOCK_SIZE x campaigns floats
+BLOCK_SIZE = int(os.getenv("SIMILARITY_BLOCK_SIZE", 1024))
+
+# Campaigns whose rows are replaced per transaction
+WRITE_BATCH_SIZE = 1000
+
+similar_campaigns_table = table(
+    "campaign_similarcampaign",
+    column("campaign_id"),
+    column("similar_campaign_id"),
+    column("rank"),
+    column("score"),
+    column("source_hash"),
+    column("computed_at"),
+)
+
+# One run at a time per process
+_run_lock = threading.Lock()
+
+
+class SimilarityJob:
+    """Compute and persist nearest neighbours from an engine's normalized embeddings"""
+
+    def __init__(self, engine, db_engine=None, top_k: int = DEFAULT_TOP_K):
+        """
+        Args:
+            engine: RecommendationEngine providing embeddings, ids and text hashes
+            db_engine: SQLAlchemy engine for the Django database; defaults to the
+                engine's data loader connection
+            top_k: Neighbours stored per campaign
+        """
+        self.engine = engine
+        self.db_engine = db_engine or engine.data_loader.engine
+        self.top_k = top_k
+
+    def _load_stored(self) -> Dict[int, Dict]:
+        """Stored neighbours per campaign: source hash, neighbour ids and the k-th score"""
+        t = similar_campaigns_table
+        query = select(t.c.campaign_id, t.c.similar_campaign_id, t.c.score, t.c.source_hash)
+        stored = {}
+        with self.db_engine.connect() as conn:
+            for campaign_id, similar_id, score, source_hash in conn.execute(query):
+                entry = stored.setdefault(
+                    campaign_id, {"hash": source_hash, "neighbours": set(), "min_score": float("inf")}
+                )
+                entry["neighbours"].add(similar_id)
+                entry["min_score"] = min(entry["min_score"], score)
+        return stored
+
+    def _top_k(self, embeddings: np.ndarray, positions: np.ndarray):
+        """Top-k neighbour positions and scores for the given rows, best first"""
+        k = min(self.top_k, len(embeddings) - 1)
+        for start in range(0, len(positions), BLOCK_SIZE):
+            block = positions[start:start + BLOCK_SIZE]
+            scores = embeddings[block] @ embeddings.T
+            scores[np.arange(len(block)), block] = -np.inf
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            yield block, np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def _affected(self, embeddings: np.ndarray, ids: np.ndarray, hashes: List[str],
+                  stored: Dict[int, Dict]) -> Set[int]:
+        """Positions of campaigns whose stored neighbours may no longer be the top-k"""
+        expected = min(self.top_k, len(ids) - 1)
+        active = set(ids.tolist())
+        changed = {pos for pos, cid in enumerate(ids.tolist())
+                   if stored.get(cid, {}).get("hash") != hashes[pos]}
+        changed_ids = {int(ids[pos]) for pos in changed}
+
+        affected = set(changed)
+        for pos, cid in enumerate(ids.tolist()):
+            entry = stored.get(cid)
+            if pos in changed or entry is None:
+                continue
+            neighbours = entry["neighbours"]
+            if len(neighbours) != expected or neighbours & changed_ids or not neighbours <= active:
+                affected.add(pos)
+
+        if changed and len(affected) < len(ids):
+            # A new or edited campaign may now outrank the k-th neighbour of an unchanged one
+            changed_positions = np.fromiter(sorted(changed), dtype=np.int64)
+            kth_scores = np.array([stored.get(cid, {}).get("min_score", np.inf) for cid in ids.tolist()])
+            for start in range(0, len(changed_positions), BLOCK_SIZE):
+                block = changed_positions[start:start + BLOCK_SIZE]
+                best = (embeddings[block] @ embeddings.T).max(axis=0)
+                affected.update(np.nonzero(best > kth_scores)[0].tolist())
+        return affected
+
+    def _write(self, ids: np.ndarray, hashes: List[str], results, removed_ids: List[int]) -> int:
+        """Replace the rows of recomputed campaigns, one transaction per write batch"""
+        t = similar_campaigns_table
+        computed_at = datetime.now(timezone.utc)
+        written = 0
+        if removed_ids:
+            with self.db_engine.begin() as conn:
+                conn.execute(delete(t).where(t.c.campaign_id.in_(removed_ids)))
+
+        pending_ids, rows = [], []
+
+        def flush():
+            with self.db_engine.begin() as conn:
+                conn.execute(delete(t).where(t.c.campaign_id.in_(pending_ids)))
+                if rows:
+                    conn.execute(insert(t), rows)
+
+        for block, neighbours, scores in results:
+            for pos, neighbour_positions, neighbour_scores in zip(block, neighbours, scores):
+                campaign_id = int(ids[pos])
+                pending_ids.append(campaign_id)
+                rows.extend(
+                    {
+                        "campaign_id": campaign_id,
+                        "similar_campaign_id": int(ids[neighbour]),
+                        "rank": rank,
+                        "score": float(score),
+                        "source_hash": hashes[pos],
+                        "computed_at": computed_at,
+                    }
+                    for rank, (neighbour, score) in enumerate(zip(neighbour_positions, neighbour_scores), 1)
+                )
+                if len(pending_ids) >= WRITE_BATCH_SIZE:
+                    flush()
+                    written += len(pending_ids)
+                    pending_ids, rows = [], []
+        if pending_ids:
+            flush()
+            written += len(pending_ids)
+        return written
+
+    def run(self, full: bool = False) -> Dict:
+        """
+        Recompute neighbours for the campaigns that need it (all of them with `full`)
+
+        Returns:
+            Run report: campaigns, how many were recomputed and removed, and timings
+        """
+        with _run_lock:
+            start = time.perf_counter()
+            ids, embeddings, hashes = self.engine.similarity_snapshot()
+            if embeddings is None or len(ids) < 2:
+                logger.warning("Similarity job skipped: no embeddings or fewer than two campaigns")
+                return {"campaigns": int(len(ids)), "recomputed": 0, "removed": 0, "skipped": True}
+
+            embeddings = embeddings.astype(np.float32, copy=False)
+
+            stored = self._load_stored()
+            removed_ids = sorted(set(stored) - set(ids.tolist()))
+            if full:
+                positions = np.arange(len(ids))
+            else:
+                positions = np.fromiter(sorted(self._affected(embeddings, ids, hashes, stored)), dtype=np.int64)
+
+            written = self._write(ids, hashes, self._top_k(embeddings, positions), removed_ids)
+            report = {
+                "campaigns": int(len(ids)),
+                "recomputed": written,
+                "removed": len(removed_ids),
+                "top_k": self.top_k,
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+            }
+            logger.info(f"Similarity job: {report}")
+            return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write the top-k similar campaigns into the Django database")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--full", action="store_true", help="Recompute every campaign, not only changed ones")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.recommendation_engine import get_engine
+
+    engine = get_engine()
+    engine.refresh_now()
+    report = SimilarityJob(engine, top_k=args.top_k).run(full=args.full)
+    print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())